@@ -14,3 +14,13 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'CSE311PROJECTT.settings')
 
 application = get_asgi_application()
+
+# WARMUP_ON_STARTUP=True --> her worker ilk isteği beklemeden şablonları derler,
+# URL'leri çözer ve önbelleği doldurur
+if os.environ.get('WARMUP_ON_STARTUP') == 'True':
+    from django.db import connections
+    from course_management.warmup import warm_up
+    warm_up()
+    # ASGI'da veritabanı sorguları ayrı bir thread'de çalışır,
+    # bu thread'de açılan bağlantılar kullanılmaz
+    connections.close_all()
@@ -12,12 +12,14 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 import os
 from pathlib import Path
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
-load_dotenv()
+# dosya yolu açıkça verilir, .env aramak için klasörler gezilmez
+load_dotenv(BASE_DIR / '.env')
 
 
 # Quick-start development settings - unsuitable for production
@@ -47,12 +49,16 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'course_management.middleware.StaticFilesMiddleware',    # SERVE_STATIC kapalıysa devre dışı
+    'course_management.middleware.GZipHTMLMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'course_management.middleware.DepartmentMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'course_management.middleware.ProfilingMiddleware',      # PROFILING kapalıysa devre dışı
 ]
 
 ROOT_URLCONF = 'CSE311PROJECTT.urls'
@@ -82,9 +88,101 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # bağlantı istekler arasında açık kalır (saniye), 0 --> her istekte yeniden açılır
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+        # açık kalan bağlantı kopmuşsa istek başında fark edilir
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# çok bölümlü kurulumda her bölümün verisi kendi veritabanında tutulabilir:
+# DEPARTMENT_DATABASES="CSE=cse,EEE=eee" --> bölüm kodu=veritabanı alias'ı
+# tanımlı olmayan alias'lar için default ile aynı ayarlarda ayrı bir SQLite dosyası kullanılır
+# (başka bir veritabanı motorunda alias'ı DATABASES'e elle ekleyin)
+# yeni bir bölüm veritabanı için:
+#   python manage.py migrate --database cse
+#   python manage.py sync_department_databases
+DEPARTMENT_DATABASES = {}
+for _item in os.environ.get('DEPARTMENT_DATABASES', '').split(','):
+    if not _item.strip():
+        continue
+    _code, _sep, _alias = (part.strip() for part in _item.partition('='))
+    if not (_code and _sep and _alias):
+        raise ImproperlyConfigured(
+            f'DEPARTMENT_DATABASES girdisi "BÖLÜM=alias" biçiminde olmalıdır: "{_item.strip()}"'
+        )
+    DEPARTMENT_DATABASES[_code] = _alias
+for _alias in set(DEPARTMENT_DATABASES.values()) - set(DATABASES):
+    DATABASES[_alias] = {**DATABASES['default'], 'NAME': BASE_DIR / f'db_{_alias}.sqlite3'}
+
+DATABASE_ROUTERS = ['course_management.routers.DepartmentRouter'] if DEPARTMENT_DATABASES else []
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+# REDIS_URL verilirse tüm worker'lar ortak önbelleği kullanır,
+# verilmezse her process kendi bellek içi önbelleğini kullanır
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ.get('REDIS_URL'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+
+# Sessions
+# https://docs.djangoproject.com/en/5.2/topics/http/sessions/
+
+# SESSION_MODE ile oturumların nerede tutulacağı seçilir:
+#   db             --> her istekte django_session tablosu okunur (django varsayılanı)
+#   cached_db      --> önce önbellekten okunur, tabloya sadece yazarken gidilir
+#   signed_cookies --> oturum imzalı cookie içinde tutulur, veritabanına hiç gidilmez
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+SESSION_MODE = os.environ.get('SESSION_MODE', 'cached_db')
+if SESSION_MODE not in SESSION_ENGINES:
+    raise ImproperlyConfigured(
+        f'SESSION_MODE "{SESSION_MODE}" geçersiz, şunlardan biri olmalıdır: {", ".join(SESSION_ENGINES)}'
+    )
+SESSION_ENGINE = SESSION_ENGINES[SESSION_MODE]
+
+# kullanıcı her istekte profiliyle birlikte tek sorguda yüklenir
+# ModelBackend eski oturumlar için listede: oturum, giriş yapılan backend'in yolunu saklar,
+# listede olmazsa dağıtımdan önce giriş yapmış herkesin oturumu düşer.
+# oturumlar dolduktan sonra (SESSION_COOKIE_AGE, varsayılan 2 hafta) kaldırılabilir
+AUTHENTICATION_BACKENDS = [
+    'course_management.backends.ProfileModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
+
+# Email
+# https://docs.djangoproject.com/en/5.2/topics/email/
+
+# yerelde e-postalar konsola yazılır, EMAIL_BACKEND ile SMTP veya dosya backend'i seçilir
+#   django.core.mail.backends.smtp.EmailBackend
+#   django.core.mail.backends.filebased.EmailBackend (EMAIL_FILE_PATH klasörüne yazar)
+EMAIL_BACKEND = os.environ.get('EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend')
+EMAIL_HOST = os.environ.get('EMAIL_HOST', 'localhost')
+EMAIL_PORT = int(os.environ.get('EMAIL_PORT', 25))
+EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER', '')
+EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD', '')
+EMAIL_USE_TLS = os.environ.get('EMAIL_USE_TLS') == 'True'
+EMAIL_TIMEOUT = 30
+EMAIL_FILE_PATH = os.environ.get('EMAIL_FILE_PATH', BASE_DIR / 'sent_emails')
+DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'noreply@localhost')
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -134,6 +232,45 @@ LOGOUT_REDIRECT_URL = 'login'
 
 STATIC_URL = 'static/'
 
+# ortak CSS dosyaları
+STATICFILES_DIRS = [BASE_DIR / 'static']
+
+# collectstatic çıktısı
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+# DEBUG kapalıyken dosyalar collectstatic ile parmak izli isimlere kopyalanır,
+# manifest yazılır ve .gz/.br sürümleri önceden üretilir. her dağıtımda çalıştırılmalı:
+#     python manage.py collectstatic --noinput
+# çalıştırılmadıysa sayfalar yine açılır ama statik dosyalar parmak izsiz adlarla
+# (uzun süreli önbellek olmadan) istenir
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': (
+            'django.contrib.staticfiles.storage.StaticFilesStorage' if DEBUG
+            else 'course_management.storage.CompressedManifestStaticFilesStorage'
+        ),
+    },
+}
+
+# önünde nginx vb. olmayan kurulumlarda statik dosyaları uygulama sunsun
+SERVE_STATIC = os.environ.get('SERVE_STATIC') == 'True'
+
+# bu boyuttan (byte) büyük HTML/JSON cevapları gzip ile sıkıştırılır
+GZIP_MIN_SIZE = 1024
+
+# staff kullanıcılar ?_profile=1 ile istek başına profil çıkarabilir
+PROFILING = os.environ.get('PROFILING') == 'True'
+PROFILE_DIR = os.environ.get('PROFILE_DIR', BASE_DIR / 'profiles')
+
+# canlı not defteri (server-sent events, sadece ASGI altında)
+# varsayılan yayın/abonelik tek süreç içindir, birden fazla worker için
+# ortak bir arka uç yazılıp buraya verilmeli (bkz. course_management/live.py)
+LIVE_UPDATES_BACKEND = os.environ.get('LIVE_UPDATES_BACKEND', 'course_management.live.InProcessBroker')
+LIVE_UPDATES_HEARTBEAT = 15
+
 # yüklenecek medya dosyaları için ayarlar
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
@@ -14,3 +14,10 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'CSE311PROJECTT.settings')
 
 application = get_wsgi_application()
+
+# WARMUP_ON_STARTUP=True --> her worker ilk isteği beklemeden şablonları derler,
+# URL'leri çözer, veritabanı bağlantısını açar ve önbelleği doldurur
+# gunicorn --preload ile kullanmayın: master'da açılan bağlantı fork ile worker'lara paylaşılır
+if os.environ.get('WARMUP_ON_STARTUP') == 'True':
+    from course_management.warmup import warm_up
+    warm_up()
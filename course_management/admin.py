@@ -1,17 +1,173 @@
-from django.contrib import admin
-from .models import Profile, Course, EvaluationComponent, LearningOutcome, Grade, ProgramOutcome
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin import helpers
+from django.template.response import TemplateResponse
+from django.utils import timezone
+from .models import (
+    Profile, Course, EvaluationComponent, LearningOutcome, Grade, ProgramOutcome, Term, GradeNotification, Department
+)
+from . import changefeed
+from .forms import EvaluationComponentAdminForm, GradeForm
+from .notifications import queue_notifications
+from .reports import invalidate_department_report
 
 
 # admin paneli
+# tablolar çok büyüyebilir (milyonlarca not): her changelist için
+# - __str__ içinde kullanılan ilişkiler list_select_related ile tek sorguda gelir
+# - yabancı anahtarlar için bütün tabloyu sayfaya basan <select> yerine autocomplete kullanılır
+# - toplam kayıt sayısı için ayrıca COUNT(*) atılmaz (show_full_result_count)
+
+class TermAdmin(admin.ModelAdmin):
+    list_display = ('code', 'name', 'start_date', 'end_date', 'is_active', 'is_archived')
+    list_filter = ('is_active', 'is_archived')
+    search_fields = ('code', 'name')
+    # arşiv durumu sadece archive_term komutu ile değişir
+    readonly_fields = ('is_archived',)
+
+
+class DepartmentAdmin(admin.ModelAdmin):
+    list_display = ('code', 'name')
+    search_fields = ('code', 'name')
+
+
 class CourseAdmin(admin.ModelAdmin):
-    list_display = ('course_code', 'course_name')
+    list_display = ('course_code', 'course_name', 'term', 'department')
+    list_filter = ('term', 'department')
+    list_select_related = ('term', 'department')
     search_fields = ('course_code', 'course_name')
-    filter_horizontal = ('instructors', 'students',)
+    # filter_horizontal bütün öğrencileri sayfaya basıyordu
+    autocomplete_fields = ('term', 'department', 'instructors', 'students')
+    show_full_result_count = False
+
+
+class CourseChoiceForm(forms.Form):
+    """toplu ders kaydı için ders seçimi"""
+    course = forms.ModelChoiceField(queryset=Course.objects.active().order_by('course_code'), label="Ders")
+
+
+class ProfileAdmin(admin.ModelAdmin):
+    list_display = ('user', 'role', 'department')
+    list_filter = ('role', 'department')
+    list_select_related = ('user', 'department')
+    search_fields = ('user__username', 'user__first_name', 'user__last_name')
+    autocomplete_fields = ('user',)
+    show_full_result_count = False
+    actions = ('enroll_selected_students',)
+
+    @admin.action(description="Seçili öğrencileri bir derse kaydet")
+    def enroll_selected_students(self, request, queryset):
+        student_ids = list(queryset.filter(role='student').values_list('user_id', flat=True))
+
+        if 'apply' in request.POST:
+            form = CourseChoiceForm(request.POST)
+            if form.is_valid():
+                course = form.cleaned_data['course']
+                # tek INSERT ile ekle, zaten kayıtlı olanları atla
+                Enrollment = Course.students.through
+                enrolled = set(
+                    Enrollment.objects.filter(course_id=course.id, user_id__in=student_ids)
+                    .values_list('user_id', flat=True)
+                )
+                new_ids = [student_id for student_id in student_ids if student_id not in enrolled]
+                Enrollment.objects.bulk_create(
+                    [Enrollment(course_id=course.id, user_id=student_id) for student_id in new_ids],
+                    ignore_conflicts=True,
+                )
+                changefeed.record(
+                    'enrollment', [changefeed.enrollment_key(course.id, student_id) for student_id in new_ids]
+                )
+                # bulk_create m2m_changed sinyalini tetiklemez, rapor önbelleği elle temizlenir
+                if new_ids:
+                    invalidate_department_report()
+                self.message_user(
+                    request,
+                    f'{len(new_ids)} öğrenci "{course.course_code}" dersine kaydedildi, '
+                    f'{len(enrolled)} öğrenci zaten kayıtlıydı.',
+                    messages.SUCCESS,
+                )
+                return None
+        else:
+            form = CourseChoiceForm()
+
+        context = {
+            **self.admin_site.each_context(request),
+            'title': "Seçili öğrencileri derse kaydet",
+            'opts': self.model._meta,
+            'form': form,
+            'queryset': queryset,
+            'student_count': len(student_ids),
+            'action_checkbox_name': helpers.ACTION_CHECKBOX_NAME,
+        }
+        return TemplateResponse(request, 'admin/course_management/enroll_students.html', context)
+
+
+class EvaluationComponentAdmin(admin.ModelAdmin):
+    form = EvaluationComponentAdminForm
+    list_display = ('name', 'course', 'percentage')
+    list_select_related = ('course',)
+    search_fields = ('name', 'course__course_code')
+    autocomplete_fields = ('course',)
+    show_full_result_count = False
+
+
+class LearningOutcomeAdmin(admin.ModelAdmin):
+    list_display = ('__str__', 'course')
+    list_select_related = ('course',)
+    search_fields = ('description', 'course__course_code')
+    autocomplete_fields = ('course',)
+    show_full_result_count = False
+
+
+class GradeAdmin(admin.ModelAdmin):
+    form = GradeForm
+    list_display = ('student', 'component', 'score', 'announced_at')
+    list_select_related = ('student', 'component__course')
+    # dönem ve duyuru durumu az değerli, indeksli alanlar
+    list_filter = ('component__course__term', ('announced_at', admin.EmptyFieldListFilter))
+    # kullanıcı adı ve ders kodu ile başlayan aramalar
+    search_fields = ('^student__username', '^component__course__course_code')
+    autocomplete_fields = ('student', 'component')
+    show_full_result_count = False
+    actions = ('announce_grades',)
+
+    @admin.action(description="Seçili notları öğrencilere e-postayla duyur")
+    def announce_grades(self, request, queryset):
+        # tek UPDATE, sadece girilmiş ve henüz duyurulmamış notlar
+        # update() sinyal tetiklemez, değişiklik akışına elle yazılır
+        to_announce = queryset.filter(score__isnull=False, announced_at__isnull=True)
+        rows = list(to_announce.values_list('id', 'student_id', 'component__course_id'))
+        grade_ids = [grade_id for grade_id, _, _ in rows]
+        now = timezone.now()
+        updated = Grade.objects.filter(id__in=grade_ids).update(announced_at=now, updated_at=now)
+        changefeed.record('grade', grade_ids)
+        # öğrenci ve ders başına tek bildirim
+        queue_notifications((student_id, course_id) for _, student_id, course_id in rows)
+        self.message_user(request, f'{updated} not duyuruldu, öğrencilere bildirim gönderilecek.', messages.SUCCESS)
+
+
+class GradeNotificationAdmin(admin.ModelAdmin):
+    list_display = ('student', 'course', 'created_at', 'sent_at', 'failed_at', 'attempts', 'next_attempt_at')
+    list_select_related = ('student', 'course')
+    list_filter = (('sent_at', admin.EmptyFieldListFilter), ('failed_at', admin.EmptyFieldListFilter))
+    search_fields = ('^student__username', '^course__course_code')
+    readonly_fields = ('created_at',)
+    show_full_result_count = False
+
+
+class ProgramOutcomeAdmin(admin.ModelAdmin):
+    list_display = ('code', 'department', 'description')
+    list_filter = ('department',)
+    list_select_related = ('department',)
+    search_fields = ('code', 'description')
 
 
+admin.site.register(Term, TermAdmin)
 admin.site.register(Course, CourseAdmin)
-admin.site.register(Profile)
-admin.site.register(EvaluationComponent)
-admin.site.register(LearningOutcome)
-admin.site.register(Grade)
-admin.site.register(ProgramOutcome)
+admin.site.register(Profile, ProfileAdmin)
+admin.site.register(EvaluationComponent, EvaluationComponentAdmin)
+admin.site.register(LearningOutcome, LearningOutcomeAdmin)
+admin.site.register(Grade, GradeAdmin)
+admin.site.register(ProgramOutcome, ProgramOutcomeAdmin)
+admin.site.register(Department, DepartmentAdmin)
+admin.site.register(GradeNotification, GradeNotificationAdmin)
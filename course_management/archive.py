@@ -0,0 +1,132 @@
+from django.db import connections, router, transaction
+
+from .models import ArchivedEnrollment, ArchivedGrade, Course, EvaluationComponent, Grade
+from .reports import invalidate_department_report
+from . import changefeed
+from .tenancy import database_departments, department_context
+
+
+class ArchiveError(Exception):
+    """dönem arşivlenemediğinde fırlatılır"""
+
+
+def archive_term(term, batch_size=1000):
+    """
+    kapanmış bir dönemin notlarını ve ders kayıtlarını arşiv tablolarına taşı
+
+    Grade, EvaluationComponent ve Course.students ara tablosu sadece güncel
+    dönemin verisini tutacak kadar küçük kalır. dersler ve öğrenim çıktıları
+    silinmez, arşiv kayıtları onlara bağlıdır.
+    (arşivlenen not sayısı, arşivlenen kayıt sayısı) döner
+    """
+    if term.is_archived:
+        raise ArchiveError(f'"{term.code}" dönemi zaten arşivlenmiş.')
+    if not term.is_closed:
+        raise ArchiveError(f'"{term.code}" dönemi henüz kapanmamış, arşivlenemez.')
+
+    grade_count = 0
+    enrollment_count = 0
+    # bölüm veritabanları kullanılıyorsa her veritabanı ayrı taşınır
+    for department in database_departments():
+        with department_context(department):
+            grades, enrollments = _archive_term_data(term, batch_size)
+        grade_count += grades
+        enrollment_count += enrollments
+
+    term.is_archived = True
+    term.save(update_fields=['is_archived'])
+
+    # notlar toplu silindi, sinyal tetiklenmedi
+    invalidate_department_report()
+    return grade_count, enrollment_count
+
+
+def _delete_rows(using, model, column, values):
+    """
+    tek DELETE, sinyal yok (satır başına değişiklik akışı, canlı not defteri, rapor)
+    çağıran akışa kendisi yazar; tabloya bağlı başka tablo olmamalı
+    """
+    if not values:
+        return
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {quote(model._meta.db_table)} WHERE {quote(column)} IN "
+            f"({', '.join(['%s'] * len(values))})",
+            list(values),
+        )
+
+
+def _archive_term_data(term, batch_size):
+    """geçerli bölümün veritabanındaki dönem verisini taşı"""
+    course_ids = list(Course.objects.filter(term=term).values_list('id', flat=True))
+    Enrollment = Course.students.through
+
+    grade_count = 0
+    enrollment_count = 0
+
+    using = router.db_for_write(Grade)
+    with transaction.atomic(using=using):
+        # notları parça parça taşı --> büyük dönemlerde belleği şişirmesin
+        grades = (
+            Grade.objects
+            .filter(component__course_id__in=course_ids)
+            .values_list('id', 'student_id', 'score', 'component__course_id', 'component__name',
+                         'component__percentage')
+            .order_by('id')
+        )
+        last_id = 0
+        while True:
+            chunk = list(grades.filter(id__gt=last_id)[:batch_size])
+            if not chunk:
+                break
+            ArchivedGrade.objects.bulk_create([
+                ArchivedGrade(
+                    term=term,
+                    course_id=course_id,
+                    student_id=student_id,
+                    component_name=name,
+                    component_percentage=percentage,
+                    score=score,
+                )
+                for _, student_id, score, course_id, name, percentage in chunk
+            ])
+            grade_ids = [row[0] for row in chunk]
+            # notlara bağlı tablo yok, akışa parça için bir kez yazılır
+            _delete_rows(using, Grade, 'id', grade_ids)
+            changefeed.record('grade', grade_ids, action='delete')
+            grade_count += len(chunk)
+            last_id = chunk[-1][0]
+
+        # ders kayıtları
+        enrollments = (
+            Enrollment.objects
+            .filter(course_id__in=course_ids)
+            .values_list('id', 'course_id', 'user_id')
+            .order_by('id')
+        )
+        last_id = 0
+        while True:
+            chunk = list(enrollments.filter(id__gt=last_id)[:batch_size])
+            if not chunk:
+                break
+            ArchivedEnrollment.objects.bulk_create([
+                ArchivedEnrollment(term=term, course_id=course_id, student_id=student_id)
+                for _, course_id, student_id in chunk
+            ])
+            Enrollment.objects.filter(id__in=[row[0] for row in chunk]).delete()
+            changefeed.record(
+                'enrollment',
+                [changefeed.enrollment_key(course_id, student_id) for _, course_id, student_id in chunk],
+                action='delete',
+            )
+            enrollment_count += len(chunk)
+            last_id = chunk[-1][0]
+
+        # notları taşındığı için bileşenler artık gereksiz
+        # (bağlı notlar yukarıda silindi, cascade toplanacak satır yok)
+        _delete_rows(using, EvaluationComponent, 'course_id', course_ids)
+
+    return grade_count, enrollment_count
+
@@ -0,0 +1,19 @@
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth import get_user_model
+
+UserModel = get_user_model()
+
+
+class ProfileModelBackend(ModelBackend):
+    """
+    django'nun ModelBackend'i ile aynı, tek farkı oturumdaki kullanıcıyı
+    profiliyle (ve bölümüyle) birlikte yüklemesi --> decoratorlardaki request.user.profile
+    ve DepartmentMiddleware her istekte ayrı bir sorgu atmaz
+    """
+
+    def get_user(self, user_id):
+        try:
+            user = UserModel._default_manager.select_related('profile__department').get(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
@@ -0,0 +1,127 @@
+from .models import ChangeLog, Course, Grade, LearningOutcome, ProgramOutcome
+
+DEFAULT_LIMIT = 1000
+MAX_LIMIT = 10000
+
+
+def enrollment_key(course_id, student_id):
+    return f'{course_id}:{student_id}'
+
+
+def record(model, keys, action='upsert'):
+    """değişen kayıtları tek INSERT ile akışa ekle"""
+    ChangeLog.objects.bulk_create([
+        ChangeLog(model=model, object_key=str(key), action=action) for key in keys
+    ])
+
+
+def latest_cursor():
+    """akışın şu anki sonu --> ilk tam senkronizasyondan sonra buradan devam edilir"""
+    return ChangeLog.objects.order_by('-id').values_list('id', flat=True).first() or 0
+
+
+# ---------------------------------------------------------------- satır verisi
+
+def _iso(value):
+    return value.isoformat() if value else None
+
+
+def _grade_rows(ids):
+    rows = Grade.objects.filter(id__in=ids).values(
+        'id', 'student_id', 'component_id', 'component__course_id', 'score', 'announced_at', 'updated_at'
+    )
+    return {
+        str(row['id']): {
+            'id': row['id'],
+            'student_id': row['student_id'],
+            'component_id': row['component_id'],
+            'course_id': row['component__course_id'],
+            'score': str(row['score']) if row['score'] is not None else None,
+            'announced_at': _iso(row['announced_at']),
+            'updated_at': _iso(row['updated_at']),
+        }
+        for row in rows
+    }
+
+
+def _course_rows(ids):
+    rows = Course.objects.filter(id__in=ids).values('id', 'course_code', 'course_name', 'term_id', 'updated_at')
+    return {str(row['id']): {**row, 'updated_at': _iso(row['updated_at'])} for row in rows}
+
+
+def _learning_outcome_rows(ids):
+    rows = LearningOutcome.objects.filter(id__in=ids).values('id', 'course_id', 'description', 'updated_at')
+    return {str(row['id']): {**row, 'updated_at': _iso(row['updated_at'])} for row in rows}
+
+
+def _program_outcome_rows(ids):
+    rows = ProgramOutcome.objects.filter(id__in=ids).values('id', 'code', 'description', 'updated_at')
+    return {str(row['id']): {**row, 'updated_at': _iso(row['updated_at'])} for row in rows}
+
+
+def _enrollment_rows(keys):
+    pairs = [tuple(int(part) for part in key.split(':')) for key in keys]
+    course_ids = {course_id for course_id, _ in pairs}
+    student_ids = {student_id for _, student_id in pairs}
+    existing = Course.students.through.objects.filter(
+        course_id__in=course_ids, user_id__in=student_ids
+    ).values_list('course_id', 'user_id')
+    return {
+        enrollment_key(course_id, student_id): {'course_id': course_id, 'student_id': student_id}
+        for course_id, student_id in existing
+    }
+
+
+# model --> anahtar listesinden {anahtar: veri} üreten fonksiyon
+ROW_LOADERS = {
+    'grade': lambda keys: _grade_rows([int(k) for k in keys]),
+    'course': lambda keys: _course_rows([int(k) for k in keys]),
+    'learning_outcome': lambda keys: _learning_outcome_rows([int(k) for k in keys]),
+    'program_outcome': lambda keys: _program_outcome_rows([int(k) for k in keys]),
+    'enrollment': _enrollment_rows,
+}
+
+
+def changes_since(cursor, limit=DEFAULT_LIMIT):
+    """
+    imleçten sonraki değişiklikleri sabit sırada döndür
+
+    aynı kayda ait birden çok değişiklik tek satıra indirilir (son hali),
+    silinen kayıtlar için veri yerine "delete" işaretli satır (tombstone) döner.
+    maliyet tablo boyutuna değil, imleçten sonraki değişiklik sayısına bağlıdır.
+    (değişiklikler, sonraki imleç, devamı var mı) döner
+    """
+    limit = min(max(int(limit), 1), MAX_LIMIT)
+    log = list(
+        ChangeLog.objects.filter(id__gt=cursor).order_by('id')
+        .values_list('id', 'model', 'object_key', 'action')[:limit + 1]
+    )
+    has_more = len(log) > limit
+    log = log[:limit]
+    if not log:
+        return [], cursor, False
+
+    # her kaydın son değişikliği
+    latest = {}
+    for change_id, model, key, action in log:
+        latest[(model, key)] = (change_id, action)
+
+    # güncel veriyi model başına tek sorguyla çek
+    keys_by_model = {}
+    for (model, key), (_, action) in latest.items():
+        if action == 'upsert':
+            keys_by_model.setdefault(model, []).append(key)
+    data = {model: ROW_LOADERS[model](keys) for model, keys in keys_by_model.items()}
+
+    changes = []
+    for (model, key), (change_id, action) in sorted(latest.items(), key=lambda item: item[1][0]):
+        row = data.get(model, {}).get(key) if action == 'upsert' else None
+        changes.append({
+            'cursor': change_id,
+            'model': model,
+            'key': key,
+            # sonradan silinmiş ama silinmesi henüz akışa düşmemiş kayıt da tombstone olur
+            'action': 'upsert' if row is not None else 'delete',
+            'data': row,
+        })
+    return changes, log[-1][0], has_more
@@ -71,3 +71,20 @@ def user_is_department_head(function):
             raise PermissionDenied
 
     return wrap
+
+
+def user_is_staff(function):
+    """
+    giriş yapan kullanıcı staff (admin paneline erişimi olan) mı
+    dış sistem entegrasyonları ve bakım sayfaları için
+    """
+    def wrap(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return redirect('login')
+
+        if request.user.is_staff:
+            return function(request, *args, **kwargs)
+        # staff değilse yetki yok hatası ver
+        raise PermissionDenied
+
+    return wrap
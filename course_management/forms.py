@@ -1,5 +1,6 @@
 from django import forms
-from .models import EvaluationComponent, LearningOutcome, Course, ProgramOutcome
+from .models import EvaluationComponent, LearningOutcome, Course, ProgramOutcome, Term, Grade
+from .validation import WEIGHT_TOTAL, validate_grade_rows, weight_totals
 from django.contrib.auth import get_user_model
 
 # user modelini al
@@ -19,6 +20,57 @@ class EvaluationComponentForm(forms.ModelForm):
             'percentage': forms.NumberInput(attrs={'class': 'form-control', 'min': 0, 'max': 100}),
         }
 
+    def __init__(self, *args, course=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # ağırlık kontrolü için bileşenin dersi (yeni bileşende instance'ta henüz yok)
+        self.course = course or (self.instance.course if self.instance.course_id else None)
+
+    def clean_percentage(self):
+        percentage = self.cleaned_data['percentage']
+        # admin formunda ders alanı da var
+        course = self.cleaned_data.get('course', self.course)
+        if course is None:
+            return percentage
+        # dersin diğer bileşenleriyle birlikte toplam 100'ü geçemez
+        others = weight_totals([course]).get(course.pk, 0)
+        if self.instance.pk and self.instance.course_id == course.pk:
+            # düzenlenen bileşenin eski ağırlığı (instance henüz form verisiyle güncellenmedi)
+            others -= self.instance.percentage
+        if others + percentage > WEIGHT_TOTAL:
+            raise forms.ValidationError(
+                f'Bileşen ağırlıkları toplamı %{WEIGHT_TOTAL} değerini geçemez. '
+                f'Bu dersin diğer bileşenlerinin toplamı: %{others}'
+            )
+        return percentage
+
+
+class EvaluationComponentAdminForm(EvaluationComponentForm):
+    """admin: ders de formdan seçilir, ağırlık kontrolü seçilen derse göre yapılır"""
+
+    class Meta(EvaluationComponentForm.Meta):
+        fields = ['course', 'name', 'percentage']
+        # admin kendi etiket ve widget'larını kullanır
+        labels = {}
+        widgets = {}
+
+
+class GradeForm(forms.ModelForm):
+    """tek not girişi (admin), not defteriyle aynı doğrulama"""
+
+    class Meta:
+        model = Grade
+        fields = ['student', 'component', 'score', 'announced_at']
+
+    def clean(self):
+        cleaned_data = super().clean()
+        student = cleaned_data.get('student')
+        component = cleaned_data.get('component')
+        if student and component:
+            violations = validate_grade_rows([(student.id, component.id, cleaned_data.get('score'))])
+            if violations:
+                raise forms.ValidationError([violation['message'] for violation in violations])
+        return cleaned_data
+
 
 class LearningOutcomeForm(forms.ModelForm):
     class Meta:
@@ -37,20 +89,30 @@ class CourseCreateForm(forms.ModelForm):
 
     class Meta:
         model = Course
-        # sadece bu iki alanla ders oluşturulsun
-        fields = ['course_code', 'course_name']
+        # sadece bu alanlarla ders oluşturulsun
+        fields = ['course_code', 'course_name', 'term']
         labels = {
             'course_code': 'Ders Kodu (örn: CSE311)',
             'course_name': 'Ders Adı (örn: Yazılım Mühendisliği)',
+            'term': 'Dönem',
         }
 
+    def __init__(self, *args, department=None, **kwargs):
+        """arşivlenmiş dönemlere ders açılmasın, varsayılan aktif dönem olsun"""
+        super().__init__(*args, **kwargs)
+        # ders, formu kullanan bölüm başkanının bölümünde açılır
+        self.instance.department = department
+        self.fields['term'].queryset = Term.objects.filter(is_archived=False)
+        if not self.is_bound:
+            self.fields['term'].initial = Term.objects.filter(is_active=True).first()
+
 
 class InstructorAssignForm(forms.Form):
     """bölüm başkanının bir derse hoca ataması için form"""
 
-    # tüm dersleri listeleyen bir dropdown
+    # aktif dönemdeki dersleri listeleyen bir dropdown
     course = forms.ModelChoiceField(
-        queryset=Course.objects.all().order_by('course_code'),
+        queryset=Course.objects.active().order_by('course_code'),
         label="Ders Seçin",
         widget=forms.Select(attrs={'class': 'form-control'})
     )
@@ -62,9 +124,11 @@ class InstructorAssignForm(forms.Form):
         widget=forms.Select(attrs={'class': 'form-control'})
     )
 
-    def __init__(self, *args, **kwargs):
-        """dropdownlarda daha okunaklı isimler göster"""
+    def __init__(self, *args, department=None, **kwargs):
+        """sadece bölümün dersleri ve hocaları, dropdownlarda daha okunaklı isimler göster"""
         super().__init__(*args, **kwargs)
+        self.fields['course'].queryset = self.fields['course'].queryset.for_department(department)
+        self.fields['instructor'].queryset = self.fields['instructor'].queryset.filter(profile__department=department)
         self.fields['course'].label_from_instance = lambda obj: f"{obj.course_code} - {obj.course_name}"
         self.fields['instructor'].label_from_instance = lambda obj: obj.get_full_name() or obj.username
 
@@ -72,9 +136,9 @@ class InstructorAssignForm(forms.Form):
 class StudentAssignForm(forms.Form):
     """bölüm başkanının bir derse öğrenci ataması için form"""
 
-    # tüm dersleri listeleyen bir dropdown
+    # aktif dönemdeki dersleri listeleyen bir dropdown
     course = forms.ModelChoiceField(
-        queryset=Course.objects.all().order_by('course_code'),
+        queryset=Course.objects.active().order_by('course_code'),
         label="Ders Seçin",
         widget=forms.Select(attrs={'class': 'form-control'})
     )
@@ -86,9 +150,11 @@ class StudentAssignForm(forms.Form):
         widget=forms.Select(attrs={'class': 'form-control'})
     )
 
-    def __init__(self, *args, **kwargs):
-        """dropdownlarda daha okunaklı isimler göster"""
+    def __init__(self, *args, department=None, **kwargs):
+        """sadece bölümün dersleri ve öğrencileri, dropdownlarda daha okunaklı isimler göster"""
         super().__init__(*args, **kwargs)
+        self.fields['course'].queryset = self.fields['course'].queryset.for_department(department)
+        self.fields['student'].queryset = self.fields['student'].queryset.filter(profile__department=department)
         self.fields['course'].label_from_instance = lambda obj: f"{obj.course_code} - {obj.course_name}"
         self.fields['student'].label_from_instance = lambda obj: obj.get_full_name() or obj.username
 
@@ -120,3 +186,51 @@ class ProgramOutcomeForm(forms.ModelForm):
             'code': forms.TextInput(attrs={'class': 'form-control'}),
             'description': forms.Textarea(attrs={'class': 'form-control', 'rows': 4}),
         }
+
+    def __init__(self, *args, department=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # çıktı, formu kullanan bölüm başkanının bölümüne eklenir
+        self.instance.department = department
+
+    def clean_code(self):
+        """kod bölüm içinde unique (department formda olmadığı için django kontrol etmez)"""
+        code = self.cleaned_data['code']
+        duplicates = ProgramOutcome.objects.for_department(self.instance.department).filter(code=code)
+        if duplicates.exclude(pk=self.instance.pk).exists():
+            raise forms.ValidationError("Bu bölümde bu kodla bir program çıktısı zaten var.")
+        return code
+
+
+class CourseRolloverForm(forms.Form):
+    """bölüm başkanının dersleri yeni döneme kopyalaması için form"""
+
+    # arşivlenen dönemin bileşenleri silinir, oradan kopyalanan dersler bileşensiz kalırdı
+    source_term = forms.ModelChoiceField(
+        queryset=Term.objects.filter(is_archived=False),
+        required=False,
+        empty_label="(Dönemi olmayan dersler)",
+        label="Kaynak Dönem",
+        widget=forms.Select(attrs={'class': 'form-control'})
+    )
+    target_term = forms.ModelChoiceField(
+        queryset=Term.objects.filter(is_archived=False),
+        label="Hedef Dönem",
+        widget=forms.Select(attrs={'class': 'form-control'})
+    )
+    course_codes = forms.CharField(
+        required=False,
+        label="Ders Kodları (boşluk veya virgülle ayırın, boş: tüm dersler)",
+        widget=forms.TextInput(attrs={'class': 'form-control'})
+    )
+    copy_instructors = forms.BooleanField(required=False, initial=True, label="Hoca atamalarını da kopyala")
+
+    def clean_course_codes(self):
+        """'CSE311, CSE312' --> ['CSE311', 'CSE312']"""
+        raw = self.cleaned_data['course_codes']
+        return [code for code in raw.replace(',', ' ').split() if code]
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if cleaned_data.get('target_term') and cleaned_data.get('source_term') == cleaned_data.get('target_term'):
+            raise forms.ValidationError("Kaynak ve hedef dönem aynı olamaz.")
+        return cleaned_data
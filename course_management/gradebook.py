@@ -0,0 +1,194 @@
+from decimal import Decimal, InvalidOperation
+
+from django.core.paginator import Paginator
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Q, Sum, Value
+from django.db.models.functions import Coalesce
+
+from django.utils import timezone
+
+from .models import Grade
+from .reports import invalidate_department_report
+from .validation import validate_grade_cells
+from . import changefeed, live
+
+
+# not defteri sayfa boyutu ayarları
+DEFAULT_PAGE_SIZE = 50
+PAGE_SIZE_CHOICES = (25, 50, 100, 200)
+
+# sıralama seçenekleri --> (anahtar, etiket)
+SORT_CHOICES = (
+    ('name', 'İsme Göre'),
+    ('score', 'Ortalamaya Göre'),
+)
+
+
+def _weighted_final_expression(course):
+    """öğrencinin bu dersteki ağırlıklı ortalamasını veritabanında hesaplayan ifade"""
+    weighted = ExpressionWrapper(
+        F('grades__score') * F('grades__component__percentage') / Value(Decimal('100')),
+        output_field=DecimalField(max_digits=7, decimal_places=2)
+    )
+    return Coalesce(
+        Sum(weighted, filter=Q(grades__component__course=course)),
+        Value(Decimal('0')),
+        output_field=DecimalField(max_digits=7, decimal_places=2)
+    )
+
+
+def build_gradebook_page(course, components, params):
+    """
+    not defterinin sadece görünen sayfasını hazırla
+
+    params --> request.GET (page, per_page, sort, dir, missing)
+    sayfanın maliyeti dersin mevcuduna değil sayfa boyutuna bağlıdır:
+    notlar sadece bu sayfadaki öğrenciler için çekilir
+    """
+    sort = params.get('sort', 'name')
+    if sort not in dict(SORT_CHOICES):
+        sort = 'name'
+    direction = 'desc' if params.get('dir') == 'desc' else 'asc'
+    missing_only = params.get('missing') == '1'
+
+    try:
+        per_page = int(params.get('per_page', DEFAULT_PAGE_SIZE))
+    except (TypeError, ValueError):
+        per_page = DEFAULT_PAGE_SIZE
+    if per_page not in PAGE_SIZE_CHOICES:
+        per_page = DEFAULT_PAGE_SIZE
+
+    students = course.students.all()
+    component_count = len(components)
+
+    if missing_only:
+        # en az bir bileşeninde notu eksik olan öğrenciler
+        students = students.annotate(
+            graded_count=Count(
+                'grades',
+                filter=Q(grades__component__course=course, grades__score__isnull=False)
+            )
+        ).filter(graded_count__lt=component_count)
+
+    if sort == 'score':
+        students = students.annotate(weighted_final=_weighted_final_expression(course))
+        order = ['weighted_final', 'last_name', 'first_name', 'id']
+    else:
+        order = ['last_name', 'first_name', 'id']
+    if direction == 'desc':
+        order = ['-' + field for field in order]
+    students = students.order_by(*order)
+
+    paginator = Paginator(students, per_page)
+    page_obj = paginator.get_page(params.get('page'))
+    page_students = list(page_obj.object_list)
+
+    # notları sadece görünen öğrenciler için tek seferde çek
+    page_grades = Grade.objects.filter(
+        component__in=components,
+        student__in=[s.id for s in page_students]
+    ).values_list('student_id', 'component_id', 'score')
+    grade_map = {(student_id, component_id): score for student_id, component_id, score in page_grades}
+
+    student_grade_rows = []
+    for student in page_students:
+        row = {
+            'student_object': student,
+            'grades_list': []
+        }
+        for component in components:
+            row['grades_list'].append({
+                'component_id': component.id,
+                'score': grade_map.get((student.id, component.id))
+            })
+        student_grade_rows.append(row)
+
+    # sayfa linkleri için page dışındaki parametreleri koru
+    query = params.copy()
+    query.pop('page', None)
+
+    return {
+        'page_obj': page_obj,
+        'student_grade_rows': student_grade_rows,
+        'student_total': paginator.count,
+        'sort': sort,
+        'dir': direction,
+        'missing_only': missing_only,
+        'per_page': per_page,
+        'sort_choices': SORT_CHOICES,
+        'page_size_choices': PAGE_SIZE_CHOICES,
+        'page_query': query.urlencode(),
+    }
+
+
+def parse_grade_cells(post_data):
+    """
+    POST verisindeki grade_<öğrenci>_<bileşen> hücrelerini ayrıştır
+    {(student_id, component_id): score veya None} döner
+    """
+    cells = {}
+    for key, value in post_data.items():
+        if not key.startswith('grade_'):
+            continue
+        try:
+            _, student_id, component_id = key.split('_')
+            cell = (int(student_id), int(component_id))
+        except ValueError:
+            raise ValueError(f'Geçersiz not alanı: {key}')
+        value = value.strip()
+        if value:
+            try:
+                cells[cell] = Decimal(value)
+            except InvalidOperation:
+                raise ValueError(f'Geçersiz not değeri: {value}')
+        else:
+            cells[cell] = None
+    return cells
+
+
+def save_grade_cells(course, cells):
+    """
+    gönderilen hücreleri toplu olarak kaydet
+    hücreler önce toplu olarak doğrulanır (not aralığı, derse kayıt, bileşenin dersi),
+    geçersiz hücre varsa hiçbiri kaydedilmez ve GradeValidationError fırlatılır
+    değişen Grade nesnelerinin listesini döner
+    """
+    if not cells:
+        return []
+
+    validate_grade_cells(course, cells)
+
+    existing = {
+        (g.student_id, g.component_id): g
+        for g in Grade.objects.filter(
+            student_id__in={student_id for student_id, _ in cells},
+            component_id__in={component_id for _, component_id in cells},
+        )
+    }
+
+    to_create = []
+    to_update = []
+    for (student_id, component_id), score in cells.items():
+        grade = existing.get((student_id, component_id))
+        if grade is None:
+            if score is None:
+                # boş hücre için boş kayıt açmaya gerek yok
+                continue
+            to_create.append(Grade(student_id=student_id, component_id=component_id, score=score))
+        elif grade.score != score:
+            grade.score = score
+            # bulk_update auto_now alanını güncellemez
+            grade.updated_at = timezone.now()
+            to_update.append(grade)
+
+    if to_create:
+        Grade.objects.bulk_create(to_create)
+    if to_update:
+        Grade.objects.bulk_update(to_update, ['score', 'updated_at'])
+    if to_create or to_update:
+        # toplu işlemler sinyal tetiklemez
+        invalidate_department_report()
+        changefeed.record('grade', [g.pk for g in to_create + to_update])
+        # not defterini açık tutan diğer kullanıcılara değişen hücreler
+        live.publish_grades(course.id, to_create + to_update)
+
+    return to_create + to_update
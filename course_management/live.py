@@ -0,0 +1,162 @@
+"""
+canlı not defteri
+
+bir not yazıldığında (not defterinden toplu kayıt veya tek tek save/delete)
+değişen hücreler dersin kanalına yayınlanır. gradebook_stream görünümü
+(server-sent events, ASGI) kanalı dinler ve hücreleri açık not defterlerine
+iletir, tarayıcı sayfayı yenilemeden sadece o hücreleri günceller.
+
+yayın/abonelik arka ucu LIVE_UPDATES_BACKEND ayarıyla değiştirilir.
+varsayılan InProcessBroker tek süreç içindir: birden fazla worker varsa her
+worker sadece kendi içindeki yazmaları görür. ortak bir arka uç (örn. Redis)
+için aynı arayüzü sağlayan bir sınıf yazmak yeterli:
+    publish(channel, message)  --> herhangi bir thread'den çağrılabilir
+    subscribe(channel)         --> get(timeout) (async) ve close() metotları olan nesne
+"""
+import asyncio
+import json
+import threading
+
+from django.conf import settings
+from django.db import router, transaction
+from django.utils.module_loading import import_string
+
+DEFAULT_BACKEND = 'course_management.live.InProcessBroker'
+
+# bu kadar saniye mesaj gelmezse yorum satırı gönderilir (proxy'ler boş bağlantıyı kapatmasın)
+HEARTBEAT = 15
+
+# yavaş bir istemci için bekletilen en fazla mesaj, dolarsa istemciye
+# 'resync' gönderilir (sayfayı yenilemesi gerekir)
+QUEUE_SIZE = 100
+
+RESYNC = {'type': 'resync'}
+
+
+def gradebook_channel(course_id, using='default'):
+    # bölüm veritabanlarında ders id'leri çakışabilir, kanal adında veritabanı da var
+    return f'gradebook:{using}:{course_id}'
+
+
+class Subscription:
+    """tek bir dinleyicinin kuyruğu, abone olunan event loop'ta okunur"""
+
+    def __init__(self, broker, channel, maxsize=QUEUE_SIZE):
+        self.broker = broker
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize)
+
+    def deliver(self, message):
+        # her zaman self.loop içinde çalışır (call_soon_threadsafe)
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # kaçırılan mesajlar telafi edilemez, istemci baştan yüklesin
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+
+    async def get(self, timeout=None):
+        """sıradaki mesaj, timeout dolarsa None"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class InProcessBroker:
+    """
+    süreç içi yayın/abonelik
+    publish herhangi bir thread'den (senkron görünümler) çağrılabilir,
+    mesaj abonenin event loop'una call_soon_threadsafe ile aktarılır
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = {}
+
+    def subscribe(self, channel):
+        """event loop içinden çağrılır"""
+        subscription = Subscription(self, channel)
+        with self._lock:
+            self._subscriptions.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.channel)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.channel]
+
+    def publish(self, channel, message):
+        """mesajı kanalın tüm abonelerine ilet, abone sayısını döner"""
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, message)
+            except RuntimeError:
+                # loop kapanmış (worker kapanıyor), abone zaten gitmiş
+                self.unsubscribe(subscription)
+        return len(subscriptions)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = import_string(getattr(settings, 'LIVE_UPDATES_BACKEND', DEFAULT_BACKEND))()
+    return _broker
+
+
+def _cell(grade, deleted=False):
+    score = None if deleted or grade.score is None else f'{grade.score:.2f}'
+    return {'student': grade.student_id, 'component': grade.component_id, 'score': score}
+
+
+def publish_grades(course_id, grades, deleted=False, using=None):
+    """
+    değişen notları dersin kanalına yayınla
+    işlem (transaction) içindeyse commit'ten sonra yayınlanır, geri alınırsa hiç yayınlanmaz
+    """
+    cells = [_cell(grade, deleted) for grade in grades]
+    if not cells:
+        return
+    from .models import Grade
+    using = using or router.db_for_write(Grade)
+    channel = gradebook_channel(course_id, using)
+    message = {'type': 'grades', 'cells': cells}
+    transaction.on_commit(lambda: get_broker().publish(channel, message), using=using)
+
+
+def _event(message):
+    return f"event: {message['type']}\ndata: {json.dumps(message)}\n\n"
+
+
+async def event_stream(channel, heartbeat=None):
+    """
+    kanalı server-sent events biçiminde akıt
+    istemci bağlantıyı kapatınca Django akışı iptal eder, abonelik finally'de kapanır
+    """
+    heartbeat = heartbeat or getattr(settings, 'LIVE_UPDATES_HEARTBEAT', HEARTBEAT)
+    # abonelik akışın okunduğu event loop'ta açılmalı --> ilk next() çağrısında
+    subscription = get_broker().subscribe(channel)
+    try:
+        # bağlantı koparsa tarayıcı 5 sn sonra yeniden bağlanır
+        yield 'retry: 5000\n\n'
+        while True:
+            message = await subscription.get(heartbeat)
+            yield ': ping\n\n' if message is None else _event(message)
+    finally:
+        subscription.close()
@@ -0,0 +1,363 @@
+"""
+giriş --> dashboard akışı için yük testi araçları
+
+sadece standart kütüphane kullanılır: uygulama localhost'ta bir thread içinde
+çalıştırılır, sanal kullanıcılar kendi cookie'leriyle istek atar
+"""
+import http.cookiejar
+import math
+import os
+import re
+import socketserver
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+from django.contrib.auth.hashers import make_password
+from django.db import connections, transaction
+from django.test.utils import setup_databases, teardown_databases
+
+from .models import Course, EvaluationComponent, Grade, Profile, User
+
+# yük testi için oluşturulan kullanıcılar bu önekle başlar
+SEED_PREFIX = 'loadtest_'
+SEED_PASSWORD = 'loadtest-password'
+
+_CSRF_INPUT_RE = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+
+
+# ---------------------------------------------------------------- veri
+
+@contextmanager
+def throwaway_databases():
+    """
+    yük testi gerçek veritabanlarına dokunmaz: test runner'ın kullandığı geçici
+    test veritabanları kurulur (migrate edilir) ve iş bitince silinir.
+    SQLite'ta bellek içi veritabanı yerine geçici dosya kullanılır ki sunucu
+    thread'leri aynı veritabanını görsün
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        for alias in connections:
+            settings_dict = connections[alias].settings_dict
+            if settings_dict['ENGINE'].endswith('sqlite3') and not settings_dict['TEST'].get('NAME'):
+                settings_dict['TEST']['NAME'] = os.path.join(directory, f'{alias}.sqlite3')
+        old_config = setup_databases(verbosity=0, interactive=False, serialized_aliases=set())
+        try:
+            yield
+        finally:
+            teardown_databases(old_config, verbosity=0)
+
+
+def seed_data(student_count, course_count, students_per_course, component_names=('Vize', 'Final')):
+    """
+    yük testi kullanıcılarını, derslerini ve notlarını toplu olarak oluştur
+    parola hash'i bir kez hesaplanır, tüm kullanıcılar aynı hash'i kullanır
+    (instructor kullanıcı adları, student kullanıcı adları) döner
+    """
+    password = make_password(SEED_PASSWORD)
+    percentages = _split_percentages(len(component_names))
+
+    with transaction.atomic():
+        students = User.objects.bulk_create([
+            User(username=f'{SEED_PREFIX}student_{i}', first_name='Yük', last_name=f'Öğrenci {i}', password=password)
+            for i in range(student_count)
+        ])
+        instructors = User.objects.bulk_create([
+            User(username=f'{SEED_PREFIX}instructor_{i}', first_name='Yük', last_name=f'Hoca {i}', password=password)
+            for i in range(course_count)
+        ])
+        # bulk_create sinyal tetiklemez, profilleri de elle oluştur
+        Profile.objects.bulk_create(
+            [Profile(user=u, role='student') for u in students] +
+            [Profile(user=u, role='instructor') for u in instructors]
+        )
+
+        courses = Course.objects.bulk_create([
+            Course(course_code=f'LT{i}', course_name=f'Yük Testi Dersi {i}')
+            for i in range(course_count)
+        ])
+        Course.instructors.through.objects.bulk_create([
+            Course.instructors.through(course_id=course.id, user_id=instructor.id)
+            for course, instructor in zip(courses, instructors)
+        ])
+
+        enrollments = []
+        for index, course in enumerate(courses):
+            for offset in range(min(students_per_course, student_count)):
+                student = students[(index * students_per_course + offset) % student_count]
+                enrollments.append(Course.students.through(course_id=course.id, user_id=student.id))
+        Course.students.through.objects.bulk_create(enrollments, ignore_conflicts=True)
+
+        components = EvaluationComponent.objects.bulk_create([
+            EvaluationComponent(course=course, name=name, percentage=percentage)
+            for course in courses
+            for name, percentage in zip(component_names, percentages)
+        ])
+        components_by_course = {}
+        for component in components:
+            components_by_course.setdefault(component.course_id, []).append(component)
+
+        Grade.objects.bulk_create([
+            Grade(student_id=enrollment.user_id, component=component,
+                  score=(enrollment.user_id * 7 + component.id * 13) % 101)
+            for enrollment in enrollments
+            for component in components_by_course[enrollment.course_id]
+        ], ignore_conflicts=True)
+
+    return [u.username for u in instructors], [u.username for u in students]
+
+
+def _split_percentages(count):
+    base = 100 // count
+    return [base] * (count - 1) + [100 - base * (count - 1)]
+
+
+# ---------------------------------------------------------------- sunucu
+
+class _ThreadingWSGIServer(socketserver.ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+    # çok sayıda eş zamanlı bağlantı için bekleme kuyruğu
+    request_queue_size = 256
+
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class LocalServer:
+    """uygulamayı localhost'ta rastgele bir portta arka planda çalıştırır"""
+
+    def __init__(self, mode='wsgi'):
+        self.mode = mode
+        self._server = None
+        self._thread = None
+        self.base_url = None
+
+    def start(self):
+        if self.mode == 'asgi':
+            self._start_asgi()
+        else:
+            self._start_wsgi()
+        return self
+
+    def _start_wsgi(self):
+        from django.core.wsgi import get_wsgi_application
+
+        self._server = make_server('127.0.0.1', 0, get_wsgi_application(),
+                                   server_class=_ThreadingWSGIServer, handler_class=_QuietHandler)
+        self.base_url = f'http://127.0.0.1:{self._server.server_port}'
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def _start_asgi(self):
+        # ASGI için uvicorn gerekir, kurulu değilse açık bir hata ver
+        try:
+            import uvicorn
+        except ImportError:
+            raise RuntimeError("ASGI modu için 'uvicorn' paketinin kurulu olması gerekir.")
+        import socket
+        from django.core.asgi import get_asgi_application
+
+        sock = socket.socket()
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+        config = uvicorn.Config(get_asgi_application(), log_level='warning', lifespan='off')
+        self._server = uvicorn.Server(config)
+        self._thread = threading.Thread(target=self._server.run, kwargs={'sockets': [sock]}, daemon=True)
+        self._thread.start()
+        while not self._server.started:
+            time.sleep(0.05)
+        self.base_url = f'http://127.0.0.1:{port}'
+
+    def stop(self):
+        if self.mode == 'asgi':
+            self._server.should_exit = True
+        else:
+            self._server.shutdown()
+            self._server.server_close()
+        self._thread.join(timeout=5)
+
+
+# ---------------------------------------------------------------- istemci
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class VirtualUser:
+    """kendi cookie'leri olan tek bir kullanıcı oturumu"""
+
+    def __init__(self, base_url, username, password=SEED_PASSWORD, timeout=30):
+        self.base_url = base_url
+        self.username = username
+        self.password = password
+        self.timeout = timeout
+        self.cookies = http.cookiejar.CookieJar()
+        self._opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(self.cookies), _NoRedirect()
+        )
+        self.dashboard_path = None
+
+    def request(self, path, data=None):
+        """(durum kodu, gövde, Location başlığı) döner"""
+        body = urllib.parse.urlencode(data).encode() if data is not None else None
+        req = urllib.request.Request(self.base_url + path, data=body)
+        if data is not None:
+            # CSRF kontrolü Referer/Origin ister
+            req.add_header('Referer', self.base_url + path)
+        try:
+            with self._opener.open(req, timeout=self.timeout) as response:
+                return response.status, response.read(), response.headers.get('Location')
+        except urllib.error.HTTPError as e:
+            return e.code, e.read(), e.headers.get('Location')
+
+    def login(self, stats):
+        """accounts/login --> dashboard_redirect --> rol paneli"""
+        status, body, _ = stats.timed('login_form', self.request, '/accounts/login/')
+        if status != 200:
+            # timed() hatayı zaten saydı
+            return False
+        match = _CSRF_INPUT_RE.search(body.decode('utf-8', 'replace'))
+        if not match:
+            stats.record_error('login_form')
+            return False
+
+        status, _, location = stats.timed('login_post', self.request, '/accounts/login/', {
+            'username': self.username,
+            'password': self.password,
+            'csrfmiddlewaretoken': match.group(1),
+        }, expect=(302,))
+        if status != 302:
+            return False
+
+        status, _, location = stats.timed('dashboard_redirect', self.request, urllib.parse.urlsplit(location).path,
+                                          expect=(302,))
+        if status != 302:
+            return False
+        self.dashboard_path = urllib.parse.urlsplit(location).path
+        return True
+
+
+# ---------------------------------------------------------------- istatistik
+
+class Stats:
+    """endpoint başına süre ve hata sayıları (thread-safe)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = {}
+        self.errors = {}
+        self.attempts = {}
+
+    def timed(self, name, func, *args, expect=(200,), **kwargs):
+        with self._lock:
+            self.attempts[name] = self.attempts.get(name, 0) + 1
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            self.record_error(name)
+            return None, b'', None
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.latencies.setdefault(name, []).append(elapsed)
+        if result[0] not in expect:
+            self.record_error(name)
+        return result
+
+    def record_error(self, name):
+        with self._lock:
+            self.errors[name] = self.errors.get(name, 0) + 1
+
+    def summary(self, elapsed):
+        rows = []
+        for name in sorted(set(self.attempts) | set(self.errors)):
+            samples = sorted(self.latencies.get(name, []))
+            errors = self.errors.get(name, 0)
+            # hata oranı deneme sayısına göre: istisna atan istekler süre örneği bırakmaz,
+            # beklenmeyen durum kodları ise hem süre hem hata olarak sayılır
+            total = self.attempts.get(name, 0)
+            rows.append({
+                'name': name,
+                'count': len(samples),
+                'errors': errors,
+                'error_rate': errors / total * 100 if total else 0.0,
+                'throughput': len(samples) / elapsed if elapsed else 0.0,
+                'p50': _percentile(samples, 50),
+                'p95': _percentile(samples, 95),
+                'p99': _percentile(samples, 99),
+            })
+        return rows
+
+
+def _percentile(samples, percent):
+    """en yakın sıra yöntemi, milisaniye döner"""
+    if not samples:
+        return 0.0
+    rank = max(math.ceil(percent / 100 * len(samples)), 1)
+    return samples[rank - 1] * 1000
+
+
+# ---------------------------------------------------------------- senaryo
+
+def manage_course_paths(instructor_usernames):
+    """her hoca için yönettiği ilk dersin sayfası"""
+    rows = (
+        Course.instructors.through.objects
+        .filter(user__username__in=instructor_usernames)
+        .order_by('course_id')
+        .values_list('user__username', 'course_id')
+    )
+    paths = {}
+    for username, course_id in rows:
+        paths.setdefault(username, f'/course/{course_id}/manage/')
+    return paths
+
+
+def run_load_test(base_url, usernames, concurrency, duration, extra_paths=None):
+    """
+    tüm kullanıcıları giriş yaptır, sonra süre dolana kadar panellerine istek at
+    extra_paths --> {kullanıcı adı: ek sayfa} (örn: hocalar için manage_course)
+    (login istatistikleri, login süresi, yük istatistikleri, yük süresi) döner
+    """
+    extra_paths = extra_paths or {}
+    login_stats = Stats()
+    users = [VirtualUser(base_url, username) for username in usernames]
+
+    login_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        logged_in = [user for user, ok in zip(users, pool.map(lambda u: u.login(login_stats), users)) if ok]
+    login_elapsed = time.perf_counter() - login_start
+
+    load_stats = Stats()
+    if not logged_in:
+        return login_stats, login_elapsed, load_stats, 0.0
+
+    deadline = time.perf_counter() + duration
+    next_user = iter(range(10 ** 12))
+    lock = threading.Lock()
+
+    def worker():
+        while time.perf_counter() < deadline:
+            with lock:
+                user = logged_in[next(next_user) % len(logged_in)]
+            name = user.dashboard_path.strip('/').replace('/', '_')
+            load_stats.timed(name, user.request, user.dashboard_path)
+            extra = extra_paths.get(user.username)
+            if extra:
+                load_stats.timed('manage_course', user.request, extra)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(worker)
+    elapsed = time.perf_counter() - start
+    return login_stats, login_elapsed, load_stats, elapsed
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from course_management.archive import ArchiveError, archive_term
+from course_management.models import Term
+
+
+class Command(BaseCommand):
+    help = "Kapanmış dönemlerin notlarını ve ders kayıtlarını arşiv tablolarına taşır."
+
+    def add_arguments(self, parser):
+        parser.add_argument('term_codes', nargs='*', help="Arşivlenecek dönem kodları (örn: 2024-GUZ)")
+        parser.add_argument('--all-closed', action='store_true',
+                            help="Kapanmış ve henüz arşivlenmemiş tüm dönemleri arşivle")
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help="Tek seferde taşınacak satır sayısı")
+
+    def handle(self, *args, **options):
+        if options['all_closed']:
+            terms = [t for t in Term.objects.filter(is_active=False, is_archived=False) if t.is_closed]
+        elif options['term_codes']:
+            terms = list(Term.objects.filter(code__in=options['term_codes']))
+            missing = set(options['term_codes']) - {t.code for t in terms}
+            if missing:
+                raise CommandError(f"Dönem bulunamadı: {', '.join(sorted(missing))}")
+        else:
+            raise CommandError("Dönem kodu verin veya --all-closed kullanın.")
+
+        if not terms:
+            self.stdout.write("Arşivlenecek dönem yok.")
+            return
+
+        for term in terms:
+            try:
+                grade_count, enrollment_count = archive_term(term, batch_size=options['batch_size'])
+            except ArchiveError as e:
+                raise CommandError(str(e))
+            self.stdout.write(self.style.SUCCESS(
+                f"{term.code}: {grade_count} not ve {enrollment_count} ders kaydı arşivlendi."
+            ))
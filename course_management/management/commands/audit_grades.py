@@ -0,0 +1,59 @@
+import json
+from collections import Counter
+from itertools import chain
+
+from django.core.management.base import BaseCommand, CommandError
+
+from course_management.tenancy import database_departments, department_context
+from course_management.validation import audit_grades, weight_violations
+
+
+class Command(BaseCommand):
+    help = (
+        "Tüm notları gruplar halinde tarar ve doğrulama ihlallerini raporlar: not aralığı, "
+        "derse kayıt, bileşenin dersi ve ders başına bileşen ağırlıkları toplamı."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help="Tek seferde kontrol edilecek not sayısı")
+        parser.add_argument('--show', type=int, default=10,
+                            help="Her ihlal türü için yazılacak örnek sayısı")
+        parser.add_argument('--json', action='store_true',
+                            help="Tüm ihlalleri satır başına bir JSON olacak şekilde yaz")
+        parser.add_argument('--fail', action='store_true',
+                            help="İhlal bulunursa hata koduyla çık (cron / CI için)")
+
+    def handle(self, *args, **options):
+        counts = Counter()
+        # bölüm veritabanları kullanılıyorsa her veritabanı ayrı taranır
+        for department in database_departments():
+            with department_context(department):
+                # notlar gruplar halinde okunur, ihlaller bulundukça yazılır
+                violations = chain(weight_violations(), audit_grades(batch_size=options['batch_size']))
+                for violation in violations:
+                    counts[violation['code']] += 1
+                    if options['json']:
+                        violation['department'] = department.code if department else None
+                        self.stdout.write(json.dumps(violation, ensure_ascii=False, default=str))
+                    elif counts[violation['code']] <= options['show']:
+                        self.stdout.write(self._describe(violation))
+
+        total = sum(counts.values())
+        if not options['json']:
+            if total:
+                summary = ', '.join(f"{code}: {count}" for code, count in sorted(counts.items()))
+                self.stdout.write(self.style.WARNING(f"{total} ihlal bulundu ({summary})."))
+            else:
+                self.stdout.write(self.style.SUCCESS("İhlal bulunamadı."))
+        if total and options['fail']:
+            raise CommandError(f"{total} ihlal bulundu.")
+
+    def _describe(self, violation):
+        if violation['code'] == 'weight_sum':
+            return f"[weight_sum] ders {violation['course_id']}: {violation['message']}"
+        return (
+            f"[{violation['code']}] not {violation['grade_id']} "
+            f"(öğrenci {violation['student_id']}, bileşen {violation['component_id']}, "
+            f"ders {violation['course_id']}): {violation['message']}"
+        )
@@ -0,0 +1,60 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from course_management import changefeed
+from course_management.tenancy import database_departments, database_for, department_context
+
+
+class Command(BaseCommand):
+    help = (
+        "Verilen imleçten (cursor) sonraki değişiklikleri satır başına bir JSON olacak şekilde yazar. "
+        "Son satır bir sonraki çalıştırmada kullanılacak imleci içerir. Bölüm veritabanları kullanılıyorsa "
+        "her veritabanının akışı ayrıdır: imleç {\"veritabanı\": imleç} biçiminde bir JSON nesnesidir "
+        "ve her değişiklik geldiği veritabanıyla birlikte yazılır."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('cursor', nargs='?', default='0',
+                            help="Son senkronizasyonun imleci (tam sayı veya veritabanı başına imleç JSON'u)")
+        parser.add_argument('--batch-size', type=int, default=changefeed.DEFAULT_LIMIT,
+                            help="Tek seferde okunacak değişiklik sayısı")
+        parser.add_argument('--latest', action='store_true',
+                            help="Değişiklik yazmadan sadece akışın şu anki imlecini yaz")
+
+    def handle(self, *args, **options):
+        departments = database_departments()
+        routed = len(departments) > 1
+        cursors = self._parse_cursor(options['cursor'])
+
+        next_cursors = {}
+        for department in departments:
+            database = database_for(department)
+            with department_context(department):
+                if options['latest']:
+                    next_cursors[database] = changefeed.latest_cursor()
+                    continue
+                cursor = cursors.get(database, 0) if isinstance(cursors, dict) else cursors
+                while True:
+                    changes, cursor, has_more = changefeed.changes_since(cursor, options['batch_size'])
+                    for change in changes:
+                        if routed:
+                            change['database'] = database
+                        self.stdout.write(json.dumps(change, ensure_ascii=False))
+                    if not has_more:
+                        break
+                next_cursors[database] = cursor
+
+        # tek veritabanında imleç eskisi gibi tam sayıdır
+        self.stdout.write(json.dumps({'next_cursor': next_cursors if routed else next_cursors['default']}))
+
+    def _parse_cursor(self, value):
+        try:
+            cursor = json.loads(value)
+        except ValueError:
+            raise CommandError("İmleç tam sayı veya JSON nesnesi olmalıdır.")
+        if isinstance(cursor, int):
+            return cursor
+        if isinstance(cursor, dict) and all(isinstance(v, int) for v in cursor.values()):
+            return cursor
+        raise CommandError("İmleç tam sayı veya JSON nesnesi olmalıdır.")
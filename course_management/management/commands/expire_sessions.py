@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = (
+        "Süresi dolmuş oturumları parça parça siler. "
+        "clearsessions'tan farkı tabloyu uzun süre kilitlemeden küçük DELETE'lerle çalışması."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help="Tek DELETE ile silinecek oturum sayısı")
+
+    def handle(self, *args, **options):
+        if settings.SESSION_ENGINE.endswith('signed_cookies'):
+            self.stdout.write("Oturumlar cookie içinde tutuluyor, silinecek kayıt yok.")
+            return
+
+        now = timezone.now()
+        expired = Session.objects.filter(expire_date__lt=now).order_by('session_key')
+        total = 0
+        while True:
+            keys = list(expired.values_list('session_key', flat=True)[:options['batch_size']])
+            if not keys:
+                break
+            with transaction.atomic():
+                Session.objects.filter(session_key__in=keys).delete()
+            total += len(keys)
+
+        # cached_db önbellekteki kayıtlar zaten kendi süreleriyle düşer
+        self.stdout.write(self.style.SUCCESS(f"{total} süresi dolmuş oturum silindi."))
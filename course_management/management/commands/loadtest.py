@@ -0,0 +1,72 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from course_management import loadtest
+
+
+class Command(BaseCommand):
+    help = (
+        "Uygulamayı localhost'ta başlatır, çok sayıda kullanıcıyı giriş yaptırıp "
+        "student_dashboard ve manage_course sayfalarına eş zamanlı istek atar; "
+        "throughput, p50/p95/p99 gecikme ve hata oranlarını raporlar."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=200, help="Oluşturulacak öğrenci sayısı")
+        parser.add_argument('--courses', type=int, default=10, help="Oluşturulacak ders (ve hoca) sayısı")
+        parser.add_argument('--students-per-course', type=int, default=60, help="Ders başına öğrenci sayısı")
+        parser.add_argument('--concurrency', type=int, default=20, help="Eş zamanlı istemci sayısı")
+        parser.add_argument('--duration', type=float, default=10.0, help="Yük aşamasının süresi (saniye)")
+        parser.add_argument('--server', choices=('wsgi', 'asgi'), default='wsgi',
+                            help="Uygulamanın hangi arayüzle çalıştırılacağı (asgi için uvicorn gerekir)")
+
+    def handle(self, *args, **options):
+        # sunucu sadece localhost'ta dinler
+        settings.ALLOWED_HOSTS = list(settings.ALLOWED_HOSTS) + ['127.0.0.1']
+
+        # veriler geçici test veritabanlarına yazılır, gerçek veritabanına dokunulmaz
+        self.stdout.write("Geçici veritabanı kuruluyor ve veri oluşturuluyor...")
+        with loadtest.throwaway_databases():
+            instructors, students = loadtest.seed_data(
+                options['students'], options['courses'], options['students_per_course']
+            )
+            usernames = instructors + students
+
+            server = loadtest.LocalServer(options['server'])
+            try:
+                server.start()
+            except RuntimeError as e:
+                raise CommandError(str(e))
+            self.stdout.write(f"Sunucu ({options['server']}) {server.base_url} adresinde çalışıyor.")
+
+            try:
+                login_stats, login_elapsed, load_stats, elapsed = loadtest.run_load_test(
+                    server.base_url,
+                    usernames,
+                    concurrency=options['concurrency'],
+                    duration=options['duration'],
+                    extra_paths=loadtest.manage_course_paths(instructors),
+                )
+            finally:
+                server.stop()
+
+        self.stdout.write("")
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"Giriş aşaması ({len(usernames)} kullanıcı, {login_elapsed:.1f} sn)"
+        ))
+        self._print_table(login_stats.summary(login_elapsed))
+        self.stdout.write("")
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"Yük aşaması ({options['concurrency']} eş zamanlı istemci, {elapsed:.1f} sn)"
+        ))
+        self._print_table(load_stats.summary(elapsed))
+
+    def _print_table(self, rows):
+        header = f"{'endpoint':<28}{'istek':>8}{'hata':>7}{'hata %':>8}{'istek/sn':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for row in rows:
+            self.stdout.write(
+                f"{row['name']:<28}{row['count']:>8}{row['errors']:>7}{row['error_rate']:>8.1f}"
+                f"{row['throughput']:>10.1f}{row['p50']:>9.1f}{row['p95']:>9.1f}{row['p99']:>9.1f}"
+            )
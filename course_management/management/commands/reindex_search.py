@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from course_management.search import rebuild_index
+from course_management.tenancy import database_departments, department_context
+
+
+class Command(BaseCommand):
+    help = "Ders, öğrenim çıktısı, program çıktısı ve kullanıcı arama indeksini yeniden oluşturur."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help="Tek seferde eklenecek kayıt sayısı")
+
+    def handle(self, *args, **options):
+        total = 0
+        # bölüm veritabanları kullanılıyorsa her veritabanının indeksi ayrı kurulur
+        for department in database_departments():
+            with department_context(department):
+                total += rebuild_index(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"{total} kayıt indekslendi."))
@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from course_management.models import Course, Department, Term
+from course_management.rollover import rollover_courses
+from course_management.tenancy import department_context, get_current_department
+
+
+class Command(BaseCommand):
+    help = "Dersleri bileşenleri ve öğrenim çıktılarıyla birlikte bir dönemden diğerine kopyalar."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--from', dest='source', help="Kaynak dönem kodu (boş: dönemi olmayan dersler)")
+        parser.add_argument('--to', dest='target', required=True, help="Hedef dönem kodu")
+        parser.add_argument('--courses', nargs='*', default=[],
+                            help="Sadece bu ders kodlarını kopyala (boş: kaynak dönemin tüm dersleri)")
+        parser.add_argument('--no-instructors', action='store_true', help="Hoca atamalarını kopyalama")
+        parser.add_argument('--department',
+                            help="Sadece bu bölümün derslerini kopyala (boş: DEPARTMENT ortam değişkeni, "
+                                 "o da yoksa bölümü atanmamış dersler)")
+
+    def handle(self, *args, **options):
+        try:
+            target = Term.objects.get(code=options['target'])
+            source = Term.objects.get(code=options['source']) if options['source'] else None
+        except Term.DoesNotExist:
+            raise CommandError("Dönem bulunamadı.")
+        if target.is_archived:
+            raise CommandError(f'"{target.code}" dönemi arşivlenmiş, ders kopyalanamaz.')
+        if source is not None and source.is_archived:
+            raise CommandError(
+                f'"{source.code}" dönemi arşivlenmiş, değerlendirme bileşenleri silindiği için kaynak olamaz.'
+            )
+        if source == target:
+            raise CommandError("Kaynak ve hedef dönem aynı olamaz.")
+
+        if options['department']:
+            try:
+                department = Department.objects.using('default').get(code=options['department'])
+            except Department.DoesNotExist:
+                raise CommandError(f'"{options["department"]}" bölümü bulunamadı.')
+        else:
+            department = get_current_department()
+
+        # görünümdeki gibi sadece bölümün dersleri, bölümün veritabanında
+        with department_context(department):
+            courses = Course.objects.for_department(department).filter(term=source)
+            if options['courses']:
+                courses = courses.filter(course_code__in=options['courses'])
+
+            new_courses, skipped = rollover_courses(
+                courses, target, copy_instructors=not options['no_instructors']
+            )
+
+        self.stdout.write(self.style.SUCCESS(f"{len(new_courses)} ders {target.code} dönemine kopyalandı."))
+        if skipped:
+            self.stdout.write(self.style.WARNING(
+                f"Hedef dönemde zaten olduğu için atlanan dersler: {', '.join(skipped)}"
+            ))
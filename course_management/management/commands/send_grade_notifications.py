@@ -0,0 +1,49 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from course_management.notifications import DEFAULT_BATCH_SIZE, send_pending_notifications
+from course_management.tenancy import database_departments, department_context
+
+
+class Command(BaseCommand):
+    help = (
+        "Bekleyen not bildirimlerini tek e-posta bağlantısı üzerinden toplu gönderir. "
+        "Cron ile çalıştırılabilir veya --loop ile sürekli çalışan bir worker olarak başlatılabilir."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                            help="Tek seferde veritabanından okunacak bildirim sayısı")
+        parser.add_argument('--loop', action='store_true',
+                            help="Kuyruğu boşalttıktan sonra bekleyip tekrar kontrol et")
+        parser.add_argument('--interval', type=int, default=30,
+                            help="--loop ile iki kontrol arasındaki bekleme (saniye)")
+
+    def handle(self, *args, **options):
+        while True:
+            try:
+                sent, failed = self._send_all(options['batch_size'])
+            except Exception as e:
+                # e-posta sunucusuna hiç bağlanılamadı, bildirimler kuyrukta kalır
+                if not options['loop']:
+                    raise
+                self.stderr.write(f"Bağlantı hatası: {e}")
+            else:
+                if sent or failed or not options['loop']:
+                    self.stdout.write(self.style.SUCCESS(
+                        f"{sent} bildirim gönderildi, {failed} bildirim gönderilemedi."
+                    ))
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+    def _send_all(self, batch_size):
+        # bildirimler bölüm veritabanlarında da birikir, her veritabanının kuyruğu ayrı boşaltılır
+        sent = failed = 0
+        for department in database_departments():
+            with department_context(department):
+                department_sent, department_failed = send_pending_notifications(batch_size=batch_size)
+            sent += department_sent
+            failed += department_failed
+        return sent, failed
@@ -0,0 +1,96 @@
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+
+from course_management import loadtest
+from course_management.models import Course, User
+
+# (etiket, oturum motoru, kimlik doğrulama backend'i)
+SCENARIOS = (
+    ('db (eski ayar)', 'django.contrib.sessions.backends.db', 'django.contrib.auth.backends.ModelBackend'),
+    ('db + profil', 'django.contrib.sessions.backends.db', 'course_management.backends.ProfileModelBackend'),
+    ('cached_db + profil', 'django.contrib.sessions.backends.cached_db',
+     'course_management.backends.ProfileModelBackend'),
+    ('signed_cookies + profil', 'django.contrib.sessions.backends.signed_cookies',
+     'course_management.backends.ProfileModelBackend'),
+)
+
+
+# oturumlar ölçüm için ayrı bir önbellekte tutulur, paylaşılan önbellek
+# (raporlar, gerçek oturumlar) temizlenmez
+BENCHMARK_CACHE = 'session_benchmark'
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Dashboard görünümlerinde oturum motoru başına istek başına sorgu sayısını ve süreyi ölçer. "
+        "Geçici veri oluşturur ve sonunda geri alır."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=50, help="Senaryo başına istek sayısı")
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                results = self._run(options['requests'])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        header = f"{'senaryo':<26}{'görünüm':<28}{'sorgu/istek':>12}{'ms/istek':>10}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for label, view_name, queries, ms in results:
+            self.stdout.write(f"{label:<26}{view_name:<28}{queries:>12.1f}{ms:>10.2f}")
+
+    def _run(self, request_count):
+        instructors, students = loadtest.seed_data(student_count=60, course_count=1, students_per_course=60)
+        head = User.objects.create_user(f'{loadtest.SEED_PREFIX}head')
+        head.profile.role = 'department_head'
+        head.profile.save()
+
+        course = Course.objects.get(instructors__username=instructors[0])
+        targets = (
+            (students[0], reverse('student_dashboard')),
+            (instructors[0], reverse('instructor_dashboard')),
+            (instructors[0], reverse('manage_course', kwargs={'course_id': course.id})),
+            (head.username, reverse('department_head_dashboard')),
+        )
+
+        results = []
+        for label, engine, backend in SCENARIOS:
+            with override_settings(SESSION_ENGINE=engine, AUTHENTICATION_BACKENDS=[backend],
+                                   ALLOWED_HOSTS=list(settings.ALLOWED_HOSTS) + ['testserver'],
+                                   CACHES={**settings.CACHES, BENCHMARK_CACHE: {
+                                       'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                                       'LOCATION': BENCHMARK_CACHE,
+                                   }},
+                                   SESSION_CACHE_ALIAS=BENCHMARK_CACHE):
+                caches[BENCHMARK_CACHE].clear()
+                for username, url in targets:
+                    client = Client()
+                    client.force_login(User.objects.get(username=username))
+                    # ilk istek önbelleği ısıtır, ölçüme katılmaz
+                    client.get(url)
+
+                    with CaptureQueriesContext(connection) as queries:
+                        start = time.perf_counter()
+                        for _ in range(request_count):
+                            client.get(url)
+                        elapsed = time.perf_counter() - start
+
+                    view_name = resolve(url).url_name
+                    results.append((label, view_name, len(queries.captured_queries) / request_count,
+                                    elapsed / request_count * 1000))
+        return results
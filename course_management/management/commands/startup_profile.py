@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from course_management.warmup import group_by_package, profile_startup
+
+
+class Command(BaseCommand):
+    help = (
+        "Uygulamanın açılışını yeni bir süreçte ölçer: settings, django.setup, middleware, urlconf "
+        "ve ısındırma aşamalarının süreleri ile modül ve paket başına import süreleri."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=20, help="Gösterilecek modül/paket sayısı")
+        parser.add_argument('--no-warmup', action='store_true', help="Isındırma adımlarını ölçme")
+
+    def handle(self, *args, **options):
+        try:
+            phases, modules = profile_startup(include_warmup=not options['no_warmup'])
+        except RuntimeError as e:
+            raise CommandError(str(e))
+        top = options['top']
+
+        self.stdout.write(self.style.MIGRATE_HEADING("Aşamalar"))
+        for name, elapsed in phases:
+            self.stdout.write(f"  {name:<40}{elapsed * 1000:>10.1f} ms")
+        self.stdout.write(f"  {'toplam':<40}{sum(e for _, e in phases) * 1000:>10.1f} ms")
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f"En yavaş paketler (import, ilk {top})"))
+        for package, elapsed, count in group_by_package(modules)[:top]:
+            self.stdout.write(f"  {package:<40}{elapsed * 1000:>10.1f} ms  ({count} modül)")
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f"En yavaş modüller (kendi süresi, ilk {top})"))
+        for name, self_time, cumulative in sorted(modules, key=lambda row: row[1], reverse=True)[:top]:
+            self.stdout.write(f"  {name:<50}{self_time * 1000:>10.1f} ms  (toplam {cumulative * 1000:.1f} ms)")
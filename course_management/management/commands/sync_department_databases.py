@@ -0,0 +1,51 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from course_management.models import Department, Term
+from course_management.tenancy import department_databases
+
+User = get_user_model()
+
+# bölüm veritabanlarındaki yabancı anahtarların hedefi olan paylaşılan tablolar
+SHARED_MODELS = (Department, Term, User)
+
+
+class Command(BaseCommand):
+    help = (
+        "Paylaşılan kullanıcı, dönem ve bölüm satırlarını bölüm veritabanlarına kopyalar. "
+        "Yeni bir bölüm veritabanı eklendiğinde migrate --database sonrası bir kez çalıştırılır; "
+        "sonraki değişiklikler sinyallerle kopyalanır."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help="Tek seferde kopyalanacak satır sayısı")
+
+    def handle(self, *args, **options):
+        aliases = department_databases()
+        if not aliases:
+            raise CommandError("DEPARTMENT_DATABASES ayarında bölüm veritabanı yok.")
+
+        batch_size = options['batch_size']
+        for alias in aliases:
+            for model in SHARED_MODELS:
+                fields = [f.attname for f in model._meta.concrete_fields if not f.primary_key]
+                target = model._base_manager.using(alias)
+                existing = set(target.values_list('pk', flat=True))
+                created = updated = 0
+                batch_new, batch_old = [], []
+                for obj in model._base_manager.using('default').order_by('pk').iterator(chunk_size=batch_size):
+                    (batch_old if obj.pk in existing else batch_new).append(obj)
+                    if len(batch_new) + len(batch_old) >= batch_size:
+                        created, updated = self._flush(target, fields, batch_new, batch_old, created, updated)
+                        batch_new, batch_old = [], []
+                created, updated = self._flush(target, fields, batch_new, batch_old, created, updated)
+                self.stdout.write(f"{alias}: {model._meta.label} {created} eklendi, {updated} güncellendi")
+        self.stdout.write(self.style.SUCCESS("Bölüm veritabanları güncel."))
+
+    def _flush(self, target, fields, batch_new, batch_old, created, updated):
+        # bulk işlemler sinyal tetiklemez --> profil oluşturma vb. tekrar çalışmaz
+        if batch_new:
+            target.bulk_create(batch_new)
+        if batch_old and fields:
+            target.bulk_update(batch_old, fields)
+        return created + len(batch_new), updated + len(batch_old)
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from course_management.warmup import STEPS, warm_up
+
+
+class Command(BaseCommand):
+    help = (
+        "Şablonları derler, URL'leri çözer, veritabanı bağlantısını açar ve önbelleği doldurur. "
+        "Her adımın süresini yazar."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--step', action='append', choices=[name for name, _ in STEPS],
+                            help="Sadece verilen adımları çalıştır (tekrarlanabilir)")
+
+    def handle(self, *args, **options):
+        results = warm_up(options['step'])
+        total = 0.0
+        for name, elapsed, result in results:
+            total += elapsed
+            self.stdout.write(f"{name:<12}{elapsed * 1000:>10.1f} ms   {result}")
+        self.stdout.write(self.style.SUCCESS(f"{'toplam':<12}{total * 1000:>10.1f} ms"))
@@ -0,0 +1,159 @@
+import mimetypes
+import os
+import re
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import MiddlewareNotUsed, SuspiciousFileOperation
+from django.http import FileResponse
+from django.middleware.gzip import GZipMiddleware
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+
+re_accepts_gzip = re.compile(r"\bgzip\b")
+re_accepts_brotli = re.compile(r"\bbr\b")
+
+# hash'li dosyalar hiç değişmez --> bir yıl önbellekte kalabilir
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+DEFAULT_CACHE_CONTROL = 'public, max-age=60'
+
+
+class GZipHTMLMiddleware(GZipMiddleware):
+    """
+    django'nun GZipMiddleware'i, iki farkla:
+    - sadece HTML ve JSON cevapları sıkıştırılır
+    - eşik GZIP_MIN_SIZE ayarıyla belirlenir (django'da sabit 200 bayt)
+    sıkıştırma, Vary, ETag ve BREACH dolgusu django'nun kendi uygulamasından gelir
+    """
+    compressible_types = ('text/html', 'application/json')
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.min_size = getattr(settings, 'GZIP_MIN_SIZE', 1024)
+
+    def process_response(self, request, response):
+        content_type = response.get('Content-Type', '').split(';')[0].strip()
+        if content_type not in self.compressible_types:
+            return response
+        if not response.streaming and len(response.content) < self.min_size:
+            return response
+        return super().process_response(request, response)
+
+
+class StaticFilesMiddleware:
+    """
+    SERVE_STATIC açıksa STATIC_ROOT altındaki dosyaları uygulamanın kendisi sunar
+    (önünde nginx olmayan kurulumlar için). tarayıcı destekliyorsa önceden
+    sıkıştırılmış .br / .gz dosyası gönderilir, hash'li dosyalar uzun süre önbelleklenir
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'SERVE_STATIC', False):
+            # kapalıysa istek zincirinden tamamen çıkar
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.prefix = '/' + settings.STATIC_URL.lstrip('/')
+        self.root = str(settings.STATIC_ROOT)
+        self._immutable_names = None
+
+    def __call__(self, request):
+        if request.method in ('GET', 'HEAD') and request.path.startswith(self.prefix):
+            response = self.serve(request, request.path[len(self.prefix):])
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+    @property
+    def immutable_names(self):
+        if self._immutable_names is None:
+            hashed_files = getattr(staticfiles_storage, 'hashed_files', {})
+            self._immutable_names = set(hashed_files.values())
+        return self._immutable_names
+
+    def serve(self, request, name):
+        try:
+            path = safe_join(self.root, name)
+        except SuspiciousFileOperation:
+            return None
+        if not os.path.isfile(path):
+            return None
+
+        content_type, _ = mimetypes.guess_type(path)
+        accept_encoding = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        encoding = None
+        for suffix, accepts, candidate in (('.br', re_accepts_brotli, 'br'), ('.gz', re_accepts_gzip, 'gzip')):
+            if accepts.search(accept_encoding) and os.path.isfile(path + suffix):
+                path, encoding = path + suffix, candidate
+                break
+
+        response = FileResponse(open(path, 'rb'), content_type=content_type or 'application/octet-stream')
+        del response.headers['Content-Disposition']
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        patch_vary_headers(response, ('Accept-Encoding',))
+        response.headers['Cache-Control'] = (
+            IMMUTABLE_CACHE_CONTROL if name in self.immutable_names else DEFAULT_CACHE_CONTROL
+        )
+        return response
+
+
+class ProfilingMiddleware:
+    """
+    PROFILING açıksa staff kullanıcılar ?_profile=1 veya X-Profile başlığıyla
+    görünümü profil altında çalıştırabilir (bkz. profiling.py)
+    kapalıysa istek zincirinden tamamen çıkar, açıkken de tetiklenmeyen
+    isteklerin maliyeti tek bir parametre kontrolüdür
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PROFILING', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        profile_id = getattr(request, '_profile_id', None)
+        if profile_id:
+            response.headers['X-Profile-Id'] = profile_id
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        from . import profiling
+
+        mode = profiling.requested_mode(request)
+        if mode is None or not request.user.is_staff:
+            return None
+        if iscoroutinefunction(view_func):
+            # async görünümler (örn. canlı not defteri akışı) senkron profilde çalıştırılamaz
+            return None
+        response, request._profile_id = profiling.run_profiled(
+            request, mode, view_func, request, *view_args, **view_kwargs
+        )
+        return response
+
+
+class DepartmentMiddleware:
+    """
+    giriş yapan kullanıcının bölümünü isteğin geçerli bölümü yapar (request.department)
+    görünümler bu bölüme göre süzer, DepartmentRouter bölümün veritabanını seçer
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        from .tenancy import reset_current_department, set_current_department
+
+        department = None
+        if request.user.is_authenticated:
+            # profil ProfileModelBackend ile kullanıcıyla birlikte yüklenir
+            profile = getattr(request.user, 'profile', None)
+            department = profile.department if profile else None
+        request.department = department
+
+        token = set_current_department(department)
+        try:
+            return self.get_response(request)
+        finally:
+            reset_current_department(token)
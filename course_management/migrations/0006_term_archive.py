@@ -0,0 +1,88 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:18
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course_management', '0005_programoutcome'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Term',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.CharField(max_length=20, unique=True, verbose_name='Dönem Kodu (örn: 2025-GUZ)')),
+                ('name', models.CharField(max_length=100, verbose_name='Dönem Adı')),
+                ('start_date', models.DateField(verbose_name='Başlangıç Tarihi')),
+                ('end_date', models.DateField(verbose_name='Bitiş Tarihi')),
+                ('is_active', models.BooleanField(db_index=True, default=False, verbose_name='Aktif Dönem')),
+                ('is_archived', models.BooleanField(default=False, verbose_name='Arşivlendi')),
+            ],
+            options={
+                'verbose_name': 'Dönem',
+                'verbose_name_plural': 'Dönemler',
+                'ordering': ['-start_date'],
+            },
+        ),
+        migrations.AlterField(
+            model_name='course',
+            name='course_code',
+            field=models.CharField(max_length=10, verbose_name='Ders Kodu'),
+        ),
+        migrations.CreateModel(
+            name='ArchivedGrade',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('component_name', models.CharField(max_length=100, verbose_name='Değerlendirme Adı')),
+                ('component_percentage', models.PositiveSmallIntegerField(verbose_name='Ağırlık Yüzdesi (%)')),
+                ('score', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True, verbose_name='Alınan Not')),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_grades', to='course_management.course', verbose_name='Ders')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_grades', to=settings.AUTH_USER_MODEL, verbose_name='Öğrenci')),
+                ('term', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_grades', to='course_management.term', verbose_name='Dönem')),
+            ],
+            options={
+                'verbose_name': 'Arşivlenmiş Not',
+                'verbose_name_plural': 'Arşivlenmiş Notlar',
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedEnrollment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_enrollments', to='course_management.course', verbose_name='Ders')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_enrollments', to=settings.AUTH_USER_MODEL, verbose_name='Öğrenci')),
+                ('term', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_enrollments', to='course_management.term', verbose_name='Dönem')),
+            ],
+            options={
+                'verbose_name': 'Arşivlenmiş Ders Kaydı',
+                'verbose_name_plural': 'Arşivlenmiş Ders Kayıtları',
+            },
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='term',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='courses', to='course_management.term', verbose_name='Dönem'),
+        ),
+        migrations.AddConstraint(
+            model_name='course',
+            constraint=models.UniqueConstraint(fields=('term', 'course_code'), name='unique_course_code_per_term'),
+        ),
+        migrations.AddConstraint(
+            model_name='course',
+            constraint=models.UniqueConstraint(condition=models.Q(('term__isnull', True)), fields=('course_code',), name='unique_course_code_without_term'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedgrade',
+            index=models.Index(fields=['student', 'term'], name='course_mana_student_ddcbff_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='archivedenrollment',
+            unique_together={('course', 'student')},
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course_management', '0006_term_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_type', models.CharField(choices=[('course', 'Ders'), ('learning_outcome', 'Öğrenim Çıktısı'), ('program_outcome', 'Program Çıktısı'), ('user', 'Kullanıcı')], max_length=20, verbose_name='Kayıt Türü')),
+                ('object_id', models.PositiveBigIntegerField(verbose_name='Kayıt ID')),
+                ('title', models.CharField(max_length=255, verbose_name='Başlık')),
+                ('body', models.TextField(blank=True, verbose_name='İçerik')),
+            ],
+            options={
+                'verbose_name': 'Arama Kaydı',
+                'verbose_name_plural': 'Arama Kayıtları',
+                'unique_together': {('object_type', 'object_id')},
+            },
+        ),
+    ]
@@ -0,0 +1,82 @@
+from django.db import migrations
+
+# FTS5 sanal tablosu SearchEntry tablosunu harici içerik olarak indeksler,
+# tetikleyiciler (trigger) iki tabloyu senkron tutar.
+# unicode61 Türkçe ı/İ harflerini i'ye indirgemez, bu yüzden metin indekslenmeden önce çevrilir
+FOLD = "replace(replace({0}, 'ı', 'i'), 'İ', 'i')"
+NEW_VALUES = f"new.id, {FOLD.format('new.title')}, {FOLD.format('new.body')}"
+OLD_VALUES = f"old.id, {FOLD.format('old.title')}, {FOLD.format('old.body')}"
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE course_management_searchentry_fts USING fts5(
+        title, body,
+        content='course_management_searchentry',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER course_management_searchentry_ai AFTER INSERT ON course_management_searchentry BEGIN
+        INSERT INTO course_management_searchentry_fts(rowid, title, body) VALUES ({NEW_VALUES});
+    END
+    """,
+    f"""
+    CREATE TRIGGER course_management_searchentry_ad AFTER DELETE ON course_management_searchentry BEGIN
+        INSERT INTO course_management_searchentry_fts(course_management_searchentry_fts, rowid, title, body)
+        VALUES ('delete', {OLD_VALUES});
+    END
+    """,
+    f"""
+    CREATE TRIGGER course_management_searchentry_au AFTER UPDATE ON course_management_searchentry BEGIN
+        INSERT INTO course_management_searchentry_fts(course_management_searchentry_fts, rowid, title, body)
+        VALUES ('delete', {OLD_VALUES});
+        INSERT INTO course_management_searchentry_fts(rowid, title, body) VALUES ({NEW_VALUES});
+    END
+    """,
+]
+
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS course_management_searchentry_au",
+    "DROP TRIGGER IF EXISTS course_management_searchentry_ad",
+    "DROP TRIGGER IF EXISTS course_management_searchentry_ai",
+    "DROP TABLE IF EXISTS course_management_searchentry_fts",
+]
+
+# PostgreSQL'de başlık daha ağır basan, otomatik güncellenen bir tsvector sütunu
+POSTGRESQL_FORWARD = [
+    """
+    ALTER TABLE course_management_searchentry ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(body, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX course_management_searchentry_vector_idx ON course_management_searchentry USING GIN (search_vector)",
+]
+
+POSTGRESQL_BACKWARD = [
+    "DROP INDEX IF EXISTS course_management_searchentry_vector_idx",
+    "ALTER TABLE course_management_searchentry DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course_management', '0007_searchentry'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRESQL_FORWARD}),
+            _run({'sqlite': SQLITE_BACKWARD, 'postgresql': POSTGRESQL_BACKWARD}),
+        ),
+    ]
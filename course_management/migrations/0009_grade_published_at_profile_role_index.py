@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course_management', '0008_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='grade',
+            name='published_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Yayınlanma Zamanı'),
+        ),
+        migrations.AlterField(
+            model_name='profile',
+            name='role',
+            field=models.CharField(choices=[('student', 'Öğrenci'), ('instructor', 'Öğretim Görevlisi'), ('department_head', 'Bölüm Başkanı')], db_index=True, max_length=20, verbose_name='Kullanıcı Rolü'),
+        ),
+    ]
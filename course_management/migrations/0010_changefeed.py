@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course_management', '0009_grade_published_at_profile_role_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(choices=[('grade', 'Not'), ('course', 'Ders'), ('enrollment', 'Ders Kaydı'), ('learning_outcome', 'Öğrenim Çıktısı'), ('program_outcome', 'Program Çıktısı')], max_length=20, verbose_name='Model')),
+                ('object_key', models.CharField(max_length=64, verbose_name='Kayıt Anahtarı')),
+                ('action', models.CharField(choices=[('upsert', 'Ekleme/Güncelleme'), ('delete', 'Silme')], max_length=10, verbose_name='İşlem')),
+                ('changed_at', models.DateTimeField(auto_now_add=True, verbose_name='Değişiklik Zamanı')),
+            ],
+            options={
+                'verbose_name': 'Değişiklik Kaydı',
+                'verbose_name_plural': 'Değişiklik Kayıtları',
+            },
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Son Güncelleme'),
+        ),
+        migrations.AddField(
+            model_name='grade',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Son Güncelleme'),
+        ),
+        migrations.AddField(
+            model_name='learningoutcome',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Son Güncelleme'),
+        ),
+        migrations.AddField(
+            model_name='programoutcome',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Son Güncelleme'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:36
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course_management', '0010_changefeed'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GradeNotification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Oluşturulma Zamanı')),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='Gönderilme Zamanı')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Deneme Sayısı')),
+                ('next_attempt_at', models.DateTimeField(blank=True, null=True, verbose_name='Sonraki Deneme')),
+                ('last_error', models.TextField(blank=True, verbose_name='Son Hata')),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='grade_notifications', to='course_management.course', verbose_name='Ders')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='grade_notifications', to=settings.AUTH_USER_MODEL, verbose_name='Öğrenci')),
+            ],
+            options={
+                'verbose_name': 'Not Bildirimi',
+                'verbose_name_plural': 'Not Bildirimleri',
+                'constraints': [models.UniqueConstraint(condition=models.Q(('sent_at__isnull', True)), fields=('student', 'course'), name='unique_pending_grade_notification')],
+            },
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course_management', '0011_gradenotification'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Department',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.CharField(max_length=10, unique=True, verbose_name='Bölüm Kodu (örn: CSE)')),
+                ('name', models.CharField(max_length=255, verbose_name='Bölüm Adı')),
+            ],
+            options={
+                'verbose_name': 'Bölüm',
+                'verbose_name_plural': 'Bölümler',
+                'ordering': ['code'],
+            },
+        ),
+        migrations.AlterField(
+            model_name='programoutcome',
+            name='code',
+            field=models.CharField(max_length=10, verbose_name='Çıktı Kodu (örn: PO-1)'),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='department',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='courses', to='course_management.department', verbose_name='Bölüm'),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='department',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='profiles', to='course_management.department', verbose_name='Bölüm'),
+        ),
+        migrations.AddField(
+            model_name='programoutcome',
+            name='department',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='program_outcomes', to='course_management.department', verbose_name='Bölüm'),
+        ),
+        migrations.AddField(
+            model_name='searchentry',
+            name='department',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='course_management.department', verbose_name='Bölüm'),
+        ),
+        migrations.AddConstraint(
+            model_name='programoutcome',
+            constraint=models.UniqueConstraint(fields=('department', 'code'), name='unique_program_outcome_code_per_department'),
+        ),
+        migrations.AddConstraint(
+            model_name='programoutcome',
+            constraint=models.UniqueConstraint(condition=models.Q(('department__isnull', True)), fields=('code',), name='unique_program_outcome_code_without_department'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:03
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+# notifications.MAX_ATTEMPTS (migration uygulama koduna bağlı olmasın diye sabit)
+MAX_ATTEMPTS = 5
+
+
+def mark_dead_notifications(apps, schema_editor):
+    # deneme hakkı bitmiş ama hâlâ bekleyen görünen eski bildirimler
+    GradeNotification = apps.get_model('course_management', 'GradeNotification')
+    GradeNotification.objects.using(schema_editor.connection.alias).filter(
+        sent_at__isnull=True, attempts__gte=MAX_ATTEMPTS
+    ).update(failed_at=timezone.now())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course_management', '0012_department'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='gradenotification',
+            name='unique_pending_grade_notification',
+        ),
+        migrations.AddField(
+            model_name='gradenotification',
+            name='failed_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Vazgeçilme Zamanı'),
+        ),
+        migrations.RunPython(mark_dead_notifications, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='gradenotification',
+            constraint=models.UniqueConstraint(condition=models.Q(('failed_at__isnull', True), ('sent_at__isnull', True)), fields=('student', 'course'), name='unique_pending_grade_notification'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course_management', '0013_gradenotification_failed_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='grade',
+            name='published_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True, verbose_name='Yayınlanma Zamanı'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course_management', '0014_grade_published_at_index'),
+    ]
+
+    operations = [
+        # alan sadece e-posta duyurusunu işaretler, öğrencinin notu görmesini etkilemez
+        migrations.RenameField(
+            model_name='grade',
+            old_name='published_at',
+            new_name='announced_at',
+        ),
+        migrations.AlterField(
+            model_name='grade',
+            name='announced_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True, verbose_name='Duyurulma Zamanı'),
+        ),
+    ]
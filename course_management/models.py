@@ -1,29 +1,188 @@
+from decimal import Decimal
+
 from django.db import models
+from django.db.models.functions import Coalesce, NullIf
 from django.contrib.auth.models import User     # <--  size zoomda bahsettiğim djangonun kendi
 from django.conf import settings                     # user modeli ama biz bu modeli genişleteceğiz
+from django.utils import timezone
+
+
+class Department(models.Model):
+    """
+    fakültedeki bölüm
+    dersler, program çıktıları ve kullanıcılar (bölüm başkanları dahil) bir bölüme bağlıdır
+    """
+    code = models.CharField(max_length=10, unique=True, verbose_name="Bölüm Kodu (örn: CSE)")
+    name = models.CharField(max_length=255, verbose_name="Bölüm Adı")
+
+    class Meta:
+        verbose_name = "Bölüm"
+        verbose_name_plural = "Bölümler"
+        ordering = ['code']
+
+    def __str__(self):
+        return f"{self.code} - {self.name}"
 
 
 class Profile(models.Model):
     # her kullanıcıya bağlı bir profil oluştur
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
 
+    # bölümü olmayan kullanıcılar bölümü olmayan dersleri görür (tek bölümlü eski kurulumlar)
+    department = models.ForeignKey(
+        Department,
+        on_delete=models.SET_NULL,
+        related_name="profiles",
+        verbose_name="Bölüm",
+        null=True,
+        blank=True
+    )
+
     # roller
     ROLE_CHOICES = (
         ('student', 'Öğrenci'),
         ('instructor', 'Öğretim Görevlisi'),
         ('department_head', 'Bölüm Başkanı'),
     )
-    role = models.CharField(max_length=20, choices=ROLE_CHOICES, verbose_name="Kullanıcı Rolü")
+    # rol ile sık filtreleniyor (formlar, admin) --> indeksli
+    role = models.CharField(max_length=20, choices=ROLE_CHOICES, db_index=True, verbose_name="Kullanıcı Rolü")
 
     def __str__(self):
         return f"{self.user.get_full_name()} ({self.get_role_display()})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # bölüm değişince kullanıcının arama kaydı güncellenir (bkz. signals.py)
+        instance._loaded_department_id = instance.department_id
+        return instance
+
+
+class Term(models.Model):
+    """akademik dönem (örn: 2025-2026 Güz)"""
+    code = models.CharField(max_length=20, unique=True, verbose_name="Dönem Kodu (örn: 2025-GUZ)")
+    name = models.CharField(max_length=100, verbose_name="Dönem Adı")
+    start_date = models.DateField(verbose_name="Başlangıç Tarihi")
+    end_date = models.DateField(verbose_name="Bitiş Tarihi")
+
+    # panellerde ve formlarda varsayılan olarak sadece aktif dönem gösterilir
+    is_active = models.BooleanField(default=False, db_index=True, verbose_name="Aktif Dönem")
+
+    # archive_term komutu çalıştıktan sonra işaretlenir
+    is_archived = models.BooleanField(default=False, verbose_name="Arşivlendi")
+
+    class Meta:
+        verbose_name = "Dönem"
+        verbose_name_plural = "Dönemler"
+        ordering = ['-start_date']
+
+    def __str__(self):
+        return self.name
+
+    @property
+    def is_closed(self):
+        """aktif olmayan ve bitiş tarihi geçmiş dönem kapanmış sayılır"""
+        return not self.is_active and self.end_date < timezone.localdate()
+
+
+class CourseQuerySet(models.QuerySet):
+
+    def active(self):
+        """
+        aktif dönemdeki dersler
+        dönemi atanmamış eski dersler de gösterilir ki mevcut veri kaybolmasın
+        """
+        return self.filter(models.Q(term__is_active=True) | models.Q(term__isnull=True))
+
+    def for_department(self, department):
+        """bölümün dersleri, department None ise bölümü atanmamış dersler"""
+        return self.filter(department=department)
+
+    def with_grading_stats(self):
+        """
+        her derse not girişi özetini ekler (tek sorgu, ders başına alt sorgular):
+            student_count, component_count, graded_cells,
+            completion_rate (%), graded_students, mean_final (ağırlıklı ortalamaların ortalaması)
+        bölüm raporundaki gibi sadece hâlâ derse kayıtlı öğrencilerin notları sayılır
+        """
+        def count_of(queryset, group_by):
+            return Coalesce(
+                models.Subquery(
+                    queryset.order_by().values(group_by).annotate(n=models.Count('*')).values('n')[:1],
+                    output_field=models.IntegerField(),
+                ),
+                0,
+            )
+
+        enrolled_grades = Grade.objects.filter(
+            component__course=models.OuterRef('pk'),
+            score__isnull=False,
+            component__course__students=models.F('student'),
+        )
+        weighted = models.ExpressionWrapper(
+            models.F('score') * models.F('component__percentage') / models.Value(Decimal('100')),
+            output_field=models.DecimalField(max_digits=7, decimal_places=2),
+        )
+        weighted_total = models.Subquery(
+            enrolled_grades.order_by().values('component__course')
+            .annotate(total=models.Sum(weighted)).values('total')[:1],
+            output_field=models.DecimalField(max_digits=12, decimal_places=2),
+        )
+        graded_students = Coalesce(
+            models.Subquery(
+                enrolled_grades.order_by().values('component__course')
+                .annotate(n=models.Count('student', distinct=True)).values('n')[:1],
+                output_field=models.IntegerField(),
+            ),
+            0,
+        )
+
+        return self.annotate(
+            student_count=count_of(Course.students.through.objects.filter(course=models.OuterRef('pk')), 'course'),
+            component_count=count_of(EvaluationComponent.objects.filter(course=models.OuterRef('pk')), 'course'),
+            graded_cells=count_of(enrolled_grades, 'component__course'),
+            graded_students=graded_students,
+        ).annotate(
+            completion_rate=models.Case(
+                models.When(models.Q(student_count=0) | models.Q(component_count=0), then=models.Value(0.0)),
+                default=models.ExpressionWrapper(
+                    models.F('graded_cells') * 100.0 / (models.F('student_count') * models.F('component_count')),
+                    output_field=models.FloatField(),
+                ),
+                output_field=models.FloatField(),
+            ),
+            # ortalamaların ortalaması = ağırlıklı toplam / notu olan öğrenci sayısı
+            mean_final=models.ExpressionWrapper(
+                weighted_total / NullIf(models.F('graded_students'), 0),
+                output_field=models.DecimalField(max_digits=7, decimal_places=2),
+            ),
+        )
+
 
 class Course(models.Model):
     """sistemdeki derslerin ana modeli"""
-    course_code = models.CharField(max_length=10, unique=True, verbose_name="Ders Kodu")
+    # aynı ders kodu her dönem tekrar açılabilir, bu yüzden kod dönem içinde unique
+    course_code = models.CharField(max_length=10, verbose_name="Ders Kodu")
     course_name = models.CharField(max_length=255, verbose_name="Ders Adı")
 
+    term = models.ForeignKey(
+        Term,
+        on_delete=models.PROTECT,
+        related_name="courses",
+        verbose_name="Dönem",
+        null=True,
+        blank=True
+    )
+
+    department = models.ForeignKey(
+        Department,
+        on_delete=models.PROTECT,
+        related_name="courses",
+        verbose_name="Bölüm",
+        null=True,
+        blank=True
+    )
+
     # derse atanan hocalar
     instructors = models.ManyToManyField(
         settings.AUTH_USER_MODEL,
@@ -48,9 +207,33 @@ class Course(models.Model):
         verbose_name="Ders Syllabus Dosyası (.pdf, .docx vb.)"
     )
 
+    # değişiklik akışı (changefeed) için
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Son Güncelleme")
+
+    objects = CourseQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['term', 'course_code'], name='unique_course_code_per_term'),
+            # dönemi olmayan eski dersler için kod yine unique kalsın
+            models.UniqueConstraint(
+                fields=['course_code'],
+                condition=models.Q(term__isnull=True),
+                name='unique_course_code_without_term'
+            ),
+        ]
+
     def __str__(self):
         return f"{self.course_code} - {self.course_name}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # kod veya bölüm değişince öğrenim çıktılarının arama kayıtları güncellenir (bkz. signals.py)
+        # ertelenmiş (only/defer) alanlar için sorgu atılmasın, bilinmiyorsa kayıtta güncellenir
+        instance._loaded_search_key = (instance.__dict__.get('course_code'), instance.__dict__.get('department_id'))
+        return instance
+
 
 class EvaluationComponent(models.Model):
     """sınav belirleme ve yüzdesini belirleme"""
@@ -74,6 +257,7 @@ class LearningOutcome(models.Model):
     """dersin learning outcomeını belirleme"""
     course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name="learning_outcomes", verbose_name="Ders")
     description = models.TextField(verbose_name="Öğrenim Çıktısı Açıklaması")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Son Güncelleme")
 
     class Meta:
         verbose_name = "Öğrenim Çıktısı"
@@ -107,6 +291,14 @@ class Grade(models.Model):
         blank=True
     )
 
+    # notun öğrencilere e-postayla duyurulduğu zaman (admin'deki toplu işlemle doldurulur)
+    # görünürlüğü etkilemez: girilen not öğrenci panelinde hemen görünür
+    announced_at = models.DateTimeField(null=True, blank=True, db_index=True, verbose_name="Duyurulma Zamanı")
+
+    # değişiklik akışı (changefeed) için
+    # toplu işlemler (bulk_update, update) auto_now'ı tetiklemez, elle verilmeli
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Son Güncelleme")
+
     class Meta:
         verbose_name = "Not"
         verbose_name_plural = "Notlar"
@@ -117,16 +309,189 @@ class Grade(models.Model):
         return f"{self.student.username} - {self.component.name}: {self.score}"
 
 
+class ProgramOutcomeQuerySet(models.QuerySet):
+
+    def for_department(self, department):
+        """bölümün program çıktıları, department None ise bölümü atanmamış çıktılar"""
+        return self.filter(department=department)
+
+
 class ProgramOutcome(models.Model):
     """bölüm program çıktısı"""
-    code = models.CharField(max_length=10, unique=True, verbose_name="Çıktı Kodu (örn: PO-1)")
+    # her bölümün kendi PO-1, PO-2 ... çıktıları var, kod bölüm içinde unique
+    code = models.CharField(max_length=10, verbose_name="Çıktı Kodu (örn: PO-1)")
     description = models.TextField(verbose_name="Program Çıktısı Açıklaması")
+    department = models.ForeignKey(
+        Department,
+        on_delete=models.PROTECT,
+        related_name="program_outcomes",
+        verbose_name="Bölüm",
+        null=True,
+        blank=True
+    )
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Son Güncelleme")
+
+    objects = ProgramOutcomeQuerySet.as_manager()
 
     class Meta:
         verbose_name = "Program Çıktısı"
         verbose_name_plural = "Program Çıktıları"
         ordering = ['code']  # koda göre sırala
+        constraints = [
+            models.UniqueConstraint(fields=['department', 'code'], name='unique_program_outcome_code_per_department'),
+            # NULL değerler unique kontrolüne girmez, bölümü olmayan çıktılar için ayrıca kontrol et
+            models.UniqueConstraint(
+                fields=['code'],
+                condition=models.Q(department__isnull=True),
+                name='unique_program_outcome_code_without_department',
+            ),
+        ]
 
     def __str__(self):
         # açıklamanın ilk 50 karakterini göster
         return f"{self.code}: {self.description[:50]}..."
+
+
+class ArchivedEnrollment(models.Model):
+    """arşivlenmiş dönemin ders kayıtları (salt okunur)"""
+    term = models.ForeignKey(Term, on_delete=models.CASCADE, related_name="archived_enrollments", verbose_name="Dönem")
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name="archived_enrollments", verbose_name="Ders")
+    student = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="archived_enrollments",
+        verbose_name="Öğrenci"
+    )
+
+    class Meta:
+        verbose_name = "Arşivlenmiş Ders Kaydı"
+        verbose_name_plural = "Arşivlenmiş Ders Kayıtları"
+        unique_together = ('course', 'student')
+
+    def __str__(self):
+        return f"{self.term.code} - {self.course.course_code} - {self.student.username}"
+
+
+class ArchivedGrade(models.Model):
+    """
+    arşivlenmiş dönemin notları (salt okunur)
+    bileşen silindiği için adı ve yüzdesi burada saklanır
+    """
+    term = models.ForeignKey(Term, on_delete=models.CASCADE, related_name="archived_grades", verbose_name="Dönem")
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name="archived_grades", verbose_name="Ders")
+    student = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="archived_grades",
+        verbose_name="Öğrenci"
+    )
+    component_name = models.CharField(max_length=100, verbose_name="Değerlendirme Adı")
+    component_percentage = models.PositiveSmallIntegerField(verbose_name="Ağırlık Yüzdesi (%)")
+    score = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True, verbose_name="Alınan Not")
+
+    class Meta:
+        verbose_name = "Arşivlenmiş Not"
+        verbose_name_plural = "Arşivlenmiş Notlar"
+        indexes = [
+            models.Index(fields=['student', 'term']),
+        ]
+
+    def __str__(self):
+        return f"{self.term.code} - {self.course.course_code} - {self.student.username} - {self.component_name}: {self.score}"
+
+
+class SearchEntry(models.Model):
+    """
+    arama indeksinin bir satırı (ders, öğrenim çıktısı, program çıktısı veya kullanıcı)
+    SQLite'ta FTS5 sanal tablosu, PostgreSQL'de tsvector sütunu bu tabloyu indeksler
+    """
+    TYPE_CHOICES = (
+        ('course', 'Ders'),
+        ('learning_outcome', 'Öğrenim Çıktısı'),
+        ('program_outcome', 'Program Çıktısı'),
+        ('user', 'Kullanıcı'),
+    )
+    object_type = models.CharField(max_length=20, choices=TYPE_CHOICES, verbose_name="Kayıt Türü")
+    object_id = models.PositiveBigIntegerField(verbose_name="Kayıt ID")
+    title = models.CharField(max_length=255, verbose_name="Başlık")
+    body = models.TextField(blank=True, verbose_name="İçerik")
+    # sonuçlar aramayı yapanın bölümüyle sınırlanır
+    department = models.ForeignKey(
+        Department,
+        on_delete=models.SET_NULL,
+        related_name="+",
+        verbose_name="Bölüm",
+        null=True,
+        blank=True
+    )
+
+    class Meta:
+        verbose_name = "Arama Kaydı"
+        verbose_name_plural = "Arama Kayıtları"
+        unique_together = ('object_type', 'object_id')
+
+    def __str__(self):
+        return f"{self.get_object_type_display()}: {self.title}"
+
+
+class ChangeLog(models.Model):
+    """
+    değişiklik akışının satırları: her ekleme/güncelleme/silme buraya eklenir
+    otomatik artan id, dış sistemlerin kaldığı yeri gösteren imleçtir (cursor)
+    """
+    MODEL_CHOICES = (
+        ('grade', 'Not'),
+        ('course', 'Ders'),
+        ('enrollment', 'Ders Kaydı'),
+        ('learning_outcome', 'Öğrenim Çıktısı'),
+        ('program_outcome', 'Program Çıktısı'),
+    )
+    ACTION_CHOICES = (
+        ('upsert', 'Ekleme/Güncelleme'),
+        ('delete', 'Silme'),
+    )
+    model = models.CharField(max_length=20, choices=MODEL_CHOICES, verbose_name="Model")
+    # ders kaydı için "ders_id:öğrenci_id", diğerleri için kayıt id
+    object_key = models.CharField(max_length=64, verbose_name="Kayıt Anahtarı")
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES, verbose_name="İşlem")
+    changed_at = models.DateTimeField(auto_now_add=True, verbose_name="Değişiklik Zamanı")
+
+    class Meta:
+        verbose_name = "Değişiklik Kaydı"
+        verbose_name_plural = "Değişiklik Kayıtları"
+
+    def __str__(self):
+        return f"#{self.id} {self.model}:{self.object_key} {self.action}"
+
+
+class GradeNotification(models.Model):
+    """
+    gönderilmeyi bekleyen not bildirimleri (outbox)
+    not kaydıyla aynı transaction içinde yazılır, e-postalar istek dışında
+    send_grade_notifications komutuyla toplu gönderilir
+    """
+    student = models.ForeignKey(User, on_delete=models.CASCADE, related_name='grade_notifications', verbose_name="Öğrenci")
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='grade_notifications', verbose_name="Ders")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Oluşturulma Zamanı")
+    sent_at = models.DateTimeField(null=True, blank=True, verbose_name="Gönderilme Zamanı")
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name="Deneme Sayısı")
+    next_attempt_at = models.DateTimeField(null=True, blank=True, verbose_name="Sonraki Deneme")
+    last_error = models.TextField(blank=True, verbose_name="Son Hata")
+    # deneme hakkı bitti veya e-posta adresi yok --> bir daha denenmez
+    failed_at = models.DateTimeField(null=True, blank=True, verbose_name="Vazgeçilme Zamanı")
+
+    class Meta:
+        verbose_name = "Not Bildirimi"
+        verbose_name_plural = "Not Bildirimleri"
+        constraints = [
+            # aynı öğrenci ve ders için tek bekleyen bildirim --> tekrar kaydetmeler birleşir
+            # vazgeçilen bildirim yeni bildirimlerin önünü tıkamaz
+            models.UniqueConstraint(
+                fields=['student', 'course'],
+                condition=models.Q(sent_at__isnull=True, failed_at__isnull=True),
+                name='unique_pending_grade_notification',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.student.username} - {self.course.course_code}"
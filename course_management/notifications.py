@@ -0,0 +1,165 @@
+"""
+not bildirimleri
+
+notlar kaydedilirken sadece bekleyen bildirim satırları yazılır (outbox),
+e-postalar istek dışında send_grade_notifications komutuyla gönderilir:
+tek SMTP bağlantısı açılır, ders başına mesaj bir kez render edilir,
+hata alan bildirimler artan bekleme süresiyle tekrar denenir
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import router, transaction
+from django.db.models import Q
+from django.template.loader import get_template
+from django.utils import timezone
+
+from .models import GradeNotification
+
+DEFAULT_BATCH_SIZE = 100
+MAX_ATTEMPTS = 5
+# ayrılan bildirimler bu süre içinde gönderilmezse (worker çöktü) tekrar denenir
+CLAIM_TIMEOUT = timedelta(minutes=10)
+
+SUBJECT_TEMPLATE = 'course_management/emails/grade_notification_subject.txt'
+BODY_TEMPLATE = 'course_management/emails/grade_notification.txt'
+
+
+def queue_notifications(pairs):
+    """
+    (öğrenci_id, ders_id) çiftleri için bekleyen bildirim oluştur
+    aynı çift bir kez yazılır, zaten bekleyen bildirimi olanlar atlanır
+    (gönderilmiş veya vazgeçilmiş eski bildirimler yenisini engellemez)
+    """
+    pairs = set(pairs)
+    if pairs:
+        GradeNotification.objects.bulk_create(
+            [GradeNotification(student_id=student_id, course_id=course_id) for student_id, course_id in pairs],
+            ignore_conflicts=True,
+        )
+    return len(pairs)
+
+
+def queue_course_notifications(course, grades):
+    """not defterinde değişen notların öğrencilerini bildirim kuyruğuna ekle"""
+    return queue_notifications(
+        (grade.student_id, course.id) for grade in grades if grade.score is not None
+    )
+
+
+def _retry_delay(attempts):
+    # 1, 2, 4, 8 ... dakika
+    return timedelta(minutes=2 ** (attempts - 1))
+
+
+def pending_notifications(now=None):
+    now = now or timezone.now()
+    return (
+        GradeNotification.objects
+        .filter(sent_at__isnull=True, failed_at__isnull=True)
+        .filter(Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now))
+    )
+
+
+def _claim_batch(now, last_id, batch_size):
+    """
+    sıradaki bildirimleri bu worker için ayır
+    satırlar kilitlenir (başka worker'ın kilitlediklerini atlar) ve gönderim
+    süresince CLAIM_TIMEOUT kadar ileri ertelenir: aynı anda çalışan diğer
+    worker'lar onları almaz, bu worker yarıda kalırsa süre dolunca tekrar denenir
+    """
+    with transaction.atomic(using=router.db_for_write(GradeNotification)):
+        batch = list(
+            pending_notifications(now)
+            .filter(id__gt=last_id)
+            .select_related('student', 'course')
+            .select_for_update(skip_locked=True, of=('self',))
+            .order_by('id')[:batch_size]
+        )
+        GradeNotification.objects.filter(id__in=[n.id for n in batch]).update(
+            next_attempt_at=now + CLAIM_TIMEOUT
+        )
+    return batch
+
+
+class _MessageRenderer:
+    """şablonlar bir kez yüklenir, mesaj ders başına bir kez render edilir"""
+
+    def __init__(self):
+        self.subject_template = get_template(SUBJECT_TEMPLATE)
+        self.body_template = get_template(BODY_TEMPLATE)
+        self._rendered = {}
+
+    def render(self, course):
+        if course.id not in self._rendered:
+            context = {'course': course}
+            subject = ' '.join(self.subject_template.render(context).split())
+            self._rendered[course.id] = (subject, self.body_template.render(context))
+        return self._rendered[course.id]
+
+
+def send_pending_notifications(batch_size=DEFAULT_BATCH_SIZE):
+    """
+    bekleyen bildirimleri tek e-posta bağlantısı üzerinden gönder
+    her bildirimin sonucu gönderimden hemen sonra yazılır: worker yarıda
+    kalırsa en fazla o an gönderilen tek mesaj tekrar gider
+    (gönderilen, hata alan) sayılarını döner
+    """
+    renderer = _MessageRenderer()
+    sent = failed = 0
+    last_id = 0
+    connection = get_connection()
+    connection.open()
+    try:
+        while True:
+            batch = _claim_batch(timezone.now(), last_id, batch_size)
+            if not batch:
+                break
+            last_id = batch[-1].id
+
+            for notification in batch:
+                if _deliver(notification, renderer, connection):
+                    sent += 1
+                else:
+                    failed += 1
+    finally:
+        connection.close()
+    return sent, failed
+
+
+def _deliver(notification, renderer, connection):
+    """tek bildirimi gönder ve sonucunu kaydet, gönderildiyse True"""
+    now = timezone.now()
+    notification.attempts += 1
+    email = notification.student.email
+    if not email:
+        # adres yoksa tekrar denemenin anlamı yok, adres eklenince yeni bildirim kuyruğa girer
+        notification.failed_at = now
+        notification.last_error = 'Öğrencinin e-posta adresi yok.'
+        notification.save(update_fields=['attempts', 'failed_at', 'last_error'])
+        return False
+
+    subject, body = renderer.render(notification.course)
+    message = EmailMessage(subject, body, settings.DEFAULT_FROM_EMAIL, [email], connection=connection)
+    try:
+        connection.send_messages([message])
+    except Exception as e:
+        notification.last_error = str(e)
+        if notification.attempts >= MAX_ATTEMPTS:
+            notification.failed_at = now
+        else:
+            notification.next_attempt_at = now + _retry_delay(notification.attempts)
+        notification.save(update_fields=['attempts', 'next_attempt_at', 'failed_at', 'last_error'])
+        # bağlantı kopmuş olabilir, sonraki mesaj için yeniden aç
+        connection.close()
+        try:
+            connection.open()
+        except Exception:
+            pass  # açılamazsa sonraki mesajlar da hata alır ve tekrar denenir
+        return False
+
+    notification.sent_at = now
+    notification.last_error = ''
+    notification.save(update_fields=['attempts', 'sent_at', 'last_error'])
+    return True
@@ -0,0 +1,256 @@
+"""
+istek başına profil çıkarma (sadece staff)
+
+PROFILING=True ile ProfilingMiddleware etkinleşir, kapalıyken istek zincirinde hiç yer almaz.
+staff bir kullanıcı ?_profile=1 (veya X-Profile: 1 başlığı) ile istek attığında
+görünüm cProfile ve/veya örnekleyici profil altında çalıştırılır, SQL sorguları
+çağrıldıkları kod satırıyla birlikte kaydedilir ve sonuç PROFILE_DIR klasörüne yazılır:
+    <id>.prof        --> cProfile çıktısı (snakeviz, pstats ile açılır)
+    <id>.folded.txt  --> örnekleyici çıktısı (flamegraph.pl / speedscope ile açılır)
+    <id>.json        --> özet ve SQL sorguları
+"""
+import cProfile
+import io
+import json
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+import traceback
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+# ?_profile=cprofile | sample | all (1 --> cprofile)
+QUERY_PARAM = '_profile'
+HEADER = 'X-Profile'
+MODES = ('cprofile', 'sample', 'all')
+
+SAMPLE_INTERVAL = 0.001
+# SQL kaynağı olarak gösterilecek çağrı sayısı
+SQL_STACK_DEPTH = 5
+
+# dışarıdan gelen id dosya yolu olarak kullanılır --> sadece bu biçim kabul edilir
+PROFILE_ID_RE = re.compile(r'^\d{8}-\d{6}-\d{6}-[\w.-]+$')
+
+
+def profile_dir():
+    return str(getattr(settings, 'PROFILE_DIR', os.path.join(settings.BASE_DIR, 'profiles')))
+
+
+def requested_mode(request):
+    """istek profil istiyorsa modu, istemiyorsa None döner"""
+    value = request.GET.get(QUERY_PARAM) or request.headers.get(HEADER)
+    if not value:
+        return None
+    return value if value in MODES else 'cprofile'
+
+
+# ---------------------------------------------------------------- örnekleyici
+
+class Sampler:
+    """
+    ayrı bir thread'den hedef thread'in çağrı yığınına belirli aralıklarla bakar
+    yığınlar "a;b;c adet" (folded) biçiminde toplanır
+    """
+
+    def __init__(self, thread_id, interval=SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = {}
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})')
+                frame = frame.f_back
+            key = ';'.join(reversed(names))
+            self.stacks[key] = self.stacks.get(key, 0) + 1
+            self.samples += 1
+
+    def folded(self):
+        return ''.join(f'{stack} {count}\n' for stack, count in sorted(self.stacks.items()))
+
+
+# ---------------------------------------------------------------- SQL
+
+class QueryRecorder:
+    """connection.execute_wrapper ile her sorguyu süresi ve proje içindeki çağıranıyla kaydet"""
+
+    def __init__(self):
+        self.queries = []
+        self.base_dir = str(settings.BASE_DIR)
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append({
+                'sql': sql,
+                'duration_ms': round((time.perf_counter() - start) * 1000, 3),
+                'origin': self._origin(),
+            })
+
+    def _origin(self):
+        # django/site-packages çerçeveleri atlanır, sadece proje kodu gösterilir
+        frames = [
+            f"{os.path.relpath(f.filename, self.base_dir)}:{f.lineno} {f.name}"
+            for f in traceback.extract_stack()
+            if f.filename.startswith(self.base_dir) and 'site-packages' not in f.filename
+            and not f.filename.endswith('profiling.py')
+        ]
+        return frames[-SQL_STACK_DEPTH:]
+
+
+# ---------------------------------------------------------------- çalıştırma
+
+def run_profiled(request, mode, func, *args, **kwargs):
+    """
+    func'ı seçilen profil(ler) altında çalıştır, sonucu diske yaz
+    (func'ın dönüşü, profil id) döner
+    """
+    profiler = cProfile.Profile() if mode in ('cprofile', 'all') else None
+    sampler = Sampler(threading.get_ident()) if mode in ('sample', 'all') else None
+    recorder = QueryRecorder()
+    wrappers = [connections[alias].execute_wrapper(recorder) for alias in connections]
+
+    started_at = timezone.now()
+    start = time.perf_counter()
+    for wrapper in wrappers:
+        wrapper.__enter__()
+    if sampler:
+        sampler.start()
+    if profiler:
+        profiler.enable()
+    try:
+        response = func(*args, **kwargs)
+    finally:
+        if profiler:
+            profiler.disable()
+        if sampler:
+            sampler.stop()
+        for wrapper in reversed(wrappers):
+            wrapper.__exit__(None, None, None)
+    elapsed = time.perf_counter() - start
+
+    profile_id = save_profile(request, response, mode, started_at, elapsed, profiler, sampler, recorder)
+    return response, profile_id
+
+
+def _view_label(request):
+    match = getattr(request, 'resolver_match', None)
+    label = match.view_name if match else request.path.strip('/').replace('/', '_')
+    return re.sub(r'[^\w.-]', '_', label or 'root')[:60]
+
+
+def save_profile(request, response, mode, started_at, elapsed, profiler, sampler, recorder):
+    directory = profile_dir()
+    os.makedirs(directory, exist_ok=True)
+    profile_id = f"{started_at:%Y%m%d-%H%M%S-%f}-{_view_label(request)}"
+    base = os.path.join(directory, profile_id)
+
+    files = []
+    if profiler:
+        profiler.dump_stats(base + '.prof')
+        files.append(profile_id + '.prof')
+    if sampler:
+        with open(base + '.folded.txt', 'w', encoding='utf-8') as f:
+            f.write(sampler.folded())
+        files.append(profile_id + '.folded.txt')
+
+    summary = {
+        'id': profile_id,
+        'mode': mode,
+        'path': request.get_full_path(),
+        'method': request.method,
+        'user': request.user.get_username(),
+        'status': getattr(response, 'status_code', None),
+        'started_at': started_at.isoformat(),
+        'duration_ms': round(elapsed * 1000, 2),
+        'query_count': len(recorder.queries),
+        'query_ms': round(sum(q['duration_ms'] for q in recorder.queries), 2),
+        'samples': sampler.samples if sampler else None,
+        'files': files,
+        'queries': recorder.queries,
+    }
+    with open(base + '.json', 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=1)
+    return profile_id
+
+
+# ---------------------------------------------------------------- okuma
+
+def list_profiles(limit=200):
+    """kaydedilmiş profillerin özetleri, yeniden eskiye"""
+    directory = profile_dir()
+    if not os.path.isdir(directory):
+        return []
+    names = sorted((n for n in os.listdir(directory) if n.endswith('.json')), reverse=True)[:limit]
+    profiles = []
+    for name in names:
+        summary = load_profile(name[:-len('.json')])
+        if summary:
+            summary.pop('queries', None)
+            profiles.append(summary)
+    return profiles
+
+
+def load_profile(profile_id):
+    if not PROFILE_ID_RE.match(profile_id):
+        return None
+    try:
+        with open(os.path.join(profile_dir(), profile_id + '.json'), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def profile_file_path(profile_id, filename):
+    """indirilecek dosyanın yolu, profile ait değilse None"""
+    summary = load_profile(profile_id)
+    if summary is None or filename not in summary['files'] + [profile_id + '.json']:
+        return None
+    return os.path.join(profile_dir(), filename)
+
+
+def top_functions(profile_id, limit=30, sort='cumulative'):
+    """.prof dosyasındaki en pahalı fonksiyonların pstats çıktısı (metin)"""
+    path = profile_file_path(profile_id, profile_id + '.prof')
+    if path is None or not os.path.exists(path):
+        return ''
+    stream = io.StringIO()
+    stats = pstats.Stats(path, stream=stream)
+    stats.strip_dirs().sort_stats(sort).print_stats(limit)
+    return stream.getvalue()
+
+
+def top_stacks(profile_id, limit=20):
+    """örnekleyicinin en sık gördüğü yığınlar --> [(adet, yığının son çağrıları)]"""
+    path = profile_file_path(profile_id, profile_id + '.folded.txt')
+    if path is None or not os.path.exists(path):
+        return []
+    rows = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            stack, _, count = line.rstrip('\n').rpartition(' ')
+            rows.append((int(count), stack.split(';')[-4:]))
+    return sorted(rows, key=lambda row: row[0], reverse=True)[:limit]
@@ -0,0 +1,110 @@
+"""
+not projeksiyonu (öğrenci için "finalden kaç almalıyım?")
+
+her ders için notu girilmemiş bileşenlerden (her birinden) alınması gereken
+en düşük not, her harf notu eşiği için kapalı formülle hesaplanır:
+
+    mevcut   = Σ not * ağırlık / 100   (notu girilmiş bileşenler)
+    kalan    = Σ ağırlık               (notu girilmemiş bileşenler)
+    gereken  = (eşik - mevcut) * 100 / kalan
+
+öğrencinin tüm dersleri, bileşenleri ve notları sayfa başına sabit sayıda
+sorguyla çekilir, hesap bellekte yapılır (ders başına sorgu yok).
+"""
+from decimal import ROUND_CEILING, Decimal
+
+from django.db.models import Prefetch
+
+from .models import EvaluationComponent, Grade
+from .reports import GRADE_BANDS, letter_for
+from .validation import MAX_SCORE, MIN_SCORE
+
+HUNDRED = Decimal('100')
+CENT = Decimal('0.01')
+
+
+def _required_score(threshold, current, remaining_weight):
+    """
+    eşiğe ulaşmak için kalan bileşenlerin her birinden gereken not
+    (not, durum) döner: secured --> zaten garanti, reachable --> alınabilir,
+    unreachable --> 100 alsa da ulaşılamaz
+    """
+    if current >= threshold:
+        return None, 'secured'
+    if not remaining_weight:
+        return None, 'unreachable'
+    # yukarı yuvarla: gereken notu alan öğrenci eşiği kesin geçer
+    required = ((threshold - current) * HUNDRED / remaining_weight).quantize(CENT, rounding=ROUND_CEILING)
+    if required > MAX_SCORE:
+        return None, 'unreachable'
+    return max(required, MIN_SCORE), 'reachable'
+
+
+def project_course(components, scores, what_if=None):
+    """
+    tek dersin projeksiyonu (sorgu atmaz)
+
+    components --> dersin EvaluationComponent'leri
+    scores     --> {component_id: not} öğrencinin girilmiş notları
+    what_if    --> {component_id: not} notu girilmemiş bileşenler için varsayılan notlar
+    """
+    what_if = what_if or {}
+    current = Decimal('0')
+    graded_weight = remaining_weight = 0
+    component_list = []
+    for component in components:
+        score = scores.get(component.id)
+        assumed = score is None and component.id in what_if
+        if assumed:
+            score = what_if[component.id]
+        if score is None:
+            remaining_weight += component.percentage
+        else:
+            current += score * component.percentage / HUNDRED
+            graded_weight += component.percentage
+        component_list.append({
+            'id': component.id,
+            'name': component.name,
+            'percentage': component.percentage,
+            'score': score,
+            'assumed': assumed,
+        })
+
+    targets = []
+    for letter, threshold in GRADE_BANDS:
+        if threshold <= 0:
+            continue  # en düşük harf notu her zaman garanti
+        required, status = _required_score(threshold, current, remaining_weight)
+        targets.append({'letter': letter, 'threshold': threshold, 'required': required, 'status': status})
+
+    current = current.quantize(CENT)
+    return {
+        'components': component_list,
+        'current': current,
+        'graded_weight': graded_weight,
+        'remaining_weight': remaining_weight,
+        # kalan bileşenlerin hepsinden 100 alırsa
+        'max_possible': (current + remaining_weight).quantize(CENT),
+        # şimdiye kadarki performans kalan bileşenlerde de sürerse
+        'average_so_far': (current * HUNDRED / graded_weight).quantize(CENT) if graded_weight else None,
+        'secured_letter': letter_for(current),
+        'targets': targets,
+    }
+
+
+def build_projections(student, courses, what_if=None):
+    """
+    öğrencinin dersleri için projeksiyonlar, ders sayısından bağımsız üç sorgu
+    [{'course': Course, ...project_course sonucu}] döner
+    """
+    courses = list(courses.prefetch_related(
+        Prefetch('evaluation_components', queryset=EvaluationComponent.objects.order_by('id'))
+    ))
+    scores = dict(
+        Grade.objects.filter(student=student, component__course__in=courses, score__isnull=False)
+        .values_list('component_id', 'score')
+    )
+    return [
+        {'course': course, **project_course(course.evaluation_components.all(), scores, what_if)}
+        for course in courses
+    ]
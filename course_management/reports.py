@@ -0,0 +1,171 @@
+from decimal import Decimal
+from statistics import median
+
+from django.core.cache import cache
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Sum, Value
+
+from .models import Course, Department, EvaluationComponent, Grade
+from .tenancy import for_each_department
+
+# rapor bölüm başına önbellekte tutulur, not yazıldığında sürüm artırılır
+# ve tüm bölümlerin raporları geçersiz olur
+REPORT_CACHE_KEY = 'course_management:department_report'
+REPORT_VERSION_KEY = 'course_management:department_report_version'
+REPORT_CACHE_TIMEOUT = 60 * 10
+
+# harf notu aralıkları --> (harf, alt sınır), yüksekten düşüğe
+GRADE_BANDS = (
+    ('AA', Decimal('90')),
+    ('BA', Decimal('85')),
+    ('BB', Decimal('80')),
+    ('CB', Decimal('75')),
+    ('CC', Decimal('70')),
+    ('DC', Decimal('65')),
+    ('DD', Decimal('60')),
+    ('FD', Decimal('50')),
+    ('FF', Decimal('0')),
+)
+
+
+def letter_for(score):
+    """ağırlıklı ortalamaya karşılık gelen harf notu"""
+    for letter, lower_bound in GRADE_BANDS:
+        if score >= lower_bound:
+            return letter
+    return GRADE_BANDS[-1][0]
+
+
+def _weighted_score():
+    return ExpressionWrapper(
+        F('score') * F('component__percentage') / Value(Decimal('100')),
+        output_field=DecimalField(max_digits=7, decimal_places=2)
+    )
+
+
+def build_department_report(courses=None):
+    """
+    her ders için kayıt sayısı, not girişi tamamlanma oranı,
+    ağırlıklı ortalamaların ortalaması/medyanı ve harf notu dağılımı
+
+    ders başına döngü yerine birkaç gruplanmış sorgu kullanılır
+    """
+    if courses is None:
+        courses = Course.objects.active()
+    courses = list(courses.order_by('course_code').values('id', 'course_code', 'course_name'))
+    course_ids = [c['id'] for c in courses]
+
+    # 1) ders başına kayıtlı öğrenci sayısı
+    enrollment_counts = dict(
+        Course.students.through.objects
+        .filter(course_id__in=course_ids)
+        .values('course_id')
+        .annotate(n=Count('id'))
+        .values_list('course_id', 'n')
+    )
+
+    # 2) ders başına bileşen sayısı ve toplam ağırlık
+    component_stats = {
+        row['course_id']: row
+        for row in EvaluationComponent.objects
+        .filter(course_id__in=course_ids)
+        .values('course_id')
+        .annotate(component_count=Count('id'), total_weight=Sum('percentage'))
+    }
+
+    # 3) ders ve öğrenci başına girilmiş not sayısı ve ağırlıklı toplam
+    # sadece hâlâ derse kayıtlı öğrencilerin notları sayılır
+    student_rows = (
+        Grade.objects
+        .filter(component__course_id__in=course_ids, score__isnull=False,
+                component__course__students=F('student'))
+        .values('component__course_id', 'student_id')
+        .annotate(graded=Count('id'), final=Sum(_weighted_score()))
+        .values_list('component__course_id', 'graded', 'final')
+    )
+    graded_counts = {}
+    finals_by_course = {}
+    for course_id, graded, final in student_rows:
+        graded_counts[course_id] = graded_counts.get(course_id, 0) + graded
+        finals_by_course.setdefault(course_id, []).append(final)
+
+    report = []
+    for course in courses:
+        course_id = course['id']
+        enrollment = enrollment_counts.get(course_id, 0)
+        stats = component_stats.get(course_id, {})
+        component_count = stats.get('component_count', 0)
+        expected_cells = enrollment * component_count
+        graded_cells = graded_counts.get(course_id, 0)
+        finals = finals_by_course.get(course_id, [])
+
+        histogram = {letter: 0 for letter, _ in GRADE_BANDS}
+        for final in finals:
+            histogram[letter_for(final)] += 1
+
+        report.append({
+            'course_id': course_id,
+            'course_code': course['course_code'],
+            'course_name': course['course_name'],
+            'enrollment': enrollment,
+            'component_count': component_count,
+            'total_weight': stats.get('total_weight') or 0,
+            'graded_cells': graded_cells,
+            'expected_cells': expected_cells,
+            'completion_rate': round(graded_cells / expected_cells * 100, 1) if expected_cells else 0.0,
+            'graded_students': len(finals),
+            'mean_final': (sum(finals) / len(finals)).quantize(Decimal('0.01')) if finals else None,
+            'median_final': Decimal(median(finals)).quantize(Decimal('0.01')) if finals else None,
+            'histogram': histogram,
+        })
+    return report
+
+
+def _report_cache_key(department):
+    version = cache.get_or_set(REPORT_VERSION_KEY, 1, None)
+    return f'{REPORT_CACHE_KEY}:{version}:{department.pk if department else 0}'
+
+
+def get_department_report(department=None):
+    """bölümün raporunu önbellekten al, yoksa hesapla ve önbelleğe koy"""
+    key = _report_cache_key(department)
+    report = cache.get(key)
+    if report is None:
+        report = build_department_report(Course.objects.active().for_department(department))
+        cache.set(key, report, REPORT_CACHE_TIMEOUT)
+    return report
+
+
+def invalidate_department_report():
+    """not, bileşen veya kayıt değiştiğinde tüm bölüm raporlarını geçersiz kıl"""
+    try:
+        cache.incr(REPORT_VERSION_KEY)
+    except ValueError:
+        # sürüm anahtarı henüz yok veya süresi dolmuş
+        cache.set(REPORT_VERSION_KEY, 1, None)
+
+
+def build_faculty_report(max_workers=None):
+    """
+    fakültedeki tüm bölümlerin raporları, bölümler paralel hesaplanır
+    (bölüm veritabanları ayrıysa her biri kendi veritabanında sorgulanır)
+    [{'department', 'course_count', 'enrollment', 'completion_rate', 'courses'}, ...] döner
+    """
+    departments = list(Department.objects.all())
+    if Course.objects.using('default').filter(department__isnull=True).exists():
+        # bölümü atanmamış eski dersler
+        departments.append(None)
+
+    results = for_each_department(get_department_report, departments, max_workers=max_workers)
+
+    faculty = []
+    for department, courses in results:
+        graded = sum(row['graded_cells'] for row in courses)
+        expected = sum(row['expected_cells'] for row in courses)
+        faculty.append({
+            'department': department,
+            'course_count': len(courses),
+            'enrollment': sum(row['enrollment'] for row in courses),
+            'completion_rate': round(graded / expected * 100, 1) if expected else 0.0,
+            'courses': courses,
+        })
+    return faculty
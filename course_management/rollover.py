@@ -0,0 +1,66 @@
+from django.db import router, transaction
+
+from .models import Course, EvaluationComponent, LearningOutcome
+from .reports import invalidate_department_report
+from . import changefeed, search
+
+
+def rollover_courses(source_courses, target_term, copy_instructors=True):
+    """
+    dersleri değerlendirme bileşenleri ve öğrenim çıktılarıyla birlikte yeni döneme kopyala
+
+    kaç ders kopyalanırsa kopyalansın sabit sayıda sorgu atılır: kaynak veriler
+    birkaç sorguyla okunur, her tablo için tek bulk insert yapılır, eski ID'ler
+    bellekte yeni ID'lere eşlenir. öğrenci kayıtları ve notlar kopyalanmaz.
+    (yeni dersler, hedef dönemde zaten olduğu için atlanan ders kodları) döner
+    """
+    source_courses = list(source_courses.order_by('course_code'))
+    existing_codes = set(
+        Course.objects.filter(term=target_term, course_code__in=[c.course_code for c in source_courses])
+        .values_list('course_code', flat=True)
+    )
+    skipped = sorted(existing_codes)
+    source_courses = [c for c in source_courses if c.course_code not in existing_codes]
+    if not source_courses:
+        return [], skipped
+
+    source_ids = [c.id for c in source_courses]
+    components = list(EvaluationComponent.objects.filter(course_id__in=source_ids).order_by('id'))
+    outcomes = list(LearningOutcome.objects.filter(course_id__in=source_ids).order_by('id'))
+    Instructors = Course.instructors.through
+    instructor_rows = (
+        list(Instructors.objects.filter(course_id__in=source_ids).values_list('course_id', 'user_id'))
+        if copy_instructors else []
+    )
+
+    with transaction.atomic(using=router.db_for_write(Course)):
+        new_courses = Course.objects.bulk_create([
+            # syllabus dosyası aynı dosyayı gösterir, hoca isterse günceller
+            Course(course_code=c.course_code, course_name=c.course_name, syllabus=c.syllabus, term=target_term,
+                   department_id=c.department_id)
+            for c in source_courses
+        ])
+        # eski ders ID --> yeni ders
+        course_map = {old.id: new for old, new in zip(source_courses, new_courses)}
+
+        EvaluationComponent.objects.bulk_create([
+            EvaluationComponent(course=course_map[c.course_id], name=c.name, percentage=c.percentage)
+            for c in components
+        ])
+        new_outcomes = LearningOutcome.objects.bulk_create([
+            LearningOutcome(course=course_map[o.course_id], description=o.description)
+            for o in outcomes
+        ])
+        if instructor_rows:
+            Instructors.objects.bulk_create([
+                Instructors(course_id=course_map[course_id].id, user_id=user_id)
+                for course_id, user_id in instructor_rows
+            ])
+
+        # bulk_create sinyal tetiklemez: arama indeksini, raporu ve değişiklik akışını elle güncelle
+        search.index_new_objects(new_courses + new_outcomes)
+        invalidate_department_report()
+        changefeed.record('course', [c.pk for c in new_courses])
+        changefeed.record('learning_outcome', [o.pk for o in new_outcomes])
+
+    return new_courses, skipped
@@ -0,0 +1,57 @@
+"""
+bölüm başına veritabanı yönlendirmesi (isteğe bağlı)
+
+settings.DEPARTMENT_DATABASES = {'CSE': 'cse', 'EEE': 'eee'} ve
+DATABASE_ROUTERS = ['course_management.routers.DepartmentRouter'] ile açılır.
+
+- bölüm verileri (dersler, notlar, çıktılar, arşiv, arama, bildirim ve değişiklik
+  kayıtları) geçerli bölümün veritabanına yazılır ve oradan okunur
+- kullanıcılar, profiller, dönemler, bölümler ve oturumlar default veritabanındadır;
+  bölüm veritabanlarındaki yabancı anahtarlar için User, Term ve Department
+  satırları oraya da kopyalanır (bkz. signals.py, sync_department_databases komutu)
+- bir bölümün dersine başka bölümün öğrencisi kaydedilebilir, ancak öğrenci
+  paneli sadece öğrencinin kendi bölümünün veritabanını okur
+"""
+from .tenancy import database_for, department_databases, get_current_department
+
+APP_LABEL = 'course_management'
+
+# default veritabanında kalan (paylaşılan) modeller
+SHARED_MODELS = {'department', 'profile', 'term'}
+
+# bölüm veritabanlarına kopyalanan modeller --> yabancı anahtarların hedefi
+REPLICATED_MODELS = {'auth.user', 'course_management.term', 'course_management.department'}
+
+
+def is_department_model(model):
+    return model._meta.app_label == APP_LABEL and model._meta.model_name not in SHARED_MODELS
+
+
+class DepartmentRouter:
+
+    def _db(self, model, **hints):
+        if not is_department_model(model):
+            return None
+        instance = hints.get('instance')
+        if instance is not None and is_department_model(type(instance)) and instance._state.db:
+            # ilişkili bölüm nesneleri geldikleri veritabanında kalır
+            # (user.enrolled_courses gibi paylaşılan modelden gelen ilişkiler geçerli bölüme gider)
+            return instance._state.db
+        return database_for(get_current_department())
+
+    def db_for_read(self, model, **hints):
+        return self._db(model, **hints)
+
+    def db_for_write(self, model, **hints):
+        return self._db(model, **hints)
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # kullanıcı ve dönem satırları bölüm veritabanlarına kopyalandığı için
+        # bölüm verisi ile paylaşılan modeller arasındaki ilişkilere izin ver
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db not in department_databases():
+            return None
+        # bölüm veritabanı: uygulamanın tabloları ve yabancı anahtar hedefleri
+        return app_label in (APP_LABEL, 'auth', 'contenttypes')
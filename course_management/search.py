@@ -0,0 +1,236 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.db import connections, router, transaction
+from django.db.models import CharField, Q, Value
+from django.db.models.functions import Cast, Concat
+
+from .models import Course, LearningOutcome, ProgramOutcome, SearchEntry
+from .tenancy import database_for, department_databases
+
+User = get_user_model()
+
+FTS_TABLE = 'course_management_searchentry_fts'
+
+# sorgudaki kelimeler --> FTS sözdizimine kullanıcı girdisi doğrudan verilmez
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+# search(department=ANY_DEPARTMENT) --> bölüm süzmesi yapılmaz
+ANY_DEPARTMENT = object()
+
+
+# belge fonksiyonları --> (başlık, içerik, bölüm id)
+
+def _course_document(course):
+    return f"{course.course_code} - {course.course_name}", course.course_code, course.department_id
+
+
+def _learning_outcome_title_prefix(course_code):
+    return f"{course_code} - Öğrenim Çıktısı #"
+
+
+def _learning_outcome_document(outcome):
+    return (f"{_learning_outcome_title_prefix(outcome.course.course_code)}{outcome.id}", outcome.description,
+            outcome.course.department_id)
+
+
+def _program_outcome_document(outcome):
+    return outcome.code, outcome.description, outcome.department_id
+
+
+def _user_document(user):
+    full_name = user.get_full_name()
+    # profil henüz oluşturulmamış olabilir (User post_save sırası)
+    department_id = getattr(getattr(user, 'profile', None), 'department_id', None)
+    return full_name or user.username, f"{user.username} {user.first_name} {user.last_name}", department_id
+
+
+# model -> (kayıt türü, belge fonksiyonu)
+INDEXED_MODELS = {
+    Course: ('course', _course_document),
+    LearningOutcome: ('learning_outcome', _learning_outcome_document),
+    ProgramOutcome: ('program_outcome', _program_outcome_document),
+    User: ('user', _user_document),
+}
+
+
+def _entry_database(obj):
+    """
+    arama kaydının veritabanı: bölüm verisi geçerli bölümün veritabanında,
+    kullanıcılar (paylaşılan) kendi bölümlerinin veritabanında indekslenir
+    """
+    if isinstance(obj, User):
+        return database_for(getattr(getattr(obj, 'profile', None), 'department', None))
+    return router.db_for_write(SearchEntry)
+
+
+def index_object(obj):
+    """tek bir nesnenin arama kaydını oluştur veya güncelle"""
+    object_type, document = INDEXED_MODELS[type(obj)]
+    title, body, department_id = document(obj)
+    SearchEntry.objects.using(_entry_database(obj)).update_or_create(
+        object_type=object_type,
+        object_id=obj.pk,
+        defaults={'title': title[:255], 'body': body, 'department_id': department_id},
+    )
+
+
+def index_new_objects(objects):
+    """toplu oluşturulan nesneleri tek INSERT ile indeksle (bulk_create sinyal tetiklemez)"""
+    entries = []
+    for obj in objects:
+        object_type, document = INDEXED_MODELS[type(obj)]
+        title, body, department_id = document(obj)
+        entries.append(SearchEntry(object_type=object_type, object_id=obj.pk, title=title[:255], body=body,
+                                   department_id=department_id))
+    SearchEntry.objects.bulk_create(entries)
+
+
+def reindex_course_outcomes(course):
+    """
+    dersin öğrenim çıktılarının başlığında ders kodu, kaydında dersin bölümü var
+    ders kodu veya bölümü değişince hepsi tek UPDATE ile güncellenir
+    """
+    object_type, _ = INDEXED_MODELS[LearningOutcome]
+    SearchEntry.objects.using(_entry_database(course)).filter(
+        object_type=object_type,
+        object_id__in=LearningOutcome.objects.filter(course=course).values('id'),
+    ).update(
+        title=Concat(Value(_learning_outcome_title_prefix(course.course_code)), Cast('object_id', CharField())),
+        department_id=course.department_id,
+    )
+
+
+def remove_object(obj):
+    """silinen nesnenin arama kaydını kaldır"""
+    object_type, _ = INDEXED_MODELS[type(obj)]
+    SearchEntry.objects.using(_entry_database(obj)).filter(object_type=object_type, object_id=obj.pk).delete()
+
+
+def _querysets():
+    yield Course, Course.objects.all()
+    yield LearningOutcome, LearningOutcome.objects.select_related('course')
+    yield ProgramOutcome, ProgramOutcome.objects.all()
+    yield User, User.objects.select_related('profile__department')
+
+
+def rebuild_index(batch_size=1000):
+    """
+    tüm arama indeksini sıfırdan kur
+    toplu işlemler (bulk_create, update) sinyal tetiklemediği için gerektiğinde çalıştırılır
+    """
+    total = 0
+    database = router.db_for_write(SearchEntry)
+    routed = bool(department_databases())
+    with transaction.atomic(using=database):
+        SearchEntry.objects.all().delete()
+        for model, queryset in _querysets():
+            object_type, document = INDEXED_MODELS[model]
+            batch = []
+            for obj in queryset.iterator(chunk_size=batch_size):
+                if routed and model is User and _entry_database(obj) != database:
+                    # başka bölümün kullanıcısı, kendi veritabanında indekslenir
+                    continue
+                title, body, department_id = document(obj)
+                batch.append(SearchEntry(object_type=object_type, object_id=obj.pk, title=title[:255], body=body,
+                                         department_id=department_id))
+                if len(batch) >= batch_size:
+                    SearchEntry.objects.bulk_create(batch)
+                    total += len(batch)
+                    batch = []
+            if batch:
+                SearchEntry.objects.bulk_create(batch)
+                total += len(batch)
+
+    # SQLite'ta FTS tablosu tetikleyicilerle (migration 0008) senkron kalır
+    return total
+
+
+def _tokens(query):
+    return _TOKEN_RE.findall(query or '')
+
+
+def _department_sql(department, params):
+    """bölüm süzmesi için SQL parçası, parametreyi params listesine ekler"""
+    if department is ANY_DEPARTMENT:
+        return ""
+    if department is None:
+        return " AND e.department_id IS NULL"
+    params.append(department.pk)
+    return " AND e.department_id = %s"
+
+
+def _sqlite_search(connection, tokens, object_types, department, limit):
+    # her kelime ön ek olarak aranır: "cse"* AND "yazilim"*
+    # indeksle aynı şekilde ı/İ --> i (bkz. migration 0008)
+    match = ' AND '.join(f'"{token.replace("ı", "i").replace("İ", "i")}"*' for token in tokens)
+    sql = (
+        f"SELECT e.id, bm25({FTS_TABLE}, 10.0, 1.0) AS rank "
+        f"FROM {FTS_TABLE} JOIN course_management_searchentry e ON e.id = {FTS_TABLE}.rowid "
+        f"WHERE {FTS_TABLE} MATCH %s"
+    )
+    params = [match]
+    if object_types:
+        sql += f" AND e.object_type IN ({', '.join(['%s'] * len(object_types))})"
+        params += list(object_types)
+    sql += _department_sql(department, params)
+    # bm25 küçük değer = daha iyi eşleşme
+    sql += " ORDER BY rank LIMIT %s"
+    params.append(limit)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [(row[0], -row[1]) for row in cursor.fetchall()]
+
+
+def _postgresql_search(connection, tokens, object_types, department, limit):
+    tsquery = ' & '.join(f"{token}:*" for token in tokens)
+    sql = (
+        "SELECT e.id, ts_rank(e.search_vector, q) AS rank "
+        "FROM course_management_searchentry e, to_tsquery('simple', %s) q "
+        "WHERE e.search_vector @@ q"
+    )
+    params = [tsquery]
+    if object_types:
+        sql += " AND e.object_type = ANY(%s)"
+        params.append(list(object_types))
+    sql += _department_sql(department, params)
+    sql += " ORDER BY rank DESC LIMIT %s"
+    params.append(limit)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [(row[0], row[1]) for row in cursor.fetchall()]
+
+
+def _fallback_search(tokens, object_types, department, limit):
+    # başka bir veritabanı için tam indeks yok, basit eşleşme
+    entries = SearchEntry.objects.all()
+    for token in tokens:
+        entries = entries.filter(Q(title__icontains=token) | Q(body__icontains=token))
+    if object_types:
+        entries = entries.filter(object_type__in=object_types)
+    if department is not ANY_DEPARTMENT:
+        entries = entries.filter(department=department)
+    return [(entry_id, 0.0) for entry_id in entries.order_by('title').values_list('id', flat=True)[:limit]]
+
+
+def search(query, object_types=None, limit=20, department=ANY_DEPARTMENT):
+    """
+    indekste sıralı arama yap
+    department verilirse sadece o bölümün kayıtları (None --> bölümü olmayanlar)
+    [(SearchEntry, skor), ...] döner, skor büyük olan daha iyi eşleşme
+    """
+    tokens = _tokens(query)
+    if not tokens:
+        return []
+
+    # bölüm veritabanları kullanılıyorsa indeks geçerli bölümün veritabanındadır
+    connection = connections[router.db_for_read(SearchEntry)]
+    if connection.vendor == 'sqlite':
+        ranked = _sqlite_search(connection, tokens, object_types, department, limit)
+    elif connection.vendor == 'postgresql':
+        ranked = _postgresql_search(connection, tokens, object_types, department, limit)
+    else:
+        ranked = _fallback_search(tokens, object_types, department, limit)
+
+    entries = SearchEntry.objects.in_bulk([entry_id for entry_id, _ in ranked])
+    return [(entries[entry_id], score) for entry_id, score in ranked if entry_id in entries]
@@ -1,7 +1,12 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete, m2m_changed
 from django.dispatch import receiver
 from django.contrib.auth.models import User
-from .models import Profile
+from .models import Profile, Course, LearningOutcome, ProgramOutcome, Grade, EvaluationComponent, Term, Department
+from . import search
+from .reports import invalidate_department_report
+from . import changefeed
+from . import tenancy
+from . import live
 
 
 @receiver(post_save, sender=User)
@@ -15,3 +20,168 @@ def create_or_update_user_profile(sender, instance, created, **kwargs):
         # bölüm başkanı veya hoca ise admin panelinden değiştir
         Profile.objects.create(user=instance, role='student')
     instance.profile.save()
+
+
+# arama indeksini kayıt kayıt güncel tut
+# toplu işlemler sinyal tetiklemez --> gerekirse reindex_search komutu çalıştırılır
+
+# bu alanlar değişmediyse kaydı yeniden indekslemeye gerek yok
+SEARCH_FIELDS = {'username', 'first_name', 'last_name', 'code', 'description'}
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=ProgramOutcome)
+def update_search_index(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        # fixture yüklenirken indekse dokunma
+        return
+    if update_fields is not None and not SEARCH_FIELDS & set(update_fields):
+        # örn: girişte sadece last_login güncellenir, indekse gerek yok
+        return
+    search.index_object(instance)
+
+
+@receiver(post_save, sender=Profile)
+def update_user_search_department(sender, instance, raw=False, **kwargs):
+    """kullanıcının bölümü değiştiyse arama kaydındaki bölümü de güncelle"""
+    if raw:
+        return
+    if instance.department_id != getattr(instance, '_loaded_department_id', None):
+        search.index_object(instance.user)
+        instance._loaded_department_id = instance.department_id
+
+
+@receiver(post_save, sender=Course)
+def update_course_search_index(sender, instance, created=False, raw=False, **kwargs):
+    if raw:
+        return
+    search.index_object(instance)
+    # öğrenim çıktılarının başlığında ders kodu var, sadece kod veya bölüm değiştiyse güncelle
+    search_key = (instance.course_code, instance.department_id)
+    if not created and search_key != getattr(instance, '_loaded_search_key', None):
+        search.reindex_course_outcomes(instance)
+    instance._loaded_search_key = search_key
+
+
+@receiver(post_save, sender=LearningOutcome)
+def update_outcome_search_index(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    search.index_object(instance)
+
+
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=Course)
+@receiver(post_delete, sender=LearningOutcome)
+@receiver(post_delete, sender=ProgramOutcome)
+def remove_from_search_index(sender, instance, **kwargs):
+    search.remove_object(instance)
+
+
+# bölüm raporu önbelleği --> not, bileşen veya ders kaydı değişince sil
+# toplu not kayıtları (gradebook.save_grade_cells) raporu kendisi siler
+
+@receiver(post_save, sender=Grade)
+@receiver(post_delete, sender=Grade)
+@receiver(post_save, sender=EvaluationComponent)
+@receiver(post_delete, sender=EvaluationComponent)
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+def invalidate_report_on_change(sender, **kwargs):
+    invalidate_department_report()
+
+
+@receiver(m2m_changed, sender=Course.students.through)
+def invalidate_report_on_enrollment(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate_department_report()
+
+
+# değişiklik akışı --> dış sistemler (öğrenci bilgi sistemi) sadece değişenleri çeker
+# toplu işlemler akışa kendileri yazar (gradebook, archive, rollover, admin)
+
+CHANGEFEED_MODELS = {
+    Grade: 'grade',
+    Course: 'course',
+    LearningOutcome: 'learning_outcome',
+    ProgramOutcome: 'program_outcome',
+}
+
+
+@receiver(post_save, sender=Grade)
+@receiver(post_save, sender=Course)
+@receiver(post_save, sender=LearningOutcome)
+@receiver(post_save, sender=ProgramOutcome)
+def record_change_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        # loaddata ile gelen satırlar akışa yazılmaz
+        return
+    changefeed.record(CHANGEFEED_MODELS[sender], [instance.pk])
+
+
+@receiver(post_delete, sender=Grade)
+@receiver(post_delete, sender=Course)
+@receiver(post_delete, sender=LearningOutcome)
+@receiver(post_delete, sender=ProgramOutcome)
+def record_change_on_delete(sender, instance, **kwargs):
+    changefeed.record(CHANGEFEED_MODELS[sender], [instance.pk], action='delete')
+
+
+@receiver(m2m_changed, sender=Course.students.through)
+def record_enrollment_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear':
+        # temizlenmeden önce mevcut kayıtları al
+        if reverse:
+            pairs = [(course_id, instance.pk) for course_id in instance.enrolled_courses.values_list('id', flat=True)]
+        else:
+            pairs = [(instance.pk, student_id) for student_id in instance.students.values_list('id', flat=True)]
+        change = 'delete'
+    elif action in ('post_add', 'post_remove'):
+        # reverse --> user.enrolled_courses.add(course)
+        if reverse:
+            pairs = [(course_id, instance.pk) for course_id in pk_set]
+        else:
+            pairs = [(instance.pk, student_id) for student_id in pk_set]
+        change = 'upsert' if action == 'post_add' else 'delete'
+    else:
+        return
+    changefeed.record('enrollment', [changefeed.enrollment_key(c, s) for c, s in pairs], action=change)
+
+
+# canlı not defteri --> tek tek kaydedilen/silinen notları dersin kanalına yayınla
+# not defterinin toplu kaydı (gradebook.save_grade_cells) kendisi yayınlar
+
+@receiver(post_save, sender=Grade)
+@receiver(post_delete, sender=Grade)
+def publish_grade_change(sender, instance, signal, raw=False, **kwargs):
+    if raw:
+        return
+    try:
+        course_id = instance.component.course_id
+    except EvaluationComponent.DoesNotExist:
+        # bileşen de siliniyor, not defterinde gösterilecek hücre kalmadı
+        return
+    live.publish_grades(
+        course_id, [instance], deleted=signal is post_delete, using=instance._state.db
+    )
+
+
+# bölüm veritabanları kullanılıyorsa paylaşılan satırları oraya da kopyala (bkz. routers.py)
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=Term)
+@receiver(post_save, sender=Department)
+def replicate_shared_row(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        # her girişte kopyalamaya gerek yok
+        return
+    tenancy.replicate(instance)
+
+
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=Term)
+@receiver(post_delete, sender=Department)
+def delete_replicated_row(sender, instance, **kwargs):
+    tenancy.replicate_delete(instance)
@@ -0,0 +1,60 @@
+import gzip
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+# brotli opsiyonel --> kurulu değilse sadece gzip üretilir
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    collectstatic sırasında dosyaları parmak izli (hash'li) isimlerle kopyalar,
+    staticfiles.json manifestini yazar ve metin dosyalarının .gz / .br
+    sürümlerini önceden üretir --> sunucu istek anında sıkıştırma yapmaz
+    """
+    compress_extensions = ('.css', '.js', '.svg', '.txt', '.json', '.map', '.xml', '.html')
+    # manifestte olmayan dosya için hata verme (bkz. stored_name)
+    manifest_strict = False
+
+    def stored_name(self, name):
+        """
+        dosyanın parmak izli adı
+        collectstatic henüz çalışmadıysa (manifest yok veya dosya eklenmiş) sayfa
+        render edilirken hata vermek yerine parmak izsiz ad kullanılır
+        """
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            return name
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+
+        # hem orijinal hem hash'li isimleri sıkıştır
+        names = set(self.hashed_files) | set(self.hashed_files.values())
+        for name in sorted(names):
+            if name.endswith(self.compress_extensions) and self.exists(name):
+                self._write_compressed(name)
+
+    def _write_compressed(self, name):
+        with self.open(name) as original:
+            content = original.read()
+
+        variants = [('.gz', gzip.compress(content, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            variants.append(('.br', brotli.compress(content)))
+
+        for suffix, compressed in variants:
+            # sıkıştırma işe yaramıyorsa dosya yazma
+            if len(compressed) >= len(content):
+                continue
+            compressed_name = name + suffix
+            if self.exists(compressed_name):
+                self.delete(compressed_name)
+            self._save(compressed_name, ContentFile(compressed))
@@ -0,0 +1,135 @@
+"""
+çok bölümlü kurulum
+
+isteği yapan kullanıcının bölümü DepartmentMiddleware ile "geçerli bölüm" olarak
+işaretlenir. görünümler ve formlar verileri bu bölüme göre süzer, isteğe bağlı
+DepartmentRouter ise bölüm verilerini bölümün kendi veritabanına yönlendirir.
+
+istek dışında (yönetim komutları, cron) geçerli bölüm DEPARTMENT ortam
+değişkeninden okunur:
+    DEPARTMENT=CSE python manage.py archive_term 2024-GUZ
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+
+# async görünümlerde de doğru çalışsın diye thread-local yerine ContextVar
+# _UNSET --> ayarlanmamış (ortam değişkenine bak), None --> bölümü olmayan veriler
+_UNSET = object()
+_current_department = ContextVar('current_department', default=_UNSET)
+
+_env_department = None
+
+
+def _department_from_env():
+    global _env_department
+    code = os.environ.get('DEPARTMENT')
+    if not code:
+        return None
+    if _env_department is None or _env_department.code != code:
+        from .models import Department
+        _env_department = Department.objects.using('default').get(code=code)
+    return _env_department
+
+
+def get_current_department():
+    """geçerli bölüm (Department) veya None"""
+    department = _current_department.get()
+    if department is _UNSET:
+        department = _department_from_env()
+    return department
+
+
+def set_current_department(department):
+    """token döner, reset_current_department(token) ile eski haline getirilir"""
+    return _current_department.set(department)
+
+
+def reset_current_department(token):
+    _current_department.reset(token)
+
+
+@contextmanager
+def department_context(department):
+    token = set_current_department(department)
+    try:
+        yield department
+    finally:
+        reset_current_department(token)
+
+
+def database_for(department):
+    """bölümün veritabanı alias'ı, DEPARTMENT_DATABASES'te yoksa default"""
+    if department is None:
+        return 'default'
+    return getattr(settings, 'DEPARTMENT_DATABASES', {}).get(department.code, 'default')
+
+
+def department_databases():
+    """default dışındaki bölüm veritabanları"""
+    return sorted(set(getattr(settings, 'DEPARTMENT_DATABASES', {}).values()) - {'default'})
+
+
+def for_each_department(func, departments, max_workers=None):
+    """
+    func(department) her bölüm için ayrı bir thread'de, o bölüm geçerli bölümken çalışır
+    bölümler farklı veritabanlarındaysa sorgular paralel yürür
+    [(department, sonuç), ...] döner (sıra korunur)
+    """
+    departments = list(departments)
+    if not departments:
+        return []
+
+    def run(department):
+        try:
+            with department_context(department):
+                return func(department)
+        finally:
+            # her thread kendi bağlantısını açar, thread bitince kapat
+            connections.close_all()
+
+    max_workers = max_workers or min(len(departments), 8)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        results = list(pool.map(run, departments))
+    return list(zip(departments, results))
+
+
+def database_departments():
+    """
+    her veritabanı için bir temsilci bölüm (default için None)
+    tüm veritabanlarında çalışması gereken toplu işlemler bunun üzerinde döner
+    """
+    from .models import Department
+
+    databases = getattr(settings, 'DEPARTMENT_DATABASES', {})
+    representatives = {'default': None}
+    for department in Department.objects.using('default').filter(code__in=databases.keys()).order_by('code'):
+        representatives.setdefault(database_for(department), department)
+    return list(representatives.values())
+
+
+def replicate(instance):
+    """
+    paylaşılan bir satırı (kullanıcı, dönem, bölüm) bölüm veritabanlarına kopyala
+    bölüm verisindeki yabancı anahtarlar bu satırları gösterir
+    """
+    aliases = department_databases()
+    if not aliases:
+        return
+    model = type(instance)
+    values = {f.attname: getattr(instance, f.attname) for f in model._meta.concrete_fields if not f.primary_key}
+    for alias in aliases:
+        manager = model._base_manager.using(alias)
+        # save() sinyal tetikler (örn. profil oluşturma), update/bulk_create tetiklemez
+        if not manager.filter(pk=instance.pk).update(**values):
+            manager.bulk_create([model(pk=instance.pk, **values)])
+
+
+def replicate_delete(instance):
+    """silinen paylaşılan satırı bölüm veritabanlarından da sil"""
+    for alias in department_databases():
+        type(instance)._base_manager.using(alias).filter(pk=instance.pk).delete()
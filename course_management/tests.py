@@ -1 +1,1283 @@
-from django.test import TestCase
+import asyncio
+import json
+import tempfile
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import CommandError, call_command
+from django.db import connection, transaction
+from django.http import HttpResponse
+from django.test import AsyncClient, RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from . import changefeed, live, loadtest, profiling, search, warmup
+from .archive import ArchiveError, archive_term
+from .backends import ProfileModelBackend
+from .forms import EvaluationComponentAdminForm
+from .middleware import GZipHTMLMiddleware
+from .models import (
+    ArchivedGrade, ChangeLog, Course, Department, EvaluationComponent, Grade, GradeNotification, LearningOutcome,
+    ProgramOutcome, SearchEntry, Term,
+)
+from .notifications import MAX_ATTEMPTS, queue_notifications, send_pending_notifications
+from .projections import _required_score, project_course
+from .reports import build_department_report, get_department_report
+from .rollover import rollover_courses
+from .tenancy import database_departments
+from .validation import check_grade_rows
+
+class FailingEmailBackend(BaseEmailBackend):
+    """her gönderimde hata veren e-posta backend'i"""
+
+    def send_messages(self, email_messages):
+        raise ConnectionError('SMTP bağlantısı kurulamadı')
+
+
+def make_user(username, role='student', department=None, **fields):
+    """rolü ve bölümü ayarlanmış kullanıcı, profil sinyalle oluşur (parolasız, force_login ile girilir)"""
+    user = User.objects.create_user(username, **fields)
+    if role != 'student' or department is not None:
+        user.profile.role = role
+        user.profile.department = department
+        user.profile.save()
+    return user
+
+
+def make_term(code, days_ago=30, **fields):
+    """bitişi days_ago gün önce olan dönem (days_ago < 0 --> henüz bitmemiş)"""
+    end_date = timezone.localdate() - timedelta(days=days_ago)
+    return Term.objects.create(code=code, name=code, start_date=end_date - timedelta(days=120),
+                               end_date=end_date, **fields)
+
+
+class GradebookTests(TestCase):
+    def setUp(self):
+        self.instructor = make_user('hoca', role='instructor')
+        self.course = Course.objects.create(course_code='CSE311', course_name='Yazılım Mühendisliği')
+        self.course.instructors.add(self.instructor)
+        self.midterm = EvaluationComponent.objects.create(course=self.course, name='Vize', percentage=40)
+        self.final = EvaluationComponent.objects.create(course=self.course, name='Final', percentage=60)
+        # soyadı sırası öğrenci sırasıyla aynı
+        self.students = [
+            make_user(f'ogrenci{i}', first_name='Öğrenci', last_name=f'Soyad{i:02d}') for i in range(30)
+        ]
+        self.course.students.add(*self.students)
+        self.url = reverse('manage_course', kwargs={'course_id': self.course.id})
+        self.client.force_login(self.instructor)
+
+    def grade(self, student, component, score):
+        return Grade.objects.create(student=student, component=component, score=Decimal(score))
+
+    def row_students(self, response):
+        return [row['student_object'] for row in response.context['student_grade_rows']]
+
+    def test_paginates_students(self):
+        response = self.client.get(self.url, {'per_page': 25})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['student_total'], 30)
+        self.assertEqual(self.row_students(response), self.students[:25])
+
+        response = self.client.get(self.url, {'per_page': 25, 'page': 2})
+        self.assertEqual(self.row_students(response), self.students[25:])
+
+    def test_unknown_page_size_falls_back_to_default(self):
+        response = self.client.get(self.url, {'per_page': 7})
+        self.assertEqual(response.context['per_page'], 50)
+        self.assertEqual(len(self.row_students(response)), 30)
+
+    def test_sort_by_weighted_score(self):
+        self.grade(self.students[3], self.midterm, '100')   # 40
+        self.grade(self.students[7], self.final, '90')      # 54
+        self.grade(self.students[9], self.midterm, '10')    # 4
+        response = self.client.get(self.url, {'sort': 'score', 'dir': 'desc', 'per_page': 25})
+        self.assertEqual(self.row_students(response)[:3], [self.students[7], self.students[3], self.students[9]])
+
+    def test_missing_only(self):
+        for student in self.students[:28]:
+            self.grade(student, self.midterm, '50')
+            self.grade(student, self.final, '50')
+        self.grade(self.students[28], self.midterm, '50')
+        response = self.client.get(self.url, {'missing': '1'})
+        self.assertEqual(self.row_students(response), self.students[28:])
+        self.assertEqual(response.context['student_total'], 2)
+
+    def test_page_cost_does_not_depend_on_section_size(self):
+        def count_queries():
+            with CaptureQueriesContext(connection) as queries:
+                self.client.get(self.url, {'per_page': 25})
+            return len(queries)
+
+        before = count_queries()
+        more = [make_user(f'ek{i}', last_name=f'Zz{i:02d}') for i in range(40)]
+        self.course.students.add(*more)
+        for student in more:
+            self.grade(student, self.midterm, '70')
+        self.assertEqual(count_queries(), before)
+
+    def test_submit_saves_only_posted_cells(self):
+        other = self.grade(self.students[1], self.midterm, '30')
+        query = 'sort=name&page=1&per_page=25'
+        response = self.client.post(f'{self.url}?{query}', {
+            'submit_grades': '1',
+            f'grade_{self.students[0].id}_{self.midterm.id}': '85.5',
+            f'grade_{self.students[0].id}_{self.final.id}': '',
+        })
+        self.assertRedirects(response, f'{self.url}?{query}')
+        self.assertEqual(
+            list(Grade.objects.filter(student=self.students[0]).values_list('component_id', 'score')),
+            [(self.midterm.id, Decimal('85.50'))],
+        )
+        other.refresh_from_db()
+        self.assertEqual(other.score, Decimal('30'))
+
+    def test_submit_clears_and_updates_existing_cells(self):
+        grade = self.grade(self.students[0], self.midterm, '40')
+        self.client.post(self.url, {
+            'submit_grades': '1',
+            f'grade_{self.students[0].id}_{self.midterm.id}': '',
+        })
+        grade.refresh_from_db()
+        self.assertIsNone(grade.score)
+
+    def test_other_instructor_gets_404(self):
+        self.client.force_login(make_user('baska_hoca', role='instructor'))
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+
+class ArchiveTermTests(TestCase):
+    def setUp(self):
+        self.term = make_term('2024-GUZ')
+        self.course = Course.objects.create(course_code='CSE311', course_name='Yazılım Mühendisliği', term=self.term)
+        self.students = [make_user(f'ogrenci{i}', last_name=f'Soyad{i}') for i in range(3)]
+        self.course.students.add(*self.students)
+        components = [
+            EvaluationComponent.objects.create(course=self.course, name='Vize', percentage=40),
+            EvaluationComponent.objects.create(course=self.course, name='Final', percentage=60),
+        ]
+        self.grades = [
+            Grade.objects.create(student=student, component=component, score=Decimal('70'))
+            for student in self.students for component in components
+        ]
+
+    def test_archive(self):
+        self.assertEqual(archive_term(self.term, batch_size=4), (6, 3))
+
+        self.term.refresh_from_db()
+        self.assertTrue(self.term.is_archived)
+        self.assertFalse(Grade.objects.exists())
+        self.assertFalse(EvaluationComponent.objects.exists())
+        self.assertEqual(self.course.students.count(), 0)
+        self.assertEqual(ArchivedGrade.objects.filter(term=self.term).count(), 6)
+        self.assertEqual(
+            set(ArchivedGrade.objects.values_list('component_name', 'component_percentage')),
+            {('Vize', 40), ('Final', 60)},
+        )
+
+    def test_refuses_open_or_archived_term(self):
+        self.term.is_active = True
+        self.term.save()
+        with self.assertRaises(ArchiveError):
+            archive_term(self.term)
+
+        self.term.is_active = False
+        self.term.is_archived = True
+        self.term.save()
+        with self.assertRaises(ArchiveError):
+            archive_term(self.term)
+        self.assertEqual(Grade.objects.count(), 6)
+
+    def test_command(self):
+        make_term('2025-BAHAR', days_ago=-30)   # bitmemiş dönem atlanır
+        out = StringIO()
+        call_command('archive_term', '--all-closed', stdout=out)
+        self.assertIn('2024-GUZ: 6 not ve 3 ders kaydı arşivlendi.', out.getvalue())
+        self.assertEqual(list(Term.objects.filter(is_archived=True).values_list('code', flat=True)), ['2024-GUZ'])
+
+        with self.assertRaises(CommandError):
+            call_command('archive_term', 'YOK', stdout=StringIO())
+
+    def test_archive_views(self):
+        archive_term(self.term)
+
+        self.client.force_login(make_user('baskan', role='department_head'))
+        response = self.client.get(reverse('archive_term_list'))
+        self.assertEqual(response.context['term_rows'][0]['courses'], [self.course])
+        self.assertEqual(response.context['term_rows'][0]['term'].enrollment_count, 3)
+
+        response = self.client.get(reverse('archive_course_detail', kwargs={'course_id': self.course.id}))
+        self.assertEqual(response.context['component_columns'], [('Final', 60), ('Vize', 40)])
+        self.assertEqual(
+            [(row['student_object'], row['scores']) for row in response.context['rows']],
+            [(student, [Decimal('70'), Decimal('70')]) for student in self.students],
+        )
+
+        self.client.force_login(self.students[0])
+        response = self.client.get(reverse('student_archive'))
+        [archived] = response.context['archived_terms']
+        self.assertEqual(archived['term'], self.term)
+        self.assertEqual(archived['course_data'][0]['final_grade'], Decimal('70.00'))
+
+    def test_archive_course_detail_requires_archived_term(self):
+        self.client.force_login(make_user('baskan', role='department_head'))
+        response = self.client.get(reverse('archive_course_detail', kwargs={'course_id': self.course.id}))
+        self.assertEqual(response.status_code, 404)
+
+    def test_dashboards_show_active_term_only(self):
+        active = make_term('2025-GUZ', days_ago=-60, is_active=True)
+        current = Course.objects.create(course_code='CSE312', course_name='Veritabanı', term=active)
+        legacy = Course.objects.create(course_code='CSE100', course_name='Dönemsiz Ders')
+        instructor = make_user('hoca', role='instructor')
+        for course in (self.course, current, legacy):
+            course.instructors.add(instructor)
+
+        self.client.force_login(instructor)
+        response = self.client.get(reverse('instructor_dashboard'))
+        self.assertEqual(response.context['courses'], [legacy, current])
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        self.department = Department.objects.create(code='CSE', name='Bilgisayar Mühendisliği')
+        self.course = Course.objects.create(course_code='CSE311', course_name='Veritabanı Sistemleri',
+                                            department=self.department)
+        self.outcome = LearningOutcome.objects.create(course=self.course, description='İlişkisel veritabanı tasarlar')
+
+    def results(self, query, **kwargs):
+        return [(entry.object_type, entry.object_id) for entry, _ in search.search(query, **kwargs)]
+
+    def test_index_follows_saves_and_deletes(self):
+        self.assertEqual(self.results('CSE311', object_types=['course']), [('course', self.course.id)])
+        student = make_user('ayse', first_name='Ayşe', last_name='Yılmaz', department=self.department)
+        self.assertEqual(self.results('ayşe yılmaz'), [('user', student.id)])
+
+        self.course.course_name = 'Bilgisayar Ağları'
+        self.course.save()
+        self.assertEqual(self.results('ağları'), [('course', self.course.id)])
+
+        self.outcome.delete()
+        self.assertEqual(self.results('ilişkisel'), [])
+
+    def test_title_matches_rank_first(self):
+        # başlıkta geçen kelime içerikte geçenden önce gelir, ı/i farkı aranmaz
+        self.assertEqual(
+            self.results('veritabani'),
+            [('course', self.course.id), ('learning_outcome', self.outcome.id)],
+        )
+
+    def test_course_code_change_updates_outcome_titles(self):
+        self.course.course_code = 'CSE411'
+        self.course.save()
+        entry = SearchEntry.objects.get(object_type='learning_outcome', object_id=self.outcome.id)
+        self.assertEqual(entry.title, f'CSE411 - Öğrenim Çıktısı #{self.outcome.id}')
+
+    def test_name_change_does_not_touch_outcomes(self):
+        def save_queries():
+            course = Course.objects.get(pk=self.course.pk)
+            course.course_name = course.course_name + '!'
+            with CaptureQueriesContext(connection) as queries:
+                course.save()
+            return len(queries)
+
+        before = save_queries()
+        for i in range(10):
+            LearningOutcome.objects.create(course=self.course, description=f'çıktı {i}')
+        self.assertEqual(save_queries(), before)
+
+    def test_department_filter(self):
+        other = Department.objects.create(code='EEE', name='Elektrik')
+        other_course = Course.objects.create(course_code='EEE311', course_name='Veritabanı', department=other)
+        self.assertEqual(self.results('veritabani', object_types=['course'], department=other),
+                         [('course', other_course.id)])
+
+    def test_reindex_command(self):
+        # toplu işlemler indeksi atlar, komut baştan kurar
+        ProgramOutcome.objects.bulk_create([ProgramOutcome(code='PO-1', description='Takım çalışması',
+                                                           department=self.department)])
+        self.assertEqual(self.results('takım'), [])
+        out = StringIO()
+        call_command('reindex_search', stdout=out)
+        self.assertIn('kayıt indekslendi', out.getvalue())
+        self.assertEqual(len(self.results('takım')), 1)
+        self.assertEqual(self.results('CSE311', object_types=['course']), [('course', self.course.id)])
+
+    def test_search_api(self):
+        self.client.force_login(make_user('baskan', role='department_head', department=self.department))
+        response = self.client.get(reverse('search_api'), {'q': 'veritabanı', 'type': 'course'})
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual([(r['type'], r['id']) for r in results], [('course', self.course.id)])
+        self.assertGreater(results[0]['score'], 0)
+
+        self.client.force_login(make_user('ogrenci'))
+        self.assertEqual(self.client.get(reverse('search_api'), {'q': 'x'}).status_code, 403)
+
+
+class DepartmentReportTests(TestCase):
+    def setUp(self):
+        self.course = Course.objects.create(course_code='CSE311', course_name='Yazılım Mühendisliği')
+        self.midterm = EvaluationComponent.objects.create(course=self.course, name='Vize', percentage=40)
+        self.final = EvaluationComponent.objects.create(course=self.course, name='Final', percentage=60)
+        self.students = [make_user(f'ogrenci{i}') for i in range(4)]
+        self.course.students.add(*self.students)
+        # ağırlıklı ortalamalar: 100, 70, 40 (sadece vize girilmiş), dördüncü öğrencinin notu yok
+        for student, (midterm, final) in zip(self.students, [(100, 100), (70, 70), (100, None)]):
+            Grade.objects.create(student=student, component=self.midterm, score=midterm)
+            if final is not None:
+                Grade.objects.create(student=student, component=self.final, score=final)
+        # derse kayıtlı olmayan öğrencinin notu sayılmaz
+        Grade.objects.create(student=make_user('kayitsiz'), component=self.final, score=0)
+
+    def test_report(self):
+        [row] = build_department_report()
+        self.assertEqual(row['enrollment'], 4)
+        self.assertEqual(row['component_count'], 2)
+        self.assertEqual(row['total_weight'], 100)
+        self.assertEqual((row['graded_cells'], row['expected_cells']), (5, 8))
+        self.assertEqual(row['completion_rate'], 62.5)
+        self.assertEqual(row['graded_students'], 3)
+        self.assertEqual(row['mean_final'], Decimal('70.00'))
+        self.assertEqual(row['median_final'], Decimal('70.00'))
+        self.assertEqual(row['histogram']['AA'], 1)
+        self.assertEqual(row['histogram']['CC'], 1)
+        self.assertEqual(row['histogram']['FF'], 1)
+
+    def test_query_count_does_not_depend_on_course_count(self):
+        with self.assertNumQueries(4):
+            build_department_report()
+        for i in range(5):
+            course = Course.objects.create(course_code=f'CSE4{i}', course_name='Seçmeli')
+            course.students.add(*self.students)
+            EvaluationComponent.objects.create(course=course, name='Proje', percentage=100)
+        with self.assertNumQueries(4):
+            self.assertEqual(len(build_department_report()), 6)
+
+    def test_cached_until_grade_write(self):
+        first = get_department_report()
+        with self.assertNumQueries(0):
+            self.assertEqual(get_department_report(), first)
+
+        Grade.objects.create(student=self.students[3], component=self.midterm, score=0)
+        self.assertEqual(get_department_report()[0]['graded_cells'], 6)
+
+    def test_report_api(self):
+        self.client.force_login(make_user('baskan', role='department_head'))
+        response = self.client.get(reverse('department_report_api'))
+        self.assertEqual(response.status_code, 200)
+        [row] = response.json()['courses']
+        self.assertEqual(row['course_code'], 'CSE311')
+        self.assertEqual(row['mean_final'], '70.00')
+
+        response = self.client.get(reverse('department_report'))
+        self.assertContains(response, 'CSE311')
+
+        self.client.force_login(self.students[0])
+        self.assertEqual(self.client.get(reverse('department_report_api')).status_code, 403)
+
+
+class LoadTestTests(TestCase):
+    def test_seed_data(self):
+        instructors, students = loadtest.seed_data(student_count=5, course_count=2, students_per_course=3)
+        self.assertEqual(len(instructors), 2)
+        self.assertEqual(len(students), 5)
+        self.assertTrue(User.objects.get(username=students[0]).check_password(loadtest.SEED_PASSWORD))
+        self.assertEqual(User.objects.get(username=instructors[0]).profile.role, 'instructor')
+        for course in Course.objects.filter(course_code__startswith='LT'):
+            self.assertEqual(course.students.count(), 3)
+            self.assertEqual(course.instructors.count(), 1)
+            self.assertEqual(sum(c.percentage for c in EvaluationComponent.objects.filter(course=course)), 100)
+        self.assertEqual(Grade.objects.count(), 2 * 3 * 2)
+
+    def test_error_rate_counts_exceptions_and_unexpected_status(self):
+        def fail():
+            raise OSError
+
+        stats = loadtest.Stats()
+        stats.timed('dashboard', lambda: (200, b'', None))
+        stats.timed('dashboard', lambda: (500, b'', None))
+        stats.timed('dashboard', fail)
+        stats.timed('dashboard', lambda: (302, b'', None), expect=(302,))
+
+        [row] = stats.summary(elapsed=2)
+        self.assertEqual(row['count'], 3)
+        self.assertEqual(row['errors'], 2)
+        self.assertEqual(row['error_rate'], 50.0)
+        self.assertEqual(row['throughput'], 1.5)
+
+    def test_percentile(self):
+        samples = [i / 1000 for i in range(1, 101)]
+        self.assertAlmostEqual(loadtest._percentile(samples, 50), 50)
+        self.assertAlmostEqual(loadtest._percentile(samples, 99), 99)
+        self.assertEqual(loadtest._percentile([], 95), 0.0)
+
+
+class SessionTests(TestCase):
+    def test_backend_loads_profile_with_user(self):
+        student = make_user('ogrenci')
+        with self.assertNumQueries(1):
+            user = ProfileModelBackend().get_user(student.pk)
+            self.assertEqual(user.profile.role, 'student')
+
+    def test_session_from_old_backend_still_valid(self):
+        # deploy öncesi ModelBackend ile açılmış oturumlar düşmemeli
+        self.client.force_login(make_user('ogrenci'), backend='django.contrib.auth.backends.ModelBackend')
+        self.assertEqual(self.client.get(reverse('student_dashboard')).status_code, 200)
+
+    def test_expire_sessions(self):
+        now = timezone.now()
+        for i in range(3):
+            Session.objects.create(session_key=f'eski{i}', session_data='', expire_date=now - timedelta(days=1))
+        Session.objects.create(session_key='yeni', session_data='', expire_date=now + timedelta(days=1))
+
+        out = StringIO()
+        call_command('expire_sessions', batch_size=2, stdout=out)
+        self.assertIn('3 süresi dolmuş oturum silindi.', out.getvalue())
+        self.assertEqual(list(Session.objects.values_list('session_key', flat=True)), ['yeni'])
+
+    @override_settings(SESSION_ENGINE='django.contrib.sessions.backends.signed_cookies')
+    def test_expire_sessions_with_cookie_sessions(self):
+        out = StringIO()
+        call_command('expire_sessions', stdout=out)
+        self.assertIn('silinecek kayıt yok', out.getvalue())
+
+
+MANIFEST_STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'course_management.storage.CompressedManifestStaticFilesStorage'},
+}
+
+
+class CompressionTests(TestCase):
+    def compress(self, body, content_type='text/html'):
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip')
+        middleware = GZipHTMLMiddleware(lambda request: HttpResponse(body, content_type=content_type))
+        return middleware(request)
+
+    @override_settings(GZIP_MIN_SIZE=1024)
+    def test_threshold(self):
+        self.assertFalse(self.compress('a' * 1000).has_header('Content-Encoding'))
+        self.assertEqual(self.compress('a' * 2000)['Content-Encoding'], 'gzip')
+
+    @override_settings(GZIP_MIN_SIZE=1024)
+    def test_only_html_and_json(self):
+        self.assertEqual(self.compress('{}' * 1000, 'application/json')['Content-Encoding'], 'gzip')
+        self.assertFalse(self.compress('a' * 2000, 'text/css').has_header('Content-Encoding'))
+
+
+class StaticFilesTests(TestCase):
+    def setUp(self):
+        self.static_root = self.enterContext(tempfile.TemporaryDirectory())
+        self.enterContext(override_settings(STATIC_ROOT=self.static_root, STORAGES=MANIFEST_STORAGES,
+                                            SERVE_STATIC=True))
+
+    def test_pages_render_before_collectstatic(self):
+        self.assertEqual(staticfiles_storage.url('css/base.css'), '/static/css/base.css')
+        self.client.force_login(make_user('ogrenci'))
+        self.assertContains(self.client.get(reverse('student_dashboard')), '/static/css/base.css')
+
+    def test_serves_precompressed_hashed_files(self):
+        call_command('collectstatic', interactive=False, verbosity=0)
+        hashed = staticfiles_storage.stored_name('css/base.css')
+        self.assertNotEqual(hashed, 'css/base.css')
+
+        response = self.client.get('/static/' + hashed, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertIn('Accept-Encoding', response['Vary'])
+        response.close()
+
+        response = self.client.get('/static/css/base.css')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertNotIn('immutable', response['Cache-Control'])
+        response.close()
+
+
+class AdminActionTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'parola'))
+        self.course = Course.objects.create(course_code='CSE101', course_name='Programlamaya Giriş')
+        self.students = [make_user(f'ogrenci{i}') for i in range(3)]
+
+    def test_changelists_render(self):
+        for model in ('profile', 'grade', 'course', 'gradenotification'):
+            response = self.client.get(reverse(f'admin:course_management_{model}_changelist'))
+            self.assertEqual(response.status_code, 200)
+
+    def test_enroll_selected_students(self):
+        self.course.students.add(self.students[0])
+        report = get_department_report()
+        self.assertEqual(report[0]['enrollment'], 1)
+
+        response = self.client.post(reverse('admin:course_management_profile_changelist'), {
+            'action': 'enroll_selected_students',
+            '_selected_action': [student.profile.pk for student in self.students],
+            'apply': '1',
+            'course': self.course.pk,
+        }, follow=True)
+        self.assertContains(response, '2 öğrenci &quot;CSE101&quot; dersine kaydedildi, 1 öğrenci zaten kayıtlıydı.')
+        self.assertEqual(self.course.students.count(), 3)
+        # bulk_create sinyal tetiklemese de rapor önbelleği temizlenir
+        self.assertEqual(get_department_report()[0]['enrollment'], 3)
+
+    def test_announce_grades(self):
+        component = EvaluationComponent.objects.create(course=self.course, name='Final', percentage=100)
+        graded = [Grade.objects.create(student=s, component=component, score=80) for s in self.students[:2]]
+        Grade.objects.create(student=self.students[2], component=component, score=None)
+
+        response = self.client.post(reverse('admin:course_management_grade_changelist'), {
+            'action': 'announce_grades',
+            '_selected_action': list(Grade.objects.values_list('pk', flat=True)),
+        }, follow=True)
+        self.assertContains(response, '2 not duyuruldu, öğrencilere bildirim gönderilecek.')
+        self.assertEqual(Grade.objects.filter(announced_at__isnull=False).count(), 2)
+        self.assertEqual(
+            set(GradeNotification.objects.values_list('student_id', flat=True)), {g.student_id for g in graded}
+        )
+
+
+class RolloverTests(TestCase):
+    def setUp(self):
+        self.source = make_term('2025-GUZ')
+        self.target = make_term('2026-BAHAR', days_ago=-120)
+        self.instructor = make_user('hoca', role='instructor')
+        for code in ('CSE101', 'CSE102', 'CSE103'):
+            course = Course.objects.create(course_code=code, course_name=code, term=self.source)
+            course.instructors.add(self.instructor)
+            course.students.add(make_user(f'ogrenci_{code}'))
+            EvaluationComponent.objects.create(course=course, name='Vize', percentage=40)
+            EvaluationComponent.objects.create(course=course, name='Final', percentage=60)
+            LearningOutcome.objects.create(course=course, description=f'{code} çıktısı')
+
+    def test_copies_components_outcomes_and_instructors(self):
+        new_courses, skipped = rollover_courses(Course.objects.filter(term=self.source), self.target)
+        self.assertEqual(skipped, [])
+        self.assertEqual(len(new_courses), 3)
+        for course in Course.objects.filter(term=self.target):
+            self.assertEqual(
+                list(EvaluationComponent.objects.filter(course=course).values_list('name', 'percentage')),
+                [('Vize', 40), ('Final', 60)],
+            )
+            self.assertEqual(course.learning_outcomes.get().description, f'{course.course_code} çıktısı')
+            self.assertEqual(list(course.instructors.all()), [self.instructor])
+            # öğrenci kayıtları kopyalanmaz
+            self.assertFalse(course.students.exists())
+        # bulk_create sinyal tetiklemese de yeni çıktılar aranabilir
+        found = {entry.object_id for entry, _ in search.search('CSE102 çıktısı', object_types=['learning_outcome'])}
+        self.assertIn(LearningOutcome.objects.get(course__term=self.target, course__course_code='CSE102').pk, found)
+
+    def test_query_count_does_not_depend_on_course_count(self):
+        with CaptureQueriesContext(connection) as three:
+            rollover_courses(Course.objects.filter(term=self.source), self.target, copy_instructors=True)
+        other = make_term('2026-YAZ', days_ago=-200)
+        for code in ('CSE104', 'CSE105'):
+            course = Course.objects.create(course_code=code, course_name=code, term=self.source)
+            EvaluationComponent.objects.create(course=course, name='Proje', percentage=100)
+        with CaptureQueriesContext(connection) as five:
+            rollover_courses(Course.objects.filter(term=self.source), other, copy_instructors=True)
+        self.assertEqual(len(five), len(three))
+
+    def test_skips_existing_codes(self):
+        Course.objects.create(course_code='CSE102', course_name='Zaten var', term=self.target)
+        new_courses, skipped = rollover_courses(Course.objects.filter(term=self.source), self.target)
+        self.assertEqual(skipped, ['CSE102'])
+        self.assertEqual(sorted(c.course_code for c in new_courses), ['CSE101', 'CSE103'])
+
+    def test_command(self):
+        out = StringIO()
+        call_command('rollover_courses', '--from', '2025-GUZ', '--to', '2026-BAHAR', '--courses', 'CSE101',
+                     '--no-instructors', stdout=out)
+        self.assertIn('1 ders 2026-BAHAR dönemine kopyalandı.', out.getvalue())
+        course = Course.objects.get(term=self.target)
+        self.assertEqual(course.course_code, 'CSE101')
+        self.assertFalse(course.instructors.exists())
+
+    def test_command_refuses_archived_source(self):
+        Term.objects.filter(pk=self.source.pk).update(is_archived=True)
+        with self.assertRaisesMessage(CommandError, 'arşivlenmiş'):
+            call_command('rollover_courses', '--from', '2025-GUZ', '--to', '2026-BAHAR')
+
+    def test_view(self):
+        self.client.force_login(make_user('baskan', role='department_head'))
+        response = self.client.post(reverse('course_rollover'), {
+            'source_term': self.source.pk,
+            'target_term': self.target.pk,
+            'course_codes': 'CSE101, CSE103',
+            'copy_instructors': 'on',
+        }, follow=True)
+        self.assertContains(response, '2 ders &quot;2026-BAHAR&quot; dönemine kopyalandı.')
+        self.assertEqual(
+            sorted(Course.objects.filter(term=self.target).values_list('course_code', flat=True)), ['CSE101', 'CSE103']
+        )
+
+        # arşivlenmiş dönem kaynak olarak seçilemez
+        Term.objects.filter(pk=self.source.pk).update(is_archived=True)
+        response = self.client.post(reverse('course_rollover'), {
+            'source_term': self.source.pk, 'target_term': self.target.pk,
+        })
+        self.assertIn('source_term', response.context['form'].errors)
+
+
+class ChangesSinceTests(TestCase):
+    def setUp(self):
+        self.student = make_user('ogrenci')
+        self.course = Course.objects.create(course_code='CSE311', course_name='Yazılım Mühendisliği')
+        self.course.students.add(self.student)
+        self.component = EvaluationComponent.objects.create(course=self.course, name='Vize', percentage=100)
+        self.cursor = changefeed.latest_cursor()
+
+    def test_latest_state_per_object(self):
+        grade = Grade.objects.create(student=self.student, component=self.component, score=Decimal('50'))
+        grade.score = Decimal('75')
+        grade.save()
+
+        changes, cursor, has_more = changefeed.changes_since(self.cursor)
+        self.assertFalse(has_more)
+        self.assertEqual(cursor, changefeed.latest_cursor())
+        self.assertEqual(len(changes), 1)
+        self.assertEqual(changes[0]['key'], str(grade.id))
+        self.assertEqual(changes[0]['action'], 'upsert')
+        self.assertEqual(changes[0]['data']['score'], '75.00')
+        self.assertEqual(changes[0]['data']['course_id'], self.course.id)
+        self.assertEqual(changefeed.changes_since(cursor), ([], cursor, False))
+
+    def test_deleted_object_is_tombstone(self):
+        grade = Grade.objects.create(student=self.student, component=self.component, score=Decimal('50'))
+        grade_id = grade.id
+        grade.delete()
+
+        changes, _, _ = changefeed.changes_since(self.cursor)
+        self.assertEqual(
+            [(change['model'], change['key'], change['action'], change['data']) for change in changes],
+            [('grade', str(grade_id), 'delete', None)],
+        )
+
+    def test_upsert_of_missing_row_is_tombstone(self):
+        # silinmesi akışa yazılmamış kayıt (örn. toplu silme) veri yerine tombstone döner
+        changefeed.record('grade', [999999])
+        changes, _, _ = changefeed.changes_since(self.cursor)
+        self.assertEqual(changes[0]['action'], 'delete')
+        self.assertIsNone(changes[0]['data'])
+
+    def test_archived_grades_are_tombstones(self):
+        term = make_term('2024-GUZ')
+        Course.objects.filter(pk=self.course.pk).update(term=term)
+        grades = [Grade.objects.create(student=make_user(f'ogrenci{i}'), component=self.component, score=70)
+                  for i in range(3)]
+        cursor = changefeed.latest_cursor()
+        archive_term(term, batch_size=2)
+
+        # her not için akışa tek silme kaydı
+        deleted = ChangeLog.objects.filter(id__gt=cursor, model='grade').values_list('object_key', 'action')
+        self.assertCountEqual(deleted, [(str(grade.id), 'delete') for grade in grades])
+
+    def test_pagination(self):
+        changefeed.record('enrollment', [changefeed.enrollment_key(self.course.id, self.student.id)])
+        changefeed.record('course', [self.course.id])
+        changefeed.record('grade', [999999])
+
+        changes, cursor, has_more = changefeed.changes_since(self.cursor, limit=2)
+        self.assertTrue(has_more)
+        self.assertEqual([change['model'] for change in changes], ['enrollment', 'course'])
+        self.assertEqual(changes[0]['data'], {'course_id': self.course.id, 'student_id': self.student.id})
+        self.assertEqual(cursor, changes[-1]['cursor'])
+
+        changes, cursor, has_more = changefeed.changes_since(cursor, limit=2)
+        self.assertFalse(has_more)
+        self.assertEqual([change['model'] for change in changes], ['grade'])
+
+    def test_api(self):
+        grade = Grade.objects.create(student=self.student, component=self.component, score=Decimal('50'))
+        self.client.force_login(make_user('personel', is_staff=True))
+
+        response = self.client.get(reverse('changes_api'), {'since': self.cursor})
+        self.assertEqual([change['key'] for change in response.json()['changes']], [str(grade.id)])
+        self.assertEqual(response.json()['next_cursor'], changefeed.latest_cursor())
+
+        response = self.client.get(reverse('changes_api'), {'since': 'abc'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'error': 'since ve limit tam sayı olmalıdır.'})
+
+        self.client.force_login(self.student)
+        self.assertEqual(self.client.get(reverse('changes_api')).status_code, 403)
+
+    def test_command(self):
+        grade = Grade.objects.create(student=self.student, component=self.component, score=Decimal('50'))
+        out = StringIO()
+        call_command('changes_since', str(self.cursor), batch_size=1, stdout=out)
+        *changes, last = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([change['key'] for change in changes], [str(grade.id)])
+        self.assertEqual(last, {'next_cursor': changefeed.latest_cursor()})
+
+        with self.assertRaises(CommandError):
+            call_command('changes_since', 'abc', stdout=StringIO())
+
+
+class NotificationTests(TestCase):
+    def setUp(self):
+        self.student = make_user('ogrenci', email='ogrenci@example.com')
+        self.course = Course.objects.create(course_code='CSE311', course_name='Yazılım Mühendisliği')
+
+    def test_send(self):
+        queue_notifications([(self.student.id, self.course.id), (self.student.id, self.course.id)])
+        self.assertEqual(send_pending_notifications(), (1, 0))
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['ogrenci@example.com'])
+        notification = GradeNotification.objects.get()
+        self.assertIsNotNone(notification.sent_at)
+        self.assertEqual(notification.attempts, 1)
+        # gönderilmiş bildirim tekrar gönderilmez
+        self.assertEqual(send_pending_notifications(), (0, 0))
+
+    def test_missing_email_does_not_block_new_notification(self):
+        self.student.email = ''
+        self.student.save()
+        queue_notifications([(self.student.id, self.course.id)])
+        self.assertEqual(send_pending_notifications(), (0, 1))
+        self.assertIsNotNone(GradeNotification.objects.get().failed_at)
+        self.assertEqual(len(mail.outbox), 0)
+
+        self.student.email = 'ogrenci@example.com'
+        self.student.save()
+        queue_notifications([(self.student.id, self.course.id)])
+        self.assertEqual(send_pending_notifications(), (1, 0))
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(GradeNotification.objects.count(), 2)
+
+    @override_settings(EMAIL_BACKEND='course_management.tests.FailingEmailBackend')
+    def test_retry_then_give_up(self):
+        queue_notifications([(self.student.id, self.course.id)])
+        self.assertEqual(send_pending_notifications(), (0, 1))
+        notification = GradeNotification.objects.get()
+        self.assertEqual(notification.attempts, 1)
+        self.assertIsNone(notification.failed_at)
+        self.assertGreater(notification.next_attempt_at, timezone.now())
+        self.assertIn('SMTP', notification.last_error)
+        # bekleme süresi dolmadan tekrar denenmez
+        self.assertEqual(send_pending_notifications(), (0, 0))
+
+        GradeNotification.objects.update(attempts=MAX_ATTEMPTS - 1, next_attempt_at=None)
+        self.assertEqual(send_pending_notifications(), (0, 1))
+        notification.refresh_from_db()
+        self.assertEqual(notification.attempts, MAX_ATTEMPTS)
+        self.assertIsNotNone(notification.failed_at)
+        self.assertEqual(send_pending_notifications(), (0, 0))
+
+    def test_gradebook_submit_queues_notification(self):
+        instructor = make_user('hoca', role='instructor')
+        self.course.instructors.add(instructor)
+        self.course.students.add(self.student)
+        component = EvaluationComponent.objects.create(course=self.course, name='Final', percentage=100)
+
+        self.client.force_login(instructor)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('manage_course', kwargs={'course_id': self.course.id}), {
+                'submit_grades': '1',
+                f'grade_{self.student.id}_{component.id}': '90',
+            })
+        # e-posta istek içinde gönderilmez, sadece kuyruğa yazılır
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(list(GradeNotification.objects.values_list('student_id', 'course_id')),
+                         [(self.student.id, self.course.id)])
+
+    def test_command(self):
+        queue_notifications([(self.student.id, self.course.id)])
+        out = StringIO()
+        call_command('send_grade_notifications', stdout=out)
+        self.assertIn('1 bildirim gönderildi, 0 bildirim gönderilemedi.', out.getvalue())
+        self.assertEqual(len(mail.outbox), 1)
+
+
+class WarmupTests(TestCase):
+    def test_all_templates_compile(self):
+        compiled = warmup.warm_templates()
+        self.assertIsInstance(compiled, int, compiled)
+        self.assertGreater(compiled, 0)
+
+    def test_broken_template_is_reported(self):
+        directory = self.enterContext(tempfile.TemporaryDirectory())
+        with open(f'{directory}/ok.html', 'w') as f:
+            f.write('{{ value }}')
+        with open(f'{directory}/broken.html', 'w') as f:
+            f.write('{% if %}')
+        templates = [{'BACKEND': 'django.template.backends.django.DjangoTemplates', 'DIRS': [directory]}]
+        with override_settings(TEMPLATES=templates):
+            result = warmup.warm_templates()
+        self.assertTrue(result.startswith('1, derlenemeyen 1: broken.html'), result)
+
+    def test_failing_step_does_not_stop_warmup(self):
+        with mock.patch.object(warmup, 'STEPS', (('urls', warmup.warm_urls), ('cache', lambda: 1 / 0))):
+            [(_, _, url_count), (_, _, error)] = warmup.warm_up()
+        self.assertGreater(url_count, 0)
+        self.assertTrue(error.startswith('hata:'))
+
+    def test_parse_importtime(self):
+        output = (
+            'import time: self [us] | cumulative | imported package\n'
+            'import time:       120 |        120 |   django.utils\n'
+            'import time:      3000 |       5000 | django\n'
+        )
+        self.assertEqual(warmup._parse_importtime(output), [('django.utils', 0.00012, 0.00012), ('django', 0.003, 0.005)])
+
+    def test_command(self):
+        out = StringIO()
+        call_command('warmup', '--step', 'urls', '--step', 'database', stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual([line.split()[0] for line in lines], ['urls', 'database', 'toplam'])
+
+
+class ProfilingTests(TestCase):
+    def setUp(self):
+        self.directory = self.enterContext(tempfile.TemporaryDirectory())
+        self.enterContext(override_settings(PROFILING=True, PROFILE_DIR=self.directory))
+        self.staff = make_user('personel', is_staff=True)
+        self.client.force_login(self.staff)
+
+    def test_staff_request_is_profiled(self):
+        response = self.client.get(reverse('changes_api'), {'_profile': 'all'})
+        self.assertEqual(response.status_code, 200)
+        profile_id = response['X-Profile-Id']
+
+        summary = profiling.load_profile(profile_id)
+        self.assertEqual(summary['user'], 'personel')
+        self.assertEqual(summary['status'], 200)
+        self.assertGreater(summary['query_count'], 0)
+        self.assertEqual(summary['files'], [profile_id + '.prof', profile_id + '.folded.txt'])
+        self.assertEqual([p['id'] for p in profiling.list_profiles()], [profile_id])
+
+        response = self.client.get(reverse('profile_detail', kwargs={'profile_id': profile_id}))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['top_functions'])
+
+        url = reverse('profile_download', kwargs={'profile_id': profile_id, 'filename': profile_id + '.prof'})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        response.close()
+        url = reverse('profile_download', kwargs={'profile_id': profile_id, 'filename': 'settings.py'})
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_only_staff_and_only_when_asked(self):
+        self.assertFalse(self.client.get(reverse('changes_api')).has_header('X-Profile-Id'))
+
+        self.client.force_login(make_user('ogrenci'))
+        response = self.client.get(reverse('student_dashboard'), {'_profile': '1'})
+        self.assertFalse(response.has_header('X-Profile-Id'))
+        self.assertEqual(profiling.list_profiles(), [])
+
+    def test_async_view_is_not_profiled(self):
+        instructor = make_user('hoca', role='instructor', is_staff=True)
+        course = Course.objects.create(course_code='CSE311', course_name='Yazılım Mühendisliği')
+        course.instructors.add(instructor)
+        self.client.force_login(instructor)
+        response = self.client.get(reverse('gradebook_stream', kwargs={'course_id': course.id}), {'_profile': '1'})
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(response.has_header('X-Profile-Id'))
+
+    def test_profile_id_must_match_format(self):
+        self.assertIsNone(profiling.load_profile('../../settings'))
+        response = self.client.get(reverse('profile_detail', kwargs={'profile_id': '20260101-000000-000000-yok'}))
+        self.assertEqual(response.status_code, 404)
+
+
+class InstructorDashboardTests(TestCase):
+    def setUp(self):
+        self.instructor = make_user('hoca', role='instructor')
+        self.course = Course.objects.create(course_code='CSE311', course_name='Yazılım Mühendisliği')
+        self.course.instructors.add(self.instructor)
+        midterm = EvaluationComponent.objects.create(course=self.course, name='Vize', percentage=40)
+        final = EvaluationComponent.objects.create(course=self.course, name='Final', percentage=60)
+        students = [make_user(f'ogrenci{i}') for i in range(4)]
+        self.course.students.add(*students)
+        # ağırlıklı ortalamalar: 100, 70, 40, dördüncü öğrencinin notu yok
+        for student, (midterm_score, final_score) in zip(students, [(100, 100), (70, 70), (100, None)]):
+            Grade.objects.create(student=student, component=midterm, score=midterm_score)
+            Grade.objects.create(student=student, component=final, score=final_score)
+        # dersten ayrılan öğrencinin notu sayılmaz
+        Grade.objects.create(student=make_user('ayrilan'), component=final, score=0)
+        self.client.force_login(self.instructor)
+
+    def test_grading_stats(self):
+        [course] = self.client.get(reverse('instructor_dashboard')).context['courses']
+        self.assertEqual((course.student_count, course.component_count, course.graded_cells), (4, 2, 5))
+        self.assertEqual(course.graded_students, 3)
+        self.assertEqual(course.completion_rate, 62.5)
+        self.assertEqual(course.mean_final, Decimal('70.00'))
+
+    def test_empty_course(self):
+        empty = Course.objects.create(course_code='CSE100', course_name='Boş Ders')
+        empty.instructors.add(self.instructor)
+        course = Course.objects.with_grading_stats().get(pk=empty.pk)
+        self.assertEqual((course.student_count, course.graded_cells, course.completion_rate), (0, 0, 0.0))
+        self.assertIsNone(course.mean_final)
+
+    def test_query_count_does_not_depend_on_course_count(self):
+        def count_queries():
+            with CaptureQueriesContext(connection) as queries:
+                self.client.get(reverse('instructor_dashboard'))
+            return len(queries)
+
+        before = count_queries()
+        for i in range(5):
+            course = Course.objects.create(course_code=f'CSE4{i}', course_name='Seçmeli')
+            course.instructors.add(self.instructor)
+        self.assertEqual(count_queries(), before)
+
+
+class DepartmentScopingTests(TestCase):
+    def setUp(self):
+        self.cse = Department.objects.create(code='CSE', name='Bilgisayar Mühendisliği')
+        self.eee = Department.objects.create(code='EEE', name='Elektrik-Elektronik Mühendisliği')
+        self.cse_course = Course.objects.create(course_code='CSE311', course_name='Yazılım', department=self.cse)
+        self.eee_course = Course.objects.create(course_code='EEE201', course_name='Devreler', department=self.eee)
+        self.head = make_user('baskan', role='department_head', department=self.cse)
+
+    def test_report_shows_own_department(self):
+        self.client.force_login(self.head)
+        response = self.client.get(reverse('department_report_api'))
+        self.assertEqual([row['course_code'] for row in response.json()['courses']], ['CSE311'])
+
+    def test_course_created_in_head_department(self):
+        self.client.force_login(self.head)
+        self.client.post(reverse('department_head_dashboard'), {
+            'submit_course_create': '1', 'course_code': 'CSE312', 'course_name': 'Veritabanı',
+        })
+        self.assertEqual(Course.objects.get(course_code='CSE312').department, self.cse)
+
+        # başka bölümün dersine hoca atanamaz
+        instructor = make_user('hoca', role='instructor', department=self.cse)
+        self.client.post(reverse('department_head_dashboard'), {
+            'submit_instructor_assign': '1', 'course': self.eee_course.pk, 'instructor': instructor.pk,
+        })
+        self.assertFalse(self.eee_course.instructors.exists())
+
+    def test_student_sees_own_program_outcomes(self):
+        ProgramOutcome.objects.create(code='PO-1', description='CSE çıktısı', department=self.cse)
+        ProgramOutcome.objects.create(code='PO-1', description='EEE çıktısı', department=self.eee)
+        self.client.force_login(make_user('ogrenci', department=self.cse))
+        response = self.client.get(reverse('student_dashboard'))
+        self.assertEqual([po.description for po in response.context['all_program_outcomes']], ['CSE çıktısı'])
+
+    def test_rollover_command_department(self):
+        source, target = make_term('2025-GUZ'), make_term('2026-BAHAR', days_ago=-120)
+        Course.objects.update(term=source)
+
+        call_command('rollover_courses', '--from', '2025-GUZ', '--to', '2026-BAHAR', '--department', 'CSE',
+                     stdout=StringIO())
+        self.assertEqual(list(Course.objects.filter(term=target).values_list('course_code', 'department')),
+                         [('CSE311', self.cse.pk)])
+
+        with self.assertRaisesMessage(CommandError, '"YOK" bölümü bulunamadı.'):
+            call_command('rollover_courses', '--from', '2025-GUZ', '--to', '2026-BAHAR', '--department', 'YOK')
+
+    def test_single_database_runs_once(self):
+        # tüm veritabanlarında dönen komutlar tek veritabanında bir kez çalışır
+        self.assertEqual(database_departments(), [None])
+        with override_settings(DEPARTMENT_DATABASES={'CSE': 'default'}):
+            self.assertEqual(database_departments(), [None])
+
+
+class FacultyReportTests(TransactionTestCase):
+    # bölümler ayrı thread'lerde hesaplanır, thread'ler sadece commit edilmiş veriyi görür
+
+    def test_faculty_report(self):
+        cse = Department.objects.create(code='CSE', name='Bilgisayar Mühendisliği')
+        eee = Department.objects.create(code='EEE', name='Elektrik-Elektronik Mühendisliği')
+        Course.objects.create(course_code='CSE311', course_name='Yazılım', department=cse).students.add(
+            make_user('ogrenci', department=cse)
+        )
+        Course.objects.create(course_code='EEE201', course_name='Devreler', department=eee)
+        Course.objects.create(course_code='OLD100', course_name='Bölümsüz Ders')
+
+        self.client.force_login(make_user('personel', is_staff=True))
+        response = self.client.get(reverse('faculty_report_api'))
+        rows = {row['code']: (row['course_count'], row['enrollment']) for row in response.json()['departments']}
+        self.assertEqual(rows, {'CSE': (1, 1), 'EEE': (1, 0), None: (1, 0)})
+
+        self.client.force_login(make_user('baskan', role='department_head', department=cse))
+        self.assertEqual(self.client.get(reverse('faculty_report_api')).status_code, 403)
+
+
+class RecordingBroker(live.InProcessBroker):
+    def __init__(self):
+        super().__init__()
+        self.published = []
+
+    def publish(self, channel, message):
+        self.published.append((channel, message))
+        return super().publish(channel, message)
+
+
+class LiveGradebookTests(TestCase):
+    def setUp(self):
+        self.broker = RecordingBroker()
+        self.enterContext(mock.patch.object(live, '_broker', self.broker))
+        self.instructor = make_user('hoca', role='instructor')
+        self.student = make_user('ogrenci')
+        self.course = Course.objects.create(course_code='CSE311', course_name='Yazılım Mühendisliği')
+        self.course.instructors.add(self.instructor)
+        self.course.students.add(self.student)
+        self.component = EvaluationComponent.objects.create(course=self.course, name='Final', percentage=100)
+        self.channel = live.gradebook_channel(self.course.id)
+
+    def test_publishes_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            grade = Grade.objects.create(student=self.student, component=self.component, score=Decimal('85'))
+            # commit'ten önce yayınlanmaz
+            self.assertEqual(self.broker.published, [])
+        with self.captureOnCommitCallbacks(execute=True):
+            grade.delete()
+
+        cell = {'student': self.student.id, 'component': self.component.id}
+        self.assertEqual(self.broker.published, [
+            (self.channel, {'type': 'grades', 'cells': [{**cell, 'score': '85.00'}]}),
+            (self.channel, {'type': 'grades', 'cells': [{**cell, 'score': None}]}),
+        ])
+
+    def test_rolled_back_write_is_not_published(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(ValueError), transaction.atomic():
+                Grade.objects.create(student=self.student, component=self.component, score=Decimal('85'))
+                raise ValueError
+        self.assertEqual(self.broker.published, [])
+
+    def test_event_stream(self):
+        async def read():
+            stream = live.event_stream(self.channel, heartbeat=0.01)
+            events = [await anext(stream), await anext(stream)]
+            self.broker.publish(self.channel, {'type': 'grades', 'cells': []})
+            events.append(await anext(stream))
+            await stream.aclose()
+            return events
+
+        self.assertEqual(asyncio.run(read()), [
+            'retry: 5000\n\n', ': ping\n\n', 'event: grades\ndata: {"type": "grades", "cells": []}\n\n',
+        ])
+        # akış kapanınca abonelik de kapanır
+        self.assertEqual(self.broker.publish(self.channel, {'type': 'grades', 'cells': []}), 0)
+
+    def test_slow_subscriber_gets_resync(self):
+        async def read():
+            subscription = self.broker.subscribe(self.channel)
+            for i in range(live.QUEUE_SIZE + 1):
+                self.broker.publish(self.channel, {'type': 'grades', 'cells': [i]})
+            message = await subscription.get(timeout=1)
+            subscription.close()
+            return message
+
+        self.assertEqual(asyncio.run(read()), live.RESYNC)
+
+    def test_stream_is_not_opened_under_wsgi(self):
+        self.client.force_login(self.instructor)
+        url = reverse('gradebook_stream', kwargs={'course_id': self.course.id})
+        self.assertEqual(self.client.get(url).status_code, 204)
+
+    async def test_stream_requires_course_instructor(self):
+        url = reverse('gradebook_stream', kwargs={'course_id': self.course.id})
+        client = AsyncClient()
+        await client.aforce_login(self.student)
+        self.assertEqual((await client.get(url)).status_code, 403)
+
+        await client.aforce_login(await sync_to_async(make_user)('baska_hoca', role='instructor'))
+        self.assertEqual((await client.get(url)).status_code, 404)
+
+
+def _codes(violations):
+    return [violation['code'] for violation in violations]
+
+
+class CheckGradeRowsTests(SimpleTestCase):
+    # bileşen 1 ve 2 ders 10'a, bileşen 3 ders 20'ye ait; öğrenci 100 sadece ders 10'a kayıtlı
+    component_courses = {1: 10, 2: 10, 3: 20}
+    enrolled = {(10, 100)}
+
+    def check(self, rows, course_id=10):
+        return check_grade_rows(rows, self.component_courses, self.enrolled, course_id)
+
+    def test_valid_rows(self):
+        rows = [(100, 1, Decimal('85.5')), (100, 2, Decimal('100')), (100, 1, None)]
+        self.assertEqual(self.check(rows), [])
+
+    def test_score_range(self):
+        rows = [(100, 1, Decimal('-1')), (100, 2, Decimal('100.01')), (100, 1, Decimal('NaN'))]
+        self.assertEqual(_codes(self.check(rows)), ['score_range'] * 3)
+
+    def test_score_precision(self):
+        violations = self.check([(100, 1, Decimal('50.125'))])
+        self.assertEqual(_codes(violations), ['score_precision'])
+
+    def test_component_and_enrollment(self):
+        violations = self.check([(100, 99, Decimal('50')), (100, 3, Decimal('50')), (200, 1, Decimal('50'))])
+        self.assertEqual(_codes(violations), ['unknown_component', 'foreign_component', 'not_enrolled'])
+        self.assertEqual(violations[2]['student_id'], 200)
+        self.assertEqual(violations[2]['course_id'], 10)
+
+    def test_without_course_uses_component_course(self):
+        # audit_grades ders vermez, her not kendi bileşeninin dersine göre kontrol edilir
+        violations = check_grade_rows([(100, 3, Decimal('50'))], self.component_courses, self.enrolled)
+        self.assertEqual(_codes(violations), ['not_enrolled'])
+        self.assertEqual(violations[0]['course_id'], 20)
+
+    def test_row_can_have_two_violations(self):
+        violations = self.check([(200, 1, Decimal('101'))])
+        self.assertEqual(_codes(violations), ['not_enrolled', 'score_range'])
+
+
+class GradeValidationTests(TestCase):
+    def setUp(self):
+        self.instructor = make_user('hoca', role='instructor')
+        self.student = make_user('ogrenci')
+        self.course = Course.objects.create(course_code='CSE311', course_name='Yazılım Mühendisliği')
+        self.course.instructors.add(self.instructor)
+        self.course.students.add(self.student)
+        self.midterm = EvaluationComponent.objects.create(course=self.course, name='Vize', percentage=40)
+        self.final = EvaluationComponent.objects.create(course=self.course, name='Final', percentage=60)
+
+    def test_gradebook_rejects_whole_batch(self):
+        outsider = make_user('kayitsiz')
+        self.client.force_login(self.instructor)
+        response = self.client.post(reverse('manage_course', kwargs={'course_id': self.course.id}), {
+            'submit_grades': '1',
+            f'grade_{self.student.id}_{self.midterm.id}': '80',
+            f'grade_{self.student.id}_{self.final.id}': '150',
+            f'grade_{outsider.id}_{self.midterm.id}': '70',
+        }, follow=True)
+        message = str(list(response.context['messages'])[0])
+        self.assertTrue(message.startswith('Notlar kaydedilmedi.'), message)
+        self.assertIn('ogrenci / Final', message)
+        self.assertIn('kayitsiz / Vize', message)
+        # geçerli hücre de kaydedilmez
+        self.assertFalse(Grade.objects.exists())
+
+    def test_audit_command(self):
+        Grade.objects.create(student=self.student, component=self.midterm, score=Decimal('50'))
+        bad = Grade.objects.create(student=make_user('kayitsiz'), component=self.midterm, score=Decimal('50'))
+        EvaluationComponent.objects.filter(pk=self.final.pk).update(percentage=50)
+
+        out = StringIO()
+        call_command('audit_grades', '--json', batch_size=1, stdout=out)
+        violations = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([(v['code'], v.get('grade_id')) for v in violations],
+                         [('weight_sum', None), ('not_enrolled', bad.id)])
+
+        with self.assertRaisesMessage(CommandError, '2 ihlal bulundu.'):
+            call_command('audit_grades', '--fail', stdout=StringIO())
+
+        bad.delete()
+        EvaluationComponent.objects.filter(pk=self.final.pk).update(percentage=60)
+        out = StringIO()
+        call_command('audit_grades', '--fail', stdout=out)
+        self.assertIn('İhlal bulunamadı.', out.getvalue())
+
+    def test_admin_component_form_checks_selected_course(self):
+        form = EvaluationComponentAdminForm({'course': self.course.pk, 'name': 'Proje', 'percentage': 10})
+        self.assertIn('percentage', form.errors)
+
+        form = EvaluationComponentAdminForm({'course': self.course.pk, 'name': 'Vize', 'percentage': 40},
+                                            instance=self.midterm)
+        self.assertTrue(form.is_valid(), form.errors)
+
+
+class ProjectionTests(SimpleTestCase):
+    def setUp(self):
+        self.components = [
+            EvaluationComponent(id=1, name='Vize', percentage=40),
+            EvaluationComponent(id=2, name='Final', percentage=60),
+        ]
+
+    def targets(self, projection):
+        return {target['letter']: (target['required'], target['status']) for target in projection['targets']}
+
+    def test_required_score(self):
+        self.assertEqual(_required_score(Decimal('50'), Decimal('60'), 40), (None, 'secured'))
+        self.assertEqual(_required_score(Decimal('50'), Decimal('40'), 0), (None, 'unreachable'))
+        # 26 * 100 / 60 = 43.333.. --> yukarı yuvarlanır
+        self.assertEqual(_required_score(Decimal('50'), Decimal('24'), 60), (Decimal('43.34'), 'reachable'))
+        self.assertEqual(_required_score(Decimal('90'), Decimal('24'), 60), (None, 'unreachable'))
+
+    def test_project_course(self):
+        projection = project_course(self.components, {1: Decimal('60')})
+        self.assertEqual(projection['current'], Decimal('24.00'))
+        self.assertEqual(projection['graded_weight'], 40)
+        self.assertEqual(projection['remaining_weight'], 60)
+        self.assertEqual(projection['max_possible'], Decimal('84.00'))
+        self.assertEqual(projection['average_so_far'], Decimal('60.00'))
+        targets = self.targets(projection)
+        self.assertNotIn('FF', targets)
+        self.assertEqual(targets['AA'], (None, 'unreachable'))
+        self.assertEqual(targets['BB'], (Decimal('93.34'), 'reachable'))
+        self.assertEqual(targets['FD'], (Decimal('43.34'), 'reachable'))
+
+    def test_what_if(self):
+        projection = project_course(self.components, {1: Decimal('60')}, what_if={2: Decimal('80')})
+        self.assertEqual(projection['current'], Decimal('72.00'))
+        self.assertEqual(projection['remaining_weight'], 0)
+        self.assertEqual(projection['secured_letter'], 'CC')
+        self.assertTrue(projection['components'][1]['assumed'])
+        self.assertEqual(self.targets(projection)['CC'], (None, 'secured'))
+        self.assertEqual(self.targets(projection)['CB'], (None, 'unreachable'))
+
+    def test_what_if_does_not_override_entered_score(self):
+        projection = project_course(self.components, {1: Decimal('60')}, what_if={1: Decimal('100')})
+        self.assertEqual(projection['current'], Decimal('24.00'))
+        self.assertFalse(projection['components'][0]['assumed'])
+
+
+class StudentProjectionTests(TestCase):
+    def setUp(self):
+        self.student = make_user('ogrenci')
+        self.course = Course.objects.create(course_code='CSE311', course_name='Yazılım Mühendisliği')
+        self.course.students.add(self.student)
+        midterm = EvaluationComponent.objects.create(course=self.course, name='Vize', percentage=40)
+        self.final = EvaluationComponent.objects.create(course=self.course, name='Final', percentage=60)
+        Grade.objects.create(student=self.student, component=midterm, score=Decimal('60'))
+        # kayıtlı olmadığı ders görünmez
+        Course.objects.create(course_code='CSE312', course_name='Veritabanı')
+        self.url = reverse('student_projection_api')
+        self.client.force_login(self.student)
+
+    def test_api(self):
+        [course] = self.client.get(self.url).json()['courses']
+        self.assertEqual(course['course_code'], 'CSE311')
+        self.assertEqual(course['current'], '24.00')
+        self.assertEqual(course['remaining_weight'], 60)
+
+        response = self.client.get(self.url, {'course': self.course.id, f'what_if_{self.final.id}': '80'})
+        [course] = response.json()['courses']
+        self.assertEqual(course['current'], '72.00')
+        self.assertEqual(course['secured_letter'], 'CC')
+
+    def test_bad_parameters(self):
+        response = self.client.get(self.url, {'course': 'abc'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'error': 'course tam sayı olmalıdır.'})
+
+        response = self.client.get(self.url, {f'what_if_{self.final.id}': '120'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'error': f'Not 0-100 aralığında olmalıdır: what_if_{self.final.id}=120'})
+
+        response = self.client.get(self.url, {'what_if_x': '50'})
+        self.assertEqual(response.json(), {'error': 'Geçersiz parametre: what_if_x=50'})
+
+    def test_dashboard_query_count_does_not_depend_on_course_count(self):
+        def count_queries():
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(reverse('student_dashboard'))
+            self.assertEqual(response.status_code, 200)
+            return len(queries)
+
+        before = count_queries()
+        for i in range(5):
+            course = Course.objects.create(course_code=f'CSE4{i}', course_name='Seçmeli')
+            course.students.add(self.student)
+            component = EvaluationComponent.objects.create(course=course, name='Final', percentage=100)
+            Grade.objects.create(student=self.student, component=component, score=Decimal('50'))
+        self.assertEqual(count_queries(), before)
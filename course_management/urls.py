@@ -10,10 +10,40 @@ urlpatterns = [
 
     # öğrenci paneli
     path('student/dashboard/', views.student_dashboard, name='student_dashboard'),
+    path('student/projections/api/', views.student_projection_api, name='student_projection_api'),
 
     # YENİ bölüm Başkanı Paneli
     path('department/dashboard/', views.department_head_dashboard, name='department_head_dashboard'),
 
     # ders yönetim sayfası
     path('course/<int:course_id>/manage/', views.manage_course, name='manage_course'),
-]
\ No newline at end of file
+    path('course/<int:course_id>/manage/stream/', views.gradebook_stream, name='gradebook_stream'),
+
+    # geçmiş dönem arşivi (salt okunur)
+    path('department/archive/', views.archive_term_list, name='archive_term_list'),
+    path('department/archive/course/<int:course_id>/', views.archive_course_detail, name='archive_course_detail'),
+    path('student/archive/', views.student_archive, name='student_archive'),
+
+    # dersleri yeni döneme kopyalama
+    path('department/rollover/', views.course_rollover, name='course_rollover'),
+
+    # bölüm not dağılımı raporu
+    path('department/report/', views.department_report, name='department_report'),
+    path('department/report/api/', views.department_report_api, name='department_report_api'),
+
+    # fakülte geneli rapor (tüm bölümler)
+    path('faculty/report/', views.faculty_report, name='faculty_report'),
+    path('faculty/report/api/', views.faculty_report_api, name='faculty_report_api'),
+
+    # staff için istek profilleri
+    path('staff/profiles/', views.profile_list, name='profile_list'),
+    path('staff/profiles/<str:profile_id>/', views.profile_detail, name='profile_detail'),
+    path('staff/profiles/<str:profile_id>/<str:filename>', views.profile_download, name='profile_download'),
+
+    # dış sistemler için değişiklik akışı
+    path('api/changes/', views.changes_api, name='changes_api'),
+
+    # ders, çıktı ve kişi araması
+    path('department/search/', views.search_page, name='search_page'),
+    path('department/search/api/', views.search_api, name='search_api'),
+]
@@ -0,0 +1,184 @@
+"""
+toplu not doğrulama
+
+not defteri kaydı, admin formu ve audit_grades komutu aynı kontrolleri kullanır.
+bir grup not tek seferde kontrol edilir: gereken veriler (bileşenlerin dersi,
+ders kayıtları) grup başına iki sorguyla çekilir, kontroller bellekte küme
+işlemleriyle yapılır, hücre başına sorgu atılmaz.
+
+kontroller:
+    score_range       --> not 0-100 aralığında ve sonlu bir sayı olmalı
+    score_precision   --> en fazla 2 ondalık basamak (Grade.score alanı)
+    unknown_component --> bileşen yok
+    foreign_component --> bileşen bu derse ait değil
+    not_enrolled      --> öğrenci bileşenin dersine kayıtlı değil
+    weight_sum        --> dersin bileşen ağırlıkları toplamı 100 değil
+"""
+from decimal import Decimal
+
+from django.db.models import Sum
+
+from .models import Course, EvaluationComponent, Grade
+
+MIN_SCORE = Decimal('0')
+MAX_SCORE = Decimal('100')
+SCORE_PLACES = Grade._meta.get_field('score').decimal_places
+WEIGHT_TOTAL = 100
+
+MESSAGES = {
+    'score_range': 'Not {min}-{max} aralığında olmalıdır: {score}',
+    'score_precision': 'Not en fazla {places} ondalık basamak içerebilir: {score}',
+    'unknown_component': 'Değerlendirme bileşeni bulunamadı.',
+    'foreign_component': 'Değerlendirme bileşeni bu derse ait değil.',
+    'not_enrolled': 'Öğrenci bu derse kayıtlı değil.',
+    'weight_sum': 'Bileşen ağırlıkları toplamı %{total}, %{expected} olmalıdır.',
+}
+
+
+class GradeValidationError(ValueError):
+    """doğrulanamayan notlar, violations --> ihlal listesi"""
+
+    def __init__(self, violations):
+        self.violations = violations
+        super().__init__(f'{len(violations)} not doğrulanamadı.')
+
+
+def _violation(code, student_id=None, component_id=None, course_id=None, **params):
+    return {
+        'code': code,
+        'student_id': student_id,
+        'component_id': component_id,
+        'course_id': course_id,
+        'message': MESSAGES[code].format(min=MIN_SCORE, max=MAX_SCORE, places=SCORE_PLACES, **params),
+    }
+
+
+def _score_error(score):
+    if score is None:
+        return None
+    if not score.is_finite() or not MIN_SCORE <= score <= MAX_SCORE:
+        return 'score_range'
+    if score.as_tuple().exponent < -SCORE_PLACES:
+        return 'score_precision'
+    return None
+
+
+def check_grade_rows(rows, component_courses, enrolled, course_id=None):
+    """
+    satırları önceden çekilmiş verilere göre kontrol et (sorgu atmaz)
+
+    rows              --> [(student_id, component_id, score), ...]
+    component_courses --> {component_id: course_id}
+    enrolled          --> {(course_id, student_id), ...}
+    course_id         --> verilirse bileşenlerin bu derse ait olması beklenir
+    ihlal listesi döner
+    """
+    # önce bileşen ve kayıt sorunları küme işlemleriyle bulunur, satırlar tek geçişte işaretlenir
+    component_ids = {component_id for _, component_id, _ in rows}
+    unknown = component_ids - component_courses.keys()
+    foreign = {
+        component_id for component_id in component_ids - unknown
+        if course_id is not None and component_courses[component_id] != course_id
+    }
+    pairs = {
+        (component_courses[component_id], student_id)
+        for student_id, component_id, _ in rows
+        if component_id not in unknown and component_id not in foreign
+    }
+    not_enrolled = pairs - enrolled
+
+    violations = []
+    for student_id, component_id, score in rows:
+        row_course_id = component_courses.get(component_id, course_id)
+        if component_id in unknown:
+            violations.append(_violation('unknown_component', student_id, component_id, row_course_id))
+        elif component_id in foreign:
+            violations.append(_violation('foreign_component', student_id, component_id, row_course_id))
+        elif (row_course_id, student_id) in not_enrolled:
+            violations.append(_violation('not_enrolled', student_id, component_id, row_course_id))
+        code = _score_error(score)
+        if code:
+            violations.append(_violation(code, student_id, component_id, row_course_id, score=score))
+    return violations
+
+
+def load_row_context(rows):
+    """
+    satırların kontrolü için gereken veriler, iki sorgu
+    (component_courses, enrolled) döner
+    """
+    component_ids = {component_id for _, component_id, _ in rows}
+    student_ids = {student_id for student_id, _, _ in rows}
+    component_courses = dict(
+        EvaluationComponent.objects.filter(id__in=component_ids).values_list('id', 'course_id')
+    )
+    enrolled = set(
+        Course.students.through.objects
+        .filter(course_id__in=set(component_courses.values()), user_id__in=student_ids)
+        .values_list('course_id', 'user_id')
+    )
+    return component_courses, enrolled
+
+
+def validate_grade_rows(rows, course_id=None):
+    """satırları veritabanındaki bileşen ve kayıtlara göre kontrol et, ihlal listesi döner"""
+    rows = list(rows)
+    if not rows:
+        return []
+    component_courses, enrolled = load_row_context(rows)
+    return check_grade_rows(rows, component_courses, enrolled, course_id)
+
+
+def validate_grade_cells(course, cells):
+    """
+    not defterinden gelen hücreleri ({(student_id, component_id): score}) kontrol et
+    ihlal varsa GradeValidationError fırlatır, grup ya tamamen kabul edilir ya hiç
+    """
+    violations = validate_grade_rows(
+        ((student_id, component_id, score) for (student_id, component_id), score in cells.items()),
+        course_id=course.id,
+    )
+    if violations:
+        raise GradeValidationError(violations)
+
+
+def weight_totals(courses=None):
+    """{course_id: ağırlık toplamı}, bileşeni olmayan dersler dahil değil, tek sorgu"""
+    components = EvaluationComponent.objects.all()
+    if courses is not None:
+        components = components.filter(course__in=courses)
+    return dict(
+        components.order_by().values('course_id').annotate(total=Sum('percentage')).values_list('course_id', 'total')
+    )
+
+
+def weight_violations(courses=None):
+    """ağırlık toplamı 100 olmayan dersler için ihlal listesi"""
+    return [
+        _violation('weight_sum', course_id=course_id, total=total, expected=WEIGHT_TOTAL)
+        for course_id, total in sorted(weight_totals(courses).items())
+        if total != WEIGHT_TOTAL
+    ]
+
+
+def audit_grades(batch_size=1000):
+    """
+    tüm notları id sırasıyla batch_size'lık gruplar halinde tara
+    ihlalleri grup grup üretir (generator), bellek kullanımı grup boyutuyla sınırlı
+    """
+    last_id = 0
+    while True:
+        batch = list(
+            Grade.objects.filter(id__gt=last_id).order_by('id')
+            .values_list('id', 'student_id', 'component_id', 'score')[:batch_size]
+        )
+        if not batch:
+            break
+        last_id = batch[-1][0]
+        rows = [(student_id, component_id, score) for _, student_id, component_id, score in batch]
+        # (öğrenci, bileşen) başına tek not var, ihlal notun id'siyle raporlanır
+        grade_ids = {(student_id, component_id): grade_id for grade_id, student_id, component_id, _ in batch}
+        component_courses, enrolled = load_row_context(rows)
+        for violation in check_grade_rows(rows, component_courses, enrolled):
+            violation['grade_id'] = grade_ids[violation['student_id'], violation['component_id']]
+            yield violation
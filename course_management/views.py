@@ -3,15 +3,55 @@ from django.contrib.auth.decorators import login_required
 from django.core.exceptions import PermissionDenied
 from decimal import Decimal
 from django.contrib import messages
+from django.db import router, transaction
+from django.db.models import Count, Prefetch
+from django.core.paginator import Paginator
+from django.core.handlers.asgi import ASGIRequest
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.conf import settings
 
 # modeller
-from .models import Profile, Course, EvaluationComponent, LearningOutcome, Grade, User, ProgramOutcome
+from .models import Profile, Course, EvaluationComponent, LearningOutcome, Grade, User, ProgramOutcome, Term, ArchivedGrade, SearchEntry
 
 # formlar
-from .forms import EvaluationComponentForm, LearningOutcomeForm, CourseCreateForm, InstructorAssignForm, StudentAssignForm, SyllabusForm, ProgramOutcomeForm
+from .forms import EvaluationComponentForm, LearningOutcomeForm, CourseCreateForm, InstructorAssignForm, StudentAssignForm, SyllabusForm, ProgramOutcomeForm, CourseRolloverForm
+
+# arama
+from . import search
+
+# bölüm raporu
+from .reports import GRADE_BANDS, build_faculty_report, get_department_report
+
+# değişiklik akışı
+from . import changefeed
+
+# canlı not defteri
+from . import live
+
+# not bildirimleri
+from .notifications import queue_course_notifications
+
+# istek profilleri
+from . import profiling
+
+# dönem devri
+from .rollover import rollover_courses
+
+# toplu not doğrulama
+from .validation import MAX_SCORE, MIN_SCORE, WEIGHT_TOTAL, GradeValidationError
+
+# öğrenci not projeksiyonu
+from .projections import build_projections
+
+# not defteri yardımcıları
+from .gradebook import build_gradebook_page, parse_grade_cells, save_grade_cells
 
 # decoratorlarımız <-- roller ile kontrol
-from .decorators import user_is_instructor, user_is_student, user_is_department_head
+from .decorators import user_is_instructor, user_is_student, user_is_department_head, user_is_staff
+
+# what-if parametrelerinin öneki (student_projection_api)
+WHAT_IF_PREFIX = 'what_if_'
 
 
 @login_required
@@ -44,11 +84,39 @@ def instructor_dashboard(request):
     """
     giriş yapan hocanın derslerim sayfasını gösterir
     """
-    courses = Course.objects.filter(instructors=request.user)
+    # sadece aktif dönemin dersleri, not girişi özetiyle birlikte tek sorguda
+    courses = list(
+        Course.objects.active().filter(instructors=request.user)
+        .with_grading_stats().order_by('course_code')
+    )
     context = {'courses': courses}
     return render(request, 'course_management/instructor_dashboard.html', context)
 
 
+def _redirect_to_gradebook(course, params):
+    """ders yönetim sayfasına query string i koruyarak yönlendir"""
+    url = reverse('manage_course', kwargs={'course_id': course.id})
+    if params:
+        url = f'{url}?{params.urlencode()}'
+    return redirect(url)
+
+
+def _describe_violations(course, violations, limit=5):
+    """not doğrulama hatalarını öğrenci ve bileşen adlarıyla tek mesajda topla"""
+    students = dict(
+        User.objects.filter(id__in={v['student_id'] for v in violations[:limit]}).values_list('id', 'username')
+    )
+    components = dict(course.evaluation_components.values_list('id', 'name'))
+    parts = [
+        f"{students.get(v['student_id'], v['student_id'])} / "
+        f"{components.get(v['component_id'], v['component_id'])}: {v['message']}"
+        for v in violations[:limit]
+    ]
+    if len(violations) > limit:
+        parts.append(f've {len(violations) - limit} hata daha')
+    return '; '.join(parts)
+
+
 @login_required
 @user_is_instructor
 def manage_course(request, course_id):
@@ -58,11 +126,10 @@ def manage_course(request, course_id):
     course = get_object_or_404(Course, id=course_id, instructors=request.user)
     components = EvaluationComponent.objects.filter(course=course).order_by('id')
     outcomes = LearningOutcome.objects.filter(course=course)
-    students = course.students.all().order_by('last_name', 'first_name')
 
     # instance=course -> mevcut syllabusu göstermek için
     syllabus_form = SyllabusForm(instance=course)
-    eval_form = EvaluationComponentForm()
+    eval_form = EvaluationComponentForm(course=course)
     outcome_form = LearningOutcomeForm()
 
     # POST işlemleri
@@ -71,7 +138,7 @@ def manage_course(request, course_id):
         # hangi formun gönderildiğini name ile kontrol et
 
         if 'submit_evaluation' in request.POST:
-            eval_form = EvaluationComponentForm(request.POST)
+            eval_form = EvaluationComponentForm(request.POST, course=course)
             if eval_form.is_valid():
                 evaluation = eval_form.save(commit=False)
                 evaluation.course = course
@@ -105,103 +172,96 @@ def manage_course(request, course_id):
                 messages.error(request, 'Dosya yüklenirken bir hata oluştu. Lütfen geçerli bir dosya seçin.')
 
         elif 'submit_grades' in request.POST:
+            # form sadece görünen sayfanın hücrelerini gönderir
             try:
-                for key, value in request.POST.items():
-                    if key.startswith('grade_'):
-                        _, student_id, component_id = key.split('_')
-                        score = value
-                        grade, created = Grade.objects.get_or_create(
-                            student_id=student_id,
-                            component_id=component_id
-                        )
-                        grade.score = score if score else None
-                        grade.save()
+                # not ve bildirim satırları bölüm veritabanına yazılır, işlem de orada açılmalı
+                with transaction.atomic(using=router.db_for_write(Grade)):
+                    cells = parse_grade_cells(request.POST)
+                    changed = save_grade_cells(course, cells)
+                    # e-postalar istek içinde gönderilmez, sadece kuyruğa yazılır
+                    queue_course_notifications(course, changed)
                 messages.success(request, 'Notlar başarıyla kaydedildi.')
+            except GradeValidationError as e:
+                # grup tamamen reddedildi, hangi hücrelerin hatalı olduğunu göster
+                messages.error(request, f'Notlar kaydedilmedi. {_describe_violations(course, e.violations)}')
             except (ValueError, Exception) as e:
                 messages.error(request, f'Notları kaydederken bir hata oluştu: {e}')
                 pass  # hata olsa bile sayfayı yenile
-            return redirect('manage_course', course_id=course.id)
+            # aynı sayfaya, aynı sıralama ve filtreyle geri dön
+            return _redirect_to_gradebook(course, request.GET)
 
     # GET İşlemleri veya POST'ta hata olduysa sayfanın yeniden render edilmesi
 
-    # tüm notları tek seferde çekme
-    all_grades = Grade.objects.filter(component__in=components, student__in=students)
-    grade_map = {
-        (g.student_id, g.component_id): g.score
-        for g in all_grades
-    }
+    # not defteri sayfalı: sadece görünen öğrencilerin notları çekilir
+    components = list(components)
+    gradebook = build_gradebook_page(course, components, request.GET)
 
-    # template de döngüye sokma
-    student_grade_rows = []
-    for student in students:
-        row = {
-            'student_object': student,
-            'grades_list': []
-        }
-        for component in components:
-            score = grade_map.get((student.id, component.id))
-            row['grades_list'].append({
-                'component_id': component.id,
-                'score': score
-            })
-        student_grade_rows.append(row)
+    # ağırlıklar toplamı 100 değilse ortalamalar eksik/fazla hesaplanır --> uyar
+    weight_total = sum(component.percentage for component in components)
 
     context = {
         'course': course,
         'components': components,
+        'weight_total': weight_total,
+        'weight_expected': WEIGHT_TOTAL,
         'outcomes': outcomes,
-        'students': students,
-        'student_grade_rows': student_grade_rows,
+        'has_students': course.students.exists(),
 
         # formları hata varsa hatalı yoksa boş olarak context e yolla
         'eval_form': eval_form,
         'outcome_form': outcome_form,
         'syllabus_form': syllabus_form,
     }
+    context.update(gradebook)
 
     # Bu render GET isteği için VEYA
     # POST ta validasyon hatası olursa veya redirect olmazsa çalışır.
     return render(request, 'course_management/course_manage_detail.html', context)
 
 
-@login_required
-@user_is_student
-def student_dashboard(request):
-    """
-    giriş yapan öğrencinin notlarım sayfasını gösterir
+async def gradebook_stream(request, course_id):
     """
-    enrolled_courses = request.user.enrolled_courses.all()
-    course_data = []
+    dersin not defterindeki değişiklikler (server-sent events)
+    açık not defterleri değişen hücreleri sayfayı yenilemeden günceller
 
-    for course in enrolled_courses:
-        components = EvaluationComponent.objects.filter(course=course).order_by('id')
-        grades = Grade.objects.filter(student=request.user, component__in=components)
-
-        total_score = Decimal('0.0')
+    sadece ASGI altında akış açılır: WSGI'da her açık bağlantı bir worker'ı
+    kilitlerdi, orada 204 döner ve tarayıcı yeniden bağlanmayı bırakır
+    """
+    if not isinstance(request, ASGIRequest):
+        return HttpResponse(status=204)
 
-        # notları eşleştir
-        grade_map = {g.component_id: g.score for g in grades if g.score is not None}
+    # manage_course ile aynı kontroller (user_is_instructor senkron olduğu için burada)
+    user = await request.auser()
+    if not user.is_authenticated:
+        return redirect('login')
+    try:
+        profile = await Profile.objects.aget(user=user)
+    except Profile.DoesNotExist:
+        raise PermissionDenied
+    if profile.role != 'instructor':
+        raise PermissionDenied
+    if not await Course.objects.filter(id=course_id, instructors=user).aexists():
+        raise Http404
 
-        # veriyi template için hazırlama
-        component_grade_list = []
-        for comp in components:
-            score = grade_map.get(comp.id)
-            component_grade_list.append({
-                'name': comp.name,
-                'percentage': comp.percentage,
-                'score': score  # not yoksa None
-            })
+    channel = live.gradebook_channel(course_id, router.db_for_read(Course))
+    response = StreamingHttpResponse(live.event_stream(channel), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # nginx arkasında akış tamponlanmasın
+    response['X-Accel-Buffering'] = 'no'
+    return response
 
-            if score is not None:
-                total_score += (score * (Decimal(comp.percentage) / Decimal('100.0')))
 
-        course_data.append({
-            'course': course,
-            'component_grade_list': component_grade_list,
-            'final_grade': total_score.quantize(Decimal('0.01')),
-        })
+@login_required
+@user_is_student
+def student_dashboard(request):
+    """
+    giriş yapan öğrencinin notlarım sayfasını gösterir
+    """
+    # dersler, bileşenler ve notlar ders sayısından bağımsız sabit sayıda sorguyla gelir,
+    # her ders için harf notu eşiklerine göre kalan bileşenlerden gereken not da hesaplanır
+    course_data = build_projections(request.user, request.user.enrolled_courses.active())
 
-    all_program_outcomes = ProgramOutcome.objects.all()
+    all_program_outcomes = ProgramOutcome.objects.for_department(request.department)
 
     context = {
         'course_data': course_data,
@@ -210,6 +270,57 @@ def student_dashboard(request):
     return render(request, 'course_management/student_dashboard.html', context)
 
 
+def _parse_what_if(params):
+    """what_if_<bileşen id>=<not> parametreleri --> {component_id: Decimal}"""
+    what_if = {}
+    for key, value in params.items():
+        if not key.startswith(WHAT_IF_PREFIX):
+            continue
+        try:
+            component_id = int(key[len(WHAT_IF_PREFIX):])
+            score = Decimal(value)
+        except (ValueError, ArithmeticError):
+            raise ValueError(f'Geçersiz parametre: {key}={value}')
+        if not score.is_finite() or not MIN_SCORE <= score <= MAX_SCORE:
+            raise ValueError(f'Not {MIN_SCORE}-{MAX_SCORE} aralığında olmalıdır: {key}={value}')
+        what_if[component_id] = score
+    return what_if
+
+
+@login_required
+@user_is_student
+def student_projection_api(request):
+    """
+    öğrencinin dersleri için not projeksiyonu (JSON)
+    ?course=<id> ile tek ders, what_if_<bileşen id>=<not> ile notu girilmemiş
+    bileşenler için varsayılan not verilerek "bundan 70 alırsam finalden kaç almalıyım?"
+    """
+    try:
+        what_if = _parse_what_if(request.GET)
+    except ValueError as e:
+        # _parse_what_if'in kendi mesajı, python hata metni değil
+        return JsonResponse({'error': str(e)}, status=400)
+
+    courses = request.user.enrolled_courses.active()
+    if 'course' in request.GET:
+        try:
+            course_id = int(request.GET['course'])
+        except ValueError:
+            return JsonResponse({'error': 'course tam sayı olmalıdır.'}, status=400)
+        courses = courses.filter(id=course_id)
+
+    projections = build_projections(request.user, courses, what_if)
+    return JsonResponse({'courses': [
+        {
+            'course_id': projection['course'].id,
+            'course_code': projection['course'].course_code,
+            'course_name': projection['course'].course_name,
+            **{key: value for key, value in projection.items() if key != 'course'},
+        }
+        for projection in projections
+    ]})
+
+
 @login_required
 @user_is_department_head
 def department_head_dashboard(request):
@@ -217,16 +328,19 @@ def department_head_dashboard(request):
     bölüm başkanının panelini gösterir
     tüm dersler hocalar ve öğrenciler hakkında genel bilgi sağlar
     ders ekleme, hoca atama ve öğrenci atama işlemlerini de yapar
+    her şey bölüm başkanının bölümüyle sınırlıdır
     """
+    department = request.department
 
     # formları POST verisiyle doldur (eğer POST ise) veya boş oluştur (eğer GET ise)
     if request.method == 'POST':
         # hangi formun gönderildiğini submit butonunun name ye göre kontrol et
 
         if 'submit_course_create' in request.POST:
-            course_form = CourseCreateForm(request.POST)
-            assign_form = InstructorAssignForm()  # diğer formu boş ata
-            student_assign_form = StudentAssignForm()  # diğer formu boş ata
+            course_form = CourseCreateForm(request.POST, department=department)
+            assign_form = InstructorAssignForm(department=department)  # diğer formu boş ata
+            student_assign_form = StudentAssignForm(department=department)  # diğer formu boş ata
+            program_outcome_form = ProgramOutcomeForm(department=department)  # diğer formu boş ata
 
             if course_form.is_valid():
                 course_form.save()
@@ -236,9 +350,10 @@ def department_head_dashboard(request):
                 messages.error(request, 'Ders eklenirken bir hata oluştu. Lütfen formu kontrol edin.')
 
         elif 'submit_instructor_assign' in request.POST:
-            assign_form = InstructorAssignForm(request.POST)
-            course_form = CourseCreateForm()  # diğer formu boş ata
-            student_assign_form = StudentAssignForm()  # diğer formu boş ata
+            assign_form = InstructorAssignForm(request.POST, department=department)
+            course_form = CourseCreateForm(department=department)  # diğer formu boş ata
+            student_assign_form = StudentAssignForm(department=department)  # diğer formu boş ata
+            program_outcome_form = ProgramOutcomeForm(department=department)  # diğer formu boş ata
 
             if assign_form.is_valid():
                 course = assign_form.cleaned_data['course']
@@ -254,9 +369,10 @@ def department_head_dashboard(request):
                 messages.error(request, 'Hoca atanırken bir hata oluştu. Lütfen formu kontrol edin.')
 
         elif 'submit_student_assign' in request.POST:
-            student_assign_form = StudentAssignForm(request.POST)
-            course_form = CourseCreateForm()  # diğer formu boş ata
-            assign_form = InstructorAssignForm()  # diğer formu boş ata
+            student_assign_form = StudentAssignForm(request.POST, department=department)
+            course_form = CourseCreateForm(department=department)  # diğer formu boş ata
+            assign_form = InstructorAssignForm(department=department)  # diğer formu boş ata
+            program_outcome_form = ProgramOutcomeForm(department=department)  # diğer formu boş ata
 
             if student_assign_form.is_valid():
                 course = student_assign_form.cleaned_data['course']
@@ -272,11 +388,11 @@ def department_head_dashboard(request):
                 messages.error(request, 'Öğrenci atanırken bir hata oluştu. Lütfen formu kontrol edin.')
 
         elif 'submit_program_outcome' in request.POST:
-            program_outcome_form = ProgramOutcomeForm(request.POST)
+            program_outcome_form = ProgramOutcomeForm(request.POST, department=department)
             # diğer formları boş ata
-            course_form = CourseCreateForm()
-            assign_form = InstructorAssignForm()
-            student_assign_form = StudentAssignForm()
+            course_form = CourseCreateForm(department=department)
+            assign_form = InstructorAssignForm(department=department)
+            student_assign_form = StudentAssignForm(department=department)
 
             if program_outcome_form.is_valid():
                 program_outcome_form.save()
@@ -287,28 +403,37 @@ def department_head_dashboard(request):
 
         else:
             # beklenmedik bir POST durumu
-            course_form = CourseCreateForm()
-            assign_form = InstructorAssignForm()
-            student_assign_form = StudentAssignForm()
-            program_outcome_form = ProgramOutcomeForm()
+            course_form = CourseCreateForm(department=department)
+            assign_form = InstructorAssignForm(department=department)
+            student_assign_form = StudentAssignForm(department=department)
+            program_outcome_form = ProgramOutcomeForm(department=department)
 
     else:
         # tüm formları boş olarak oluştur
-        course_form = CourseCreateForm()
-        assign_form = InstructorAssignForm()
-        student_assign_form = StudentAssignForm()
-        program_outcome_form = ProgramOutcomeForm()
+        course_form = CourseCreateForm(department=department)
+        assign_form = InstructorAssignForm(department=department)
+        student_assign_form = StudentAssignForm(department=department)
+        program_outcome_form = ProgramOutcomeForm(department=department)
 
 
     # instructors kullanarak veritabanı sorgusunu optimize et
     # ders listesinde hocaları gösterirken her ders için ayrı sorgu atmama
-    all_courses = Course.objects.all().prefetch_related('instructors').order_by('course_code')
-
-    all_instructors = User.objects.filter(profile__role='instructor').order_by('last_name', 'first_name')
-    all_students = User.objects.filter(profile__role='student').prefetch_related('enrolled_courses').order_by('last_name', 'first_name')
-    all_program_outcomes = ProgramOutcome.objects.all()
+    # sadece aktif dönemin dersleri
+    all_courses = (
+        Course.objects.active().for_department(department)
+        .select_related('term').prefetch_related('instructors').order_by('course_code')
+    )
+
+    all_instructors = User.objects.filter(
+        profile__role='instructor', profile__department=department
+    ).order_by('last_name', 'first_name')
+    all_students = User.objects.filter(profile__role='student', profile__department=department).prefetch_related(
+        Prefetch('enrolled_courses', queryset=Course.objects.active())
+    ).order_by('last_name', 'first_name')
+    all_program_outcomes = ProgramOutcome.objects.for_department(department)
 
     context = {
+        'department': department,
         'all_courses': all_courses,
         'all_instructors': all_instructors,
         'all_students': all_students,
@@ -323,3 +448,315 @@ def department_head_dashboard(request):
     }
 
     return render(request, 'course_management/department_head_dashboard.html', context)
+
+
+@login_required
+@user_is_department_head
+def archive_term_list(request):
+    """
+    arşivlenmiş dönemlerin listesi (salt okunur)
+    """
+    terms = list(Term.objects.filter(is_archived=True))
+    # bölümün derslerini tek sorguda çek ve dönemlere dağıt
+    # (dönemler paylaşılan, dersler bölüm veritabanında olabilir --> join yerine id listesi)
+    courses = Course.objects.for_department(request.department).filter(
+        term_id__in=[term.id for term in terms]
+    ).annotate(
+        enrollment_count=Count('archived_enrollments')
+    ).order_by('course_code')
+    courses_by_term = {}
+    for course in courses:
+        courses_by_term.setdefault(course.term_id, []).append(course)
+
+    term_rows = []
+    for term in terms:
+        term_courses = courses_by_term.get(term.id, [])
+        term.course_count = len(term_courses)
+        term.enrollment_count = sum(course.enrollment_count for course in term_courses)
+        term_rows.append({'term': term, 'courses': term_courses})
+    return render(request, 'course_management/archive_term_list.html', {'term_rows': term_rows})
+
+
+@login_required
+@user_is_department_head
+def archive_course_detail(request, course_id):
+    """
+    arşivlenmiş bir dersin not tablosu (salt okunur, sayfalı)
+    """
+    course = get_object_or_404(
+        Course.objects.for_department(request.department).select_related('term'),
+        id=course_id, term__is_archived=True,
+    )
+
+    # bileşenler silindiği için sütunları arşiv kayıtlarından çıkar
+    component_columns = list(
+        ArchivedGrade.objects.filter(course=course)
+        .values_list('component_name', 'component_percentage')
+        .distinct()
+        .order_by('component_name')
+    )
+
+    students = User.objects.filter(archived_enrollments__course=course).order_by('last_name', 'first_name', 'id')
+    page_obj = Paginator(students, 50).get_page(request.GET.get('page'))
+    page_students = list(page_obj.object_list)
+
+    grade_map = {
+        (student_id, name): score
+        for student_id, name, score in ArchivedGrade.objects.filter(
+            course=course, student__in=[s.id for s in page_students]
+        ).values_list('student_id', 'component_name', 'score')
+    }
+    rows = [
+        {
+            'student_object': student,
+            'scores': [grade_map.get((student.id, name)) for name, _ in component_columns],
+        }
+        for student in page_students
+    ]
+
+    context = {
+        'course': course,
+        'component_columns': component_columns,
+        'rows': rows,
+        'page_obj': page_obj,
+    }
+    return render(request, 'course_management/archive_course_detail.html', context)
+
+
+@login_required
+@user_is_student
+def student_archive(request):
+    """
+    öğrencinin geçmiş dönem notları (salt okunur)
+    """
+    grades = (
+        ArchivedGrade.objects
+        .filter(student=request.user)
+        .select_related('term', 'course')
+        .order_by('-term__start_date', 'course__course_code', 'component_name')
+    )
+
+    # dönem -> ders -> notlar şeklinde grupla, ağırlıklı ortalamayı hesapla
+    term_data = {}
+    for grade in grades:
+        term_entry = term_data.setdefault(grade.term_id, {'term': grade.term, 'courses': {}})
+        course_entry = term_entry['courses'].setdefault(grade.course_id, {
+            'course': grade.course,
+            'component_grade_list': [],
+            'final_grade': Decimal('0.0'),
+        })
+        course_entry['component_grade_list'].append({
+            'name': grade.component_name,
+            'percentage': grade.component_percentage,
+            'score': grade.score,
+        })
+        if grade.score is not None:
+            course_entry['final_grade'] += grade.score * (Decimal(grade.component_percentage) / Decimal('100.0'))
+
+    archived_terms = []
+    for term_entry in term_data.values():
+        courses = list(term_entry['courses'].values())
+        for course_entry in courses:
+            course_entry['final_grade'] = course_entry['final_grade'].quantize(Decimal('0.01'))
+        archived_terms.append({'term': term_entry['term'], 'course_data': courses})
+
+    return render(request, 'course_management/student_archive.html', {'archived_terms': archived_terms})
+
+
+def _search_results(request):
+    """arama parametrelerini oku ve sıralı sonuçları döndür"""
+    query = request.GET.get('q', '').strip()
+    object_types = [t for t in request.GET.getlist('type') if t in dict(SearchEntry.TYPE_CHOICES)]
+    try:
+        limit = min(max(int(request.GET.get('limit', 20)), 1), 100)
+    except ValueError:
+        limit = 20
+    return query, search.search(query, object_types=object_types, limit=limit, department=request.department)
+
+
+@login_required
+@user_is_department_head
+def search_page(request):
+    """
+    bölüm başkanı için ders, çıktı ve kişi araması
+    """
+    query, results = _search_results(request)
+    context = {
+        'query': query,
+        'results': results,
+        'type_choices': SearchEntry.TYPE_CHOICES,
+        'selected_types': request.GET.getlist('type'),
+    }
+    return render(request, 'course_management/search.html', context)
+
+
+@login_required
+@user_is_department_head
+def search_api(request):
+    """
+    sıralı arama sonuçları (JSON)
+    """
+    query, results = _search_results(request)
+    return JsonResponse({
+        'query': query,
+        'results': [
+            {
+                'type': entry.object_type,
+                'type_display': entry.get_object_type_display(),
+                'id': entry.object_id,
+                'title': entry.title,
+                'body': entry.body,
+                'score': score,
+            }
+            for entry, score in results
+        ],
+    })
+
+
+@login_required
+@user_is_department_head
+def department_report(request):
+    """
+    dersler arası not dağılımı ve karşılaştırma raporu
+    """
+    report = get_department_report(request.department)
+    context = {
+        'department': request.department,
+        'report': report,
+        'grade_bands': [letter for letter, _ in GRADE_BANDS],
+    }
+    return render(request, 'course_management/department_report.html', context)
+
+
+@login_required
+@user_is_department_head
+def department_report_api(request):
+    """
+    dersler arası not dağılımı raporu (JSON)
+    """
+    report = get_department_report(request.department)
+    return JsonResponse({'courses': report})
+
+
+@login_required
+@user_is_department_head
+def course_rollover(request):
+    """
+    seçilen dersleri (veya bir dönemin tüm derslerini) bileşen ve
+    öğrenim çıktılarıyla birlikte yeni döneme kopyalar
+    """
+    if request.method == 'POST':
+        form = CourseRolloverForm(request.POST)
+        if form.is_valid():
+            courses = Course.objects.for_department(request.department).filter(term=form.cleaned_data['source_term'])
+            if form.cleaned_data['course_codes']:
+                courses = courses.filter(course_code__in=form.cleaned_data['course_codes'])
+
+            target = form.cleaned_data['target_term']
+            new_courses, skipped = rollover_courses(
+                courses, target, copy_instructors=form.cleaned_data['copy_instructors']
+            )
+            messages.success(request, f'{len(new_courses)} ders "{target.name}" dönemine kopyalandı.')
+            if skipped:
+                messages.error(request, f'Hedef dönemde zaten olduğu için atlanan dersler: {", ".join(skipped)}')
+            return redirect('course_rollover')
+        else:
+            messages.error(request, 'Dönem devri yapılırken bir hata oluştu. Lütfen formu kontrol edin.')
+    else:
+        form = CourseRolloverForm()
+
+    return render(request, 'course_management/course_rollover.html', {'form': form})
+
+
+@login_required
+@user_is_staff
+def changes_api(request):
+    """
+    imleçten (since) sonraki değişiklikler (JSON)
+    öğrenci bilgi sistemi next_cursor ile kaldığı yerden devam eder
+    """
+    try:
+        cursor = int(request.GET.get('since', 0))
+        limit = int(request.GET.get('limit', changefeed.DEFAULT_LIMIT))
+    except ValueError:
+        return JsonResponse({'error': 'since ve limit tam sayı olmalıdır.'}, status=400)
+
+    changes, next_cursor, has_more = changefeed.changes_since(cursor, limit)
+    return JsonResponse({
+        'changes': changes,
+        'next_cursor': next_cursor,
+        'has_more': has_more,
+    })
+
+
+@login_required
+@user_is_staff
+def profile_list(request):
+    """kaydedilmiş istek profillerinin listesi"""
+    context = {
+        'profiles': profiling.list_profiles(),
+        'profiling_enabled': getattr(settings, 'PROFILING', False),
+        'query_param': profiling.QUERY_PARAM,
+    }
+    return render(request, 'course_management/profile_list.html', context)
+
+
+@login_required
+@user_is_staff
+def profile_detail(request, profile_id):
+    """tek bir profilin özeti: en pahalı fonksiyonlar, sık görülen yığınlar, SQL sorguları"""
+    summary = profiling.load_profile(profile_id)
+    if summary is None:
+        raise Http404('Profil bulunamadı.')
+
+    context = {
+        'profile': summary,
+        'top_functions': profiling.top_functions(profile_id),
+        'top_stacks': profiling.top_stacks(profile_id),
+        # en yavaş sorgular üstte
+        'slow_queries': sorted(summary['queries'], key=lambda q: q['duration_ms'], reverse=True)[:50],
+    }
+    return render(request, 'course_management/profile_detail.html', context)
+
+
+@login_required
+@user_is_staff
+def profile_download(request, profile_id, filename):
+    path = profiling.profile_file_path(profile_id, filename)
+    if path is None:
+        raise Http404('Dosya bulunamadı.')
+    return FileResponse(open(path, 'rb'), as_attachment=True, filename=filename)
+
+
+@login_required
+@user_is_staff
+def faculty_report(request):
+    """
+    fakültedeki tüm bölümlerin not raporları (bölümler paralel hesaplanır)
+    """
+    context = {
+        'faculty': build_faculty_report(),
+        'grade_bands': [letter for letter, _ in GRADE_BANDS],
+    }
+    return render(request, 'course_management/faculty_report.html', context)
+
+
+@login_required
+@user_is_staff
+def faculty_report_api(request):
+    """
+    fakültedeki tüm bölümlerin not raporları (JSON)
+    """
+    return JsonResponse({
+        'departments': [
+            {
+                'code': row['department'].code if row['department'] else None,
+                'name': row['department'].name if row['department'] else None,
+                'course_count': row['course_count'],
+                'enrollment': row['enrollment'],
+                'completion_rate': row['completion_rate'],
+                'courses': row['courses'],
+            }
+            for row in build_faculty_report()
+        ],
+    })
@@ -0,0 +1,206 @@
+"""
+worker ısındırma
+
+yeni açılan bir worker'ın ilk isteği yavaştır: şablonlar derlenir, URL
+çözücüler kurulur, veritabanı bağlantısı açılır, önbellek boştur.
+warm_up() bunları istek gelmeden önce yapar:
+    - python manage.py warmup
+    - WARMUP_ON_STARTUP=True ile wsgi.py / asgi.py yüklenirken
+"""
+import os
+import time
+
+from django.core.cache import caches
+from django.db import connections
+from django.template import TemplateDoesNotExist, TemplateSyntaxError, engines
+from django.template.backends.django import DjangoTemplates
+from django.urls import get_resolver
+
+TEMPLATE_EXTENSIONS = ('.html', '.txt')
+
+
+def _template_names(engine):
+    """motorun tüm klasörlerindeki (DIRS ve uygulama klasörleri) şablon adları"""
+    names = set()
+    for directory in engine.template_dirs:
+        directory = str(directory)
+        for root, _, files in os.walk(directory):
+            for filename in files:
+                if filename.endswith(TEMPLATE_EXTENSIONS):
+                    names.add(os.path.relpath(os.path.join(root, filename), directory).replace(os.sep, '/'))
+    return sorted(names)
+
+
+def warm_templates():
+    """
+    tüm şablonları derle, DEBUG kapalıyken cached loader derlenmiş hallerini saklar
+    bulunamayan şablonlar atlanır, söz dizimi hatası olanlar sonuçta listelenir
+    """
+    compiled = 0
+    failed = []
+    for engine in engines.all():
+        if not isinstance(engine, DjangoTemplates):
+            continue
+        for name in _template_names(engine):
+            try:
+                engine.get_template(name)
+            except TemplateDoesNotExist:
+                continue
+            except TemplateSyntaxError as e:
+                # bozuk şablon ilk istekte 500 verir, ısındırma bunu gizlememeli
+                failed.append(f'{name} ({e})')
+                continue
+            compiled += 1
+    if failed:
+        return f"{compiled}, derlenemeyen {len(failed)}: {'; '.join(failed)}"
+    return compiled
+
+
+def warm_urls():
+    """
+    URL desenlerini (ve onlarla birlikte görünümleri, formları) import et,
+    reverse() için isim tablolarını kur
+    """
+    return _populate_resolver(get_resolver())
+
+
+def _populate_resolver(resolver):
+    # reverse_dict ilk erişimde alt desenleri doldurur, isim alanlı
+    # include'lar (örn. admin) ayrı çözücüdür, onları da gez
+    count = len(resolver.reverse_dict)
+    for _, sub_resolver in resolver.namespace_dict.values():
+        count += _populate_resolver(sub_resolver)
+    return count
+
+
+def warm_database():
+    """
+    her veritabanına bağlantı aç
+    CONN_MAX_AGE > 0 ise bağlantı istekler arasında açık kalır
+    """
+    for alias in connections:
+        connections[alias].ensure_connection()
+    # ContentType önbelleği admin ve yetki kontrollerinde kullanılır
+    from django.contrib.contenttypes.models import ContentType
+    from django.apps import apps
+    ContentType.objects.get_for_models(*apps.get_models())
+    return len(connections.all())
+
+
+def warm_cache():
+    """önbellek bağlantısını aç ve tüm bölümlerin raporlarını önbelleğe koy"""
+    for alias in caches:
+        caches[alias].get('course_management:warmup')
+    from .reports import build_faculty_report
+    return len(build_faculty_report())
+
+
+STEPS = (
+    ('templates', warm_templates),
+    ('urls', warm_urls),
+    ('database', warm_database),
+    ('cache', warm_cache),
+)
+
+
+def warm_up(steps=None):
+    """
+    ısındırma adımlarını sırayla çalıştır
+    [(adım, süre (sn), sonuç), ...] döner, hata alan adımın sonucu hata mesajıdır
+    """
+    results = []
+    for name, func in STEPS:
+        if steps is not None and name not in steps:
+            continue
+        start = time.perf_counter()
+        try:
+            result = func()
+        except Exception as e:
+            # ısındırma worker'ın açılmasını engellememeli
+            result = f'hata: {e}'
+        results.append((name, time.perf_counter() - start, result))
+    return results
+
+
+# ---------------------------------------------------------------- açılış profili
+
+# ayrı bir python sürecinde çalışır: bu süreçte her şey zaten import edilmiş durumda
+_PROFILE_SCRIPT = '''
+import json, sys, time
+
+phases = []
+start = time.perf_counter()
+
+def mark(name):
+    global start
+    now = time.perf_counter()
+    phases.append((name, now - start))
+    start = now
+
+from django.conf import settings
+settings.INSTALLED_APPS
+mark("settings")
+
+import django
+django.setup(set_prefix=False)
+mark("django.setup (uygulamalar, modeller)")
+
+from django.core.handlers.wsgi import WSGIHandler
+WSGIHandler()
+mark("middleware")
+
+from django.urls import get_resolver
+get_resolver().url_patterns
+mark("urlconf (görünümler, formlar)")
+
+if sys.argv[1] == "1":
+    from course_management.warmup import warm_up
+    for name, elapsed, _ in warm_up():
+        phases.append(("warmup: " + name, elapsed))
+
+print(json.dumps(phases))
+'''
+
+
+def _parse_importtime(output):
+    """python -X importtime çıktısı --> [(modül, kendi süresi (sn), toplam süre (sn))]"""
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+            modules.append((name.strip(), int(self_us) / 1e6, int(cumulative_us) / 1e6))
+        except ValueError:
+            continue
+    return modules
+
+
+def profile_startup(include_warmup=True):
+    """
+    uygulamanın açılışını yeni bir süreçte ölç
+    (aşamalar [(aşama, sn)], modüller [(modül, kendi sn, toplam sn)]) döner
+    """
+    import json
+    import subprocess
+    import sys
+
+    env = dict(os.environ, WARMUP_ON_STARTUP='False')
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', _PROFILE_SCRIPT, '1' if include_warmup else '0'],
+        env=env, capture_output=True, text=True,
+    )
+    if process.returncode != 0:
+        raise RuntimeError(process.stderr.strip().splitlines()[-1] if process.stderr.strip() else 'açılış ölçülemedi')
+    phases = json.loads(process.stdout.strip().splitlines()[-1])
+    return phases, _parse_importtime(process.stderr)
+
+
+def group_by_package(modules):
+    """modüllerin kendi sürelerini üst pakete göre topla --> [(paket, sn, modül sayısı)]"""
+    totals = {}
+    for name, self_time, _ in modules:
+        package = name.split('.')[0]
+        total, count = totals.get(package, (0.0, 0))
+        totals[package] = (total + self_time, count + 1)
+    return sorted(((p, t, c) for p, (t, c) in totals.items()), key=lambda row: row[1], reverse=True)
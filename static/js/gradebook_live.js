@@ -0,0 +1,61 @@
+// canlı not defteri: başka bir kullanıcının kaydettiği notlar sayfa
+// yenilenmeden ilgili hücreye yazılır (bkz. course_management/live.py)
+(function () {
+    'use strict';
+
+    var form = document.querySelector('form[data-live-url]');
+    if (!form || !window.EventSource) {
+        return;
+    }
+    var status = document.querySelector('.live-status');
+
+    function showStatus(text) {
+        if (status) {
+            status.textContent = text;
+            status.hidden = false;
+        }
+    }
+
+    function applyCell(cell) {
+        var input = form.querySelector('input[name="grade_' + cell.student + '_' + cell.component + '"]');
+        if (!input) {
+            return;  // öğrenci bu sayfada değil
+        }
+        var value = cell.score === null ? '' : cell.score;
+        if (input.value !== input.defaultValue) {
+            // kullanıcı bu hücreyi değiştirmiş: üzerine yazma, çakışmayı göster
+            if (input.value !== value) {
+                input.classList.add('grade-conflict');
+                input.title = 'Başka bir kullanıcı bu notu "' + (value || 'boş') + '" olarak kaydetti.';
+            }
+            return;
+        }
+        if (input.value === value) {
+            return;
+        }
+        // değişmemiş hücre güncellenir, yoksa kaydet'e basınca eski değer geri yazılırdı
+        input.value = value;
+        input.defaultValue = value;
+        input.classList.add('grade-updated');
+        setTimeout(function () { input.classList.remove('grade-updated'); }, 2000);
+    }
+
+    var source = new EventSource(form.dataset.liveUrl);
+    var disconnected = false;
+
+    source.addEventListener('grades', function (event) {
+        JSON.parse(event.data).cells.forEach(applyCell);
+    });
+    source.addEventListener('resync', function () {
+        showStatus('Bazı not değişiklikleri bu sayfaya yansıtılamadı, lütfen sayfayı yenileyin.');
+    });
+    source.addEventListener('error', function () {
+        disconnected = true;
+    });
+    source.addEventListener('open', function () {
+        if (disconnected) {
+            // bağlantı koptuğu sırada kaydedilen notlar kaçırılmış olabilir
+            showStatus('Canlı güncelleme bağlantısı bir süre koptu, güncel notlar için sayfayı yenileyin.');
+        }
+    });
+})();